@@ -4,7 +4,7 @@ from collections import OrderedDict
 import yaml
 from django.apps import AppConfig
 
-from api_fhir_r4.configurations import ModuleConfiguration
+from api_fhir_r4.configurations import GeneralConfiguration, ModuleConfiguration
 from api_fhir_r4.defaultConfig import DEFAULT_CFG
 
 logger = logging.getLogger(__name__)
@@ -25,6 +25,13 @@ class ApiFhirConfig(AppConfig):
         from .exceptions.fhir_api_exception_handler import fhir_api_exception_handler
         ExceptionHandlerRegistry.register_exception_handler(MODULE_NAME, fhir_api_exception_handler)
 
+        from .cache import ModelGenerationCache
+        ModelGenerationCache.connect_signals()
+        if GeneralConfiguration.get_count_cache_timeout() and not ModelGenerationCache.is_cache_shared():
+            logger.warning(F'Module {MODULE_NAME}: the default cache is not shared between processes, cached '
+                           F'totals and subscriptions may be stale in other processes, configure a shared cache '
+                           F'or set count_cache_timeout to 0')
+
     def __configure_module(self, cfg):
         ModuleConfiguration.build_configuration(cfg)
         logger.info(F'Module {MODULE_NAME} configured successfully')
@@ -0,0 +1,8 @@
+from api_fhir_r4.bulkExport.exportSources import ExportSource, EXPORT_SOURCES
+from api_fhir_r4.bulkExport.ndjsonExporter import NdjsonExporter
+from api_fhir_r4.bulkExport.exportJobs import (
+    ExportJobStatus,
+    FileSystemExportBackend,
+    ExportJobNdjsonExporter,
+    ExportJobWorker
+)
@@ -0,0 +1,268 @@
+import gzip
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+import uuid
+
+from django.db import close_old_connections
+
+from api_fhir_r4.bulkExport.ndjsonExporter import NdjsonExporter
+from api_fhir_r4.configurations import GeneralConfiguration
+from api_fhir_r4.renderers import fhir_json_dumps
+from api_fhir_r4.utils import TimeUtils
+from core.models import User
+
+logger = logging.getLogger(__name__)
+
+
+class ExportJobStatus(object):
+    ACCEPTED = 'accepted'
+    IN_PROGRESS = 'in-progress'
+    COMPLETED = 'completed'
+    ERROR = 'error'
+
+    PENDING = (ACCEPTED, IN_PROGRESS)
+
+
+class FileSystemExportBackend(object):
+    """
+        Keeps export jobs on the local filesystem, every job has its own directory with the job description
+        (`job.json`) and the gzip compressed NDJSON files, one per resource type. A worker claims a job by creating
+        its lock file (`worker.lock`), so a job is run by one worker even if many of them share the directory.
+    """
+    job_file_name = 'job.json'
+    lock_file_name = 'worker.lock'
+    file_extension = '.ndjson.gz'
+
+    def __init__(self, directory=None):
+        self.directory = directory or GeneralConfiguration.get_export_directory() \
+            or os.path.join(tempfile.gettempdir(), 'api_fhir_r4_export')
+
+    def create_job(self, user, request_url, parameters=None):
+        job_id = uuid.uuid4().hex
+        os.makedirs(self._get_job_directory(job_id))
+        job = {
+            'id': job_id,
+            'user': str(user.pk),
+            'status': ExportJobStatus.ACCEPTED,
+            'transactionTime': TimeUtils.now().isoformat(),
+            'request': request_url,
+            'parameters': parameters or {},
+            'output': [],
+            'error': [],
+        }
+        self.save_job(job)
+        return job
+
+    def load_job(self, job_id):
+        try:
+            with open(self._get_job_file_path(job_id)) as job_file:
+                return json.load(job_file)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def save_job(self, job):
+        path = self._get_job_file_path(job['id'])
+        # write and rename, so pollers never read a partially written file
+        with open(f'{path}.tmp', 'w') as job_file:
+            json.dump(job, job_file)
+        os.replace(f'{path}.tmp', path)
+
+    def delete_job(self, job_id):
+        shutil.rmtree(self._get_job_directory(job_id), ignore_errors=True)
+
+    def job_exists(self, job_id):
+        return os.path.exists(self._get_job_file_path(job_id))
+
+    def get_job_ids(self):
+        try:
+            return sorted(entry.name for entry in os.scandir(self.directory) if entry.is_dir() and entry.name.isalnum())
+        except FileNotFoundError:
+            return []
+
+    def claim_job(self, job_id):
+        try:
+            os.close(os.open(self._get_lock_file_path(job_id), os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return True
+        except (FileExistsError, FileNotFoundError):
+            return False
+
+    def get_claim_time(self, job_id):
+        try:
+            return os.path.getmtime(self._get_lock_file_path(job_id))
+        except FileNotFoundError:
+            return None
+
+    def get_modification_time(self, job_id):
+        try:
+            return os.path.getmtime(self._get_job_directory(job_id))
+        except FileNotFoundError:
+            return None
+
+    def open_output_file(self, job_id, name):
+        return gzip.open(self.get_file_path(job_id, name + self.file_extension), 'wb')
+
+    def get_file_path(self, job_id, file_name):
+        if os.path.basename(file_name) != file_name or not file_name.endswith(self.file_extension):
+            return None
+        return os.path.join(self._get_job_directory(job_id), file_name)
+
+    def _get_job_directory(self, job_id):
+        if not job_id.isalnum():
+            raise ValueError(f'Invalid export job id: {job_id}')
+        return os.path.join(self.directory, job_id)
+
+    def _get_job_file_path(self, job_id):
+        return os.path.join(self._get_job_directory(job_id), self.job_file_name)
+
+    def _get_lock_file_path(self, job_id):
+        return os.path.join(self._get_job_directory(job_id), self.lock_file_name)
+
+
+class ExportJobNdjsonExporter(NdjsonExporter):
+    error_file = None
+
+    def get_job_parameters(self):
+        return {
+            'resourceTypes': self.resource_types,
+            'since': self.since.isoformat() if self.since else None,
+        }
+
+    @classmethod
+    def from_job(cls, job, **kwargs):
+        parameters = job.get('parameters', {})
+        since = parameters.get('since')
+        return cls(User.objects.get(pk=job['user']), resource_types=parameters.get('resourceTypes'),
+                   since=TimeUtils.str_iso_to_date(since) if since else None, **kwargs)
+
+    def handle_conversion_error(self, source, obj, error):
+        outcome = super().handle_conversion_error(source, obj, error)
+        if not self.error_file:
+            return outcome
+        # errors of jobs are listed in the `error` files of the manifest instead of the resource files
+        self.error_file.write(fhir_json_dumps(outcome) + b'\n')
+        self.error_count += 1
+        return None
+
+
+class ExportJobCancelled(Exception):
+    pass
+
+
+class ExportJobWorker(object):
+    """
+        Runs export jobs accepted by the API (see `fhir_export_worker` command), outside of the API processes.
+        Many workers can share `export_directory`, every job is claimed by one of them. A running job records
+        a heartbeat, jobs without a heartbeat for `export_job_heartbeat_timeout` seconds (e.g. the worker was
+        stopped) are marked as failed. Files of jobs finished more than `export_retention_hours` ago are removed.
+    """
+    heartbeat_interval = 30
+
+    def __init__(self, backend=None):
+        self.backend = backend or FileSystemExportBackend()
+
+    def run(self, poll_interval=5, stop_condition=None):
+        while not (stop_condition and stop_condition()):
+            if not self.run_pending():
+                time.sleep(poll_interval)
+
+    def run_pending(self):
+        """
+            Fail stale jobs, remove expired ones and run the accepted jobs. Returns number of jobs run.
+        """
+        self.fail_stale_jobs()
+        self.remove_expired_jobs()
+        executed = 0
+        for job_id in self.backend.get_job_ids():
+            job = self.backend.load_job(job_id)
+            if job and job['status'] == ExportJobStatus.ACCEPTED and self.backend.claim_job(job_id):
+                # connections could have been closed by the database between the jobs
+                close_old_connections()
+                self.run_job(job)
+                executed += 1
+        return executed
+
+    def run_job(self, job):
+        try:
+            job['status'] = ExportJobStatus.IN_PROGRESS
+            self._save_heartbeat(job)
+            self._export(job, ExportJobNdjsonExporter.from_job(job))
+        except ExportJobCancelled:
+            logger.info(f"Export job {job['id']} was cancelled")
+        except Exception as e:
+            logger.error(f"Export job {job['id']} failed", exc_info=e)
+            self._finish(job, ExportJobStatus.ERROR, str(e))
+
+    def fail_stale_jobs(self):
+        timeout = GeneralConfiguration.get_export_job_heartbeat_timeout()
+        now = time.time()
+        for job_id in self.backend.get_job_ids():
+            job = self.backend.load_job(job_id)
+            if not job or job['status'] not in ExportJobStatus.PENDING:
+                continue
+            claimed = self.backend.get_claim_time(job_id)
+            if claimed is None:
+                # not picked up by any worker yet
+                continue
+            if now - max(job.get('heartbeat') or 0, claimed) > timeout:
+                logger.warning(f"Export job {job_id} stopped responding, marking it as failed")
+                self._finish(job, ExportJobStatus.ERROR, 'Export job stopped responding')
+
+    def remove_expired_jobs(self):
+        retention_hours = GeneralConfiguration.get_export_retention_hours()
+        if not retention_hours:
+            return
+        expired_before = time.time() - retention_hours * 60 * 60
+        for job_id in self.backend.get_job_ids():
+            job = self.backend.load_job(job_id)
+            if job:
+                finished = job.get('finished') if job['status'] not in ExportJobStatus.PENDING else None
+            else:
+                # directory of a job which failed before its description was written
+                finished = self.backend.get_modification_time(job_id)
+            if finished and finished < expired_before:
+                self.backend.delete_job(job_id)
+
+    def _export(self, job, exporter):
+        sources_by_type = {}
+        for source in exporter.get_sources():
+            sources_by_type.setdefault(source.resource_type, []).append(source)
+
+        with self.backend.open_output_file(job['id'], 'OperationOutcome') as error_file:
+            exporter.error_file = error_file
+            exporter.error_count = 0
+            for resource_type, sources in sources_by_type.items():
+                count = 0
+                with self.backend.open_output_file(job['id'], resource_type) as output_file:
+                    for source in sources:
+                        for line in exporter.iter_ndjson(source):
+                            output_file.write(line)
+                            count += 1
+                            if time.time() - job['heartbeat'] >= self.heartbeat_interval:
+                                self._save_heartbeat(job)
+                job['output'].append({'type': resource_type, 'file': resource_type + self.backend.file_extension,
+                                      'count': count})
+                self._save_heartbeat(job)
+        if exporter.error_count:
+            job['error'].append({'type': 'OperationOutcome', 'file': 'OperationOutcome' + self.backend.file_extension,
+                                 'count': exporter.error_count})
+        self._finish(job, ExportJobStatus.COMPLETED)
+
+    def _save_heartbeat(self, job):
+        # the job is deleted when it's cancelled by the client
+        if not self.backend.job_exists(job['id']):
+            raise ExportJobCancelled()
+        job['heartbeat'] = time.time()
+        self.backend.save_job(job)
+
+    def _finish(self, job, status, message=None):
+        if not self.backend.job_exists(job['id']):
+            return
+        job['status'] = status
+        job['finished'] = time.time()
+        if message:
+            job['message'] = message
+        self.backend.save_job(job)
@@ -0,0 +1,121 @@
+from api_fhir_r4.permissions import (
+    FHIRApiInsureePermissions,
+    FHIRApiClaimPermissions,
+    FHIRApiCoverageRequestPermissions,
+    FHIRApiHealthServicePermissions,
+    FHIRApiOrganizationPermissions
+)
+from api_fhir_r4.serializers import (
+    PatientSerializer,
+    ClaimSerializer,
+    ContractSerializer,
+    HealthFacilityOrganisationSerializer,
+    PolicyHolderOrganisationSerializer
+)
+from api_fhir_r4.serializers.coverageSerializer import CoverageSerializer
+
+
+class ExportSource(object):
+    """
+        Single queryset exported as resources of `resource_type`, converted with the serializer (and so the
+        converter) of the related viewset. A resource type can be built from multiple sources (e.g. Organization).
+    """
+    resource_type = None
+    imis_module = None
+    serializer_class = None
+    permission_class = None
+    since_field = 'validity_from'
+
+    def get_queryset(self, user):
+        raise NotImplementedError('`get_queryset()` must be implemented.')  # pragma: no cover
+
+    def get_export_queryset(self, user, since=None):
+        queryset = self.get_queryset(user)
+        if since:
+            queryset = queryset.filter(**{f'{self.since_field}__gte': since})
+        queryset = self.serializer_class.fhirConverter.apply_prefetch_plan(queryset)
+        return queryset.order_by(self.since_field, 'pk')
+
+    def has_permission(self, user):
+        return user.has_perms(self.permission_class.permissions_get)
+
+    def get_serializer(self):
+        # child of a list serializer, so resources are converted the same way as in the searchset Bundles
+        return self.serializer_class(many=True, context={'contained': False}).child
+
+
+class PatientExportSource(ExportSource):
+    resource_type = 'Patient'
+    imis_module = 'insuree'
+    serializer_class = PatientSerializer
+    permission_class = FHIRApiInsureePermissions
+
+    def get_queryset(self, user):
+        from insuree.models import Insuree
+        return Insuree.get_queryset(None, user).filter(validity_to__isnull=True)
+
+
+class ClaimExportSource(ExportSource):
+    resource_type = 'Claim'
+    imis_module = 'claim'
+    serializer_class = ClaimSerializer
+    permission_class = FHIRApiClaimPermissions
+
+    def get_queryset(self, user):
+        from claim.models import Claim
+        return Claim.get_queryset(None, user).filter(validity_to__isnull=True)
+
+
+class CoverageExportSource(ExportSource):
+    resource_type = 'Coverage'
+    imis_module = 'policy'
+    serializer_class = CoverageSerializer
+    permission_class = FHIRApiCoverageRequestPermissions
+
+    def get_queryset(self, user):
+        from policy.models import Policy
+        return Policy.get_queryset(None, user).filter(validity_to__isnull=True)
+
+
+class ContractExportSource(ExportSource):
+    resource_type = 'Contract'
+    imis_module = 'policy'
+    serializer_class = ContractSerializer
+    permission_class = FHIRApiCoverageRequestPermissions
+
+    def get_queryset(self, user):
+        from policy.models import Policy
+        return Policy.get_queryset(None, user).filter(validity_to__isnull=True)
+
+
+class HealthFacilityOrganisationExportSource(ExportSource):
+    resource_type = 'Organization'
+    imis_module = 'location'
+    serializer_class = HealthFacilityOrganisationSerializer
+    permission_class = FHIRApiHealthServicePermissions
+
+    def get_queryset(self, user):
+        from location.models import HealthFacility
+        return HealthFacility.objects.filter(validity_to__isnull=True)
+
+
+class PolicyHolderOrganisationExportSource(ExportSource):
+    resource_type = 'Organization'
+    imis_module = 'policyholder'
+    serializer_class = PolicyHolderOrganisationSerializer
+    permission_class = FHIRApiOrganizationPermissions
+    since_field = 'date_updated'
+
+    def get_queryset(self, user):
+        from policyholder.models import PolicyHolder
+        return PolicyHolder.objects.filter(is_deleted=False)
+
+
+EXPORT_SOURCES = [
+    PatientExportSource(),
+    ClaimExportSource(),
+    CoverageExportSource(),
+    ContractExportSource(),
+    HealthFacilityOrganisationExportSource(),
+    PolicyHolderOrganisationExportSource(),
+]
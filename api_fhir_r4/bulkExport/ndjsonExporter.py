@@ -0,0 +1,116 @@
+import logging
+from contextlib import nullcontext
+from itertools import islice
+
+from openIMIS.openimisapps import openimis_apps
+from rest_framework.exceptions import PermissionDenied, ValidationError
+
+from api_fhir_r4.bulkExport.exportSources import EXPORT_SOURCES
+from api_fhir_r4.configurations import GeneralConfiguration
+from api_fhir_r4.converters import PageReferenceBuilder, OperationOutcomeConverter
+from api_fhir_r4.renderers import fhir_json_dumps
+from api_fhir_r4.utils import TimeUtils
+
+logger = logging.getLogger(__name__)
+
+
+class NdjsonExporter(object):
+    """
+        Converts export sources to NDJSON. Objects are read with server-side cursors
+        (`QuerySet.iterator(chunk_size=...)`) and emitted one line at a time, so memory usage doesn't depend
+        on the table size.
+    """
+    type_query_param = '_type'
+    since_query_param = '_since'
+
+    def __init__(self, user, resource_types=None, since=None, chunk_size=None):
+        self.user = user
+        self.resource_types = resource_types
+        self.since = since
+        self.chunk_size = chunk_size or GeneralConfiguration.get_export_chunk_size()
+
+    @classmethod
+    def from_query_params(cls, user, query_params, **kwargs):
+        resource_types = None
+        requested_types = query_params.get(cls.type_query_param)
+        if requested_types:
+            resource_types = [t.strip() for t in requested_types.split(',') if t.strip()]
+            unsupported = set(resource_types) - set(cls.get_supported_resource_types())
+            if unsupported:
+                raise ValidationError({cls.type_query_param: f'Unsupported resource types: {sorted(unsupported)}'})
+
+        since = None
+        requested_since = query_params.get(cls.since_query_param)
+        if requested_since:
+            try:
+                since = TimeUtils.str_iso_to_date(requested_since.replace(' ', '+'))
+            except (ValueError, OverflowError):
+                raise ValidationError({cls.since_query_param: 'Invalid instant, should be in ISO 8601 format'})
+
+        exporter = cls(user, resource_types=resource_types, since=since, **kwargs)
+        exporter.validate_permissions()
+        return exporter
+
+    @classmethod
+    def get_available_sources(cls):
+        imis_modules = openimis_apps()
+        return [source for source in EXPORT_SOURCES if source.imis_module in imis_modules]
+
+    @classmethod
+    def get_supported_resource_types(cls):
+        return list(dict.fromkeys(source.resource_type for source in cls.get_available_sources()))
+
+    def validate_permissions(self):
+        # types requested explicitly have to be readable, otherwise the not readable ones are skipped
+        if not self.resource_types:
+            return
+        readable = {source.resource_type for source in self.get_sources()}
+        forbidden = set(self.resource_types) - readable
+        if forbidden:
+            raise PermissionDenied(f'Not authorized to export resource types: {sorted(forbidden)}')
+
+    def get_sources(self):
+        return [
+            source for source in self.get_available_sources()
+            if (not self.resource_types or source.resource_type in self.resource_types)
+            and source.has_permission(self.user)
+        ]
+
+    def iter_resources(self, source):
+        serializer = source.get_serializer()
+        queryset = source.get_export_queryset(self.user, self.since)
+        objs = queryset.iterator(chunk_size=self.chunk_size)
+        # references of every chunk are loaded together, the same way as for pages of searchset Bundles
+        representation_cache = serializer.representation_cache
+        while chunk := list(islice(objs, self.chunk_size)):
+            with PageReferenceBuilder.scope(serializer.fhirConverter, chunk), \
+                    (representation_cache.page_scope(chunk) if representation_cache is not None else nullcontext()):
+                for obj in chunk:
+                    try:
+                        yield serializer.to_representation(obj)
+                    except Exception as e:
+                        outcome = self.handle_conversion_error(source, obj, e)
+                        if outcome is not None:
+                            yield outcome
+
+    def iter_ndjson(self, source):
+        for resource in self.iter_resources(source):
+            yield fhir_json_dumps(resource) + b'\n'
+
+    def iter_all_ndjson(self):
+        for source in self.get_sources():
+            yield from self.iter_ndjson(source)
+
+    def handle_conversion_error(self, source, obj, error):
+        """
+            Returns representation emitted in place of the resource which couldn't be converted, an OperationOutcome
+            by default, so the client can tell the export is incomplete.
+        """
+        logger.error(f"Failed to export {source.resource_type} for object {obj.pk}", exc_info=error)
+        return self.build_conversion_error_outcome(source, obj, error)
+
+    def build_conversion_error_outcome(self, source, obj, error):
+        outcome = OperationOutcomeConverter.to_fhir_obj(error).dict()
+        for issue in outcome.get('issue', []):
+            issue['diagnostics'] = f"Failed to export {source.resource_type} {getattr(obj, 'uuid', None) or obj.pk}"
+        return outcome
@@ -0,0 +1,110 @@
+import logging
+from http import HTTPStatus
+
+from django.db import transaction
+from django.http import Http404
+from rest_framework.exceptions import APIException, PermissionDenied, ValidationError
+
+from api_fhir_r4.converters import OperationOutcomeConverter
+from api_fhir_r4.permissions import FHIRApiClaimPermissions
+from api_fhir_r4.serializers import ClaimSerializer
+from api_fhir_r4.utils import ReferenceResolutionCache
+
+logger = logging.getLogger(__name__)
+
+
+class BundleEntryProcessingError(Exception):
+    def __init__(self, index, cause):
+        super().__init__(f'Entry {index}: {cause}')
+        self.index = index
+        self.cause = cause
+
+
+class BundleTransactionProcessor(object):
+    """
+        Processes `batch` and `transaction` Bundles. All entries are processed in a single database transaction,
+        with references shared between entries resolved once per Bundle:
+        - `batch` - every entry has its own savepoint, failed entries are reported with an OperationOutcome
+          and don't affect the other ones,
+        - `transaction` - a failure of any entry rolls back the whole Bundle.
+    """
+    BATCH = 'batch'
+    TRANSACTION = 'transaction'
+    SUPPORTED_TYPES = (BATCH, TRANSACTION)
+
+    # (method, resource type) -> (serializer used to process the entry, permissions required)
+    entry_serializers = {
+        ('POST', 'Claim'): (ClaimSerializer, FHIRApiClaimPermissions.permissions_post),
+    }
+
+    def __init__(self, request):
+        self.request = request
+
+    def process(self, bundle):
+        if not isinstance(bundle, dict) or bundle.get('resourceType') != 'Bundle' \
+                or bundle.get('type') not in self.SUPPORTED_TYPES:
+            raise ValidationError(f'Expected Bundle of type {" or ".join(self.SUPPORTED_TYPES)}')
+        bundle_type = bundle['type']
+
+        entries = bundle.get('entry') or []
+        with ReferenceResolutionCache.scope(), transaction.atomic():
+            if bundle_type == self.TRANSACTION:
+                response_entries = [self.process_entry(index, entry) for index, entry in enumerate(entries)]
+            else:
+                response_entries = [self.process_batch_entry(index, entry) for index, entry in enumerate(entries)]
+
+        return {
+            'resourceType': 'Bundle',
+            'type': f'{bundle_type}-response',
+            'entry': response_entries,
+        }
+
+    def process_batch_entry(self, index, entry):
+        try:
+            with transaction.atomic():
+                return self.process_entry(index, entry)
+        except BundleEntryProcessingError as e:
+            return self.build_error_entry(e.cause)
+
+    def process_entry(self, index, entry):
+        try:
+            serializer_class = self.get_entry_serializer(entry)
+            serializer = serializer_class(data=entry['resource'], context={'request': self.request})
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+            resource = serializer.data
+        except Exception as e:
+            logger.debug(f"Processing of Bundle entry {index} failed", exc_info=e)
+            raise BundleEntryProcessingError(index, e) from e
+
+        response = {'status': self.build_status(HTTPStatus.CREATED)}
+        if resource.get('id'):
+            response['location'] = f"{resource['resourceType']}/{resource['id']}"
+        return {'resource': resource, 'response': response}
+
+    def get_entry_serializer(self, entry):
+        method = (entry.get('request') or {}).get('method', 'POST').upper()
+        resource = entry.get('resource') or {}
+        serializer_definition = self.entry_serializers.get((method, resource.get('resourceType')))
+        if serializer_definition is None:
+            raise ValidationError(f'Unsupported entry: {method} {resource.get("resourceType")}')
+        serializer_class, required_permissions = serializer_definition
+        if not self.request.user.has_perms(required_permissions):
+            raise PermissionDenied()
+        return serializer_class
+
+    def build_error_entry(self, error):
+        outcome = OperationOutcomeConverter.to_fhir_obj(error).dict()
+        return {'response': {'status': self.build_status(self.get_error_status(error)), 'outcome': outcome}}
+
+    @classmethod
+    def get_error_status(cls, error):
+        if isinstance(error, Http404):
+            return HTTPStatus.NOT_FOUND
+        if isinstance(error, APIException):
+            return HTTPStatus(error.status_code)
+        return HTTPStatus.BAD_REQUEST
+
+    @classmethod
+    def build_status(cls, http_status: HTTPStatus):
+        return f'{http_status.value} {http_status.phrase}'
@@ -0,0 +1,4 @@
+from api_fhir_r4.cache.modelGenerationCache import ModelGenerationCache
+from api_fhir_r4.cache.queryCountService import QueryCountService
+from api_fhir_r4.cache.identifierLookupCache import IdentifierLookupCache
+from api_fhir_r4.cache.representationCache import FHIRRepresentationCache
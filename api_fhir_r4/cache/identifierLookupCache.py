@@ -0,0 +1,61 @@
+import hashlib
+import json
+
+from django.core.cache import caches
+from django.db.models import Q
+
+from api_fhir_r4.cache.modelGenerationCache import ModelGenerationCache
+from api_fhir_r4.cache.queryCountService import QueryCountService
+from api_fhir_r4.configurations import GeneralConfiguration
+
+
+class IdentifierLookupCache(object):
+    """
+        Maps external identifiers (uuid, chf_id, code) resolved by the retrievers of a view to the primary key,
+        the retriever which matched them and the version stamp of the row, so reads of resolved identifiers are
+        primary key fetches and conditional reads of them don't hit the database. Keys contain the generations
+        of the tables the lookup reads from, so entries are dropped as soon as one of them changes
+        (see `ModelGenerationCache`), or after `identifier_cache_timeout` seconds.
+    """
+    cache_name = 'default'
+    key_prefix = 'api_fhir_r4:identifier:'
+
+    @classmethod
+    def is_enabled(cls):
+        return bool(GeneralConfiguration.get_identifier_cache_timeout())
+
+    @classmethod
+    def get(cls, queryset, retrievers, identifier_value, lookup):
+        """
+            Returns tuple of the retriever, the primary key and the version stamp cached for the identifier,
+            or None on cache miss.
+            `lookup` is the Q object used to resolve the identifier, only tables it reads from are considered.
+        """
+        value = caches[cls.cache_name].get(cls.get_cache_key(queryset, retrievers, identifier_value, lookup))
+        if value is None or len(value) != 3:
+            return None
+        retriever_index, pk, stamp = value
+        if retriever_index >= len(retrievers):
+            return None
+        return retrievers[retriever_index], pk, stamp
+
+    @classmethod
+    def set(cls, queryset, retrievers, identifier_value, lookup, retriever, pk, stamp=None):
+        caches[cls.cache_name].set(
+            cls.get_cache_key(queryset, retrievers, identifier_value, lookup),
+            (retrievers.index(retriever), pk, stamp),
+            GeneralConfiguration.get_identifier_cache_timeout()
+        )
+
+    @classmethod
+    def get_cache_key(cls, queryset, retrievers, identifier_value, lookup: Q):
+        query = queryset.filter(lookup).query
+        generations = ModelGenerationCache.get_generations(QueryCountService.get_query_tables(query))
+        key = json.dumps([
+            queryset.model._meta.label,
+            queryset.db,
+            [retriever.__name__ for retriever in retrievers],
+            str(identifier_value),
+            sorted(generations.items()),
+        ], default=str)
+        return cls.key_prefix + hashlib.md5(key.encode('utf8')).hexdigest()
@@ -0,0 +1,106 @@
+import time
+
+from django.apps import apps
+from django.core.cache import caches
+from django.db.models.signals import post_save, post_delete
+
+
+class ModelGenerationCache(object):
+    """
+        Per-table generation counters stored in the Django cache. Every save/delete of a model instance bumps the
+        counter of its table, so cache keys built from the current generations are invalidated implicitly,
+        without having to track and delete the keys themselves. Bulk writes (`QuerySet.update()`, `bulk_create()`,
+        `bulk_update()`, raw SQL) don't send the signals, caches relying on generations have to expire on their own.
+        Only models read by the FHIR views (`tracked_models` and the models they reference) are tracked, tables
+        of other models keep their initial generation. Generations have to be shared by all processes serving
+        the API, so the cache has to be a shared backend (e.g. Redis, Memcached), not the process local one.
+    """
+    cache_name = 'default'
+    key_prefix = 'api_fhir_r4:generation:'
+    # models searched and counted by the FHIR views and subscriptions, missing modules are skipped
+    tracked_models = (
+        'api_fhir_r4.Subscription',
+        'claim.Claim', 'claim.ClaimAdmin', 'claim.Feedback',
+        'contract.Contract',
+        'contribution_plan.ContributionPlanBundle',
+        'core.ModuleConfiguration', 'core.Officer',
+        'insuree.Family', 'insuree.Insuree', 'insuree.InsureePolicy',
+        'invoice.Bill', 'invoice.Invoice', 'invoice.PaymentInvoice',
+        'location.HealthFacility', 'location.Location',
+        'medical.Item', 'medical.Service',
+        'policy.Policy',
+        'policyholder.PolicyHolder', 'policyholder.PolicyHolderContributionPlan',
+        'policyholder.PolicyHolderInsuree', 'policyholder.PolicyHolderUser',
+        'product.Product',
+    )
+
+    @classmethod
+    def get_generations(cls, db_tables):
+        cache = caches[cls.cache_name]
+        keys = {cls._get_key(db_table): db_table for db_table in db_tables}
+        generations = cache.get_many(list(keys))
+        missing = [key for key in keys if key not in generations]
+        if missing:
+            for key in missing:
+                cache.add(key, cls._get_initial_generation(), None)
+            generations.update(cache.get_many(missing))
+        return {keys[key]: generation for key, generation in generations.items()}
+
+    @classmethod
+    def bump(cls, model):
+        cache = caches[cls.cache_name]
+        key = cls._get_key(model._meta.db_table)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # counter evicted or never read, a fresh time-based value can't collide with an old generation
+            cache.add(key, cls._get_initial_generation(), None)
+
+    @classmethod
+    def on_model_changed(cls, sender, **kwargs):
+        cls.bump(sender)
+
+    @classmethod
+    def connect_signals(cls):
+        for model in cls.get_tracked_models():
+            post_save.connect(cls.on_model_changed, sender=model,
+                              dispatch_uid=f'api_fhir_r4_generation_post_save_{model._meta.label}')
+            post_delete.connect(cls.on_model_changed, sender=model,
+                                dispatch_uid=f'api_fhir_r4_generation_post_delete_{model._meta.label}')
+
+    @classmethod
+    def get_tracked_models(cls):
+        """
+            Tracked models together with the models they reference, which are joined by the searches.
+        """
+        pending = []
+        for label in cls.tracked_models:
+            try:
+                pending.append(apps.get_model(label))
+            except LookupError:
+                continue
+        models = set()
+        while pending:
+            model = pending.pop()
+            if model in models:
+                continue
+            models.add(model)
+            pending.extend(
+                field.related_model for field in model._meta.get_fields()
+                if field.concrete and field.is_relation and field.related_model is not None
+            )
+        return models
+
+    @classmethod
+    def is_cache_shared(cls):
+        from django.core.cache.backends.dummy import DummyCache
+        from django.core.cache.backends.locmem import LocMemCache
+        return not isinstance(caches[cls.cache_name], (LocMemCache, DummyCache))
+
+    @classmethod
+    def _get_key(cls, db_table):
+        return f'{cls.key_prefix}{db_table}'
+
+    @classmethod
+    def _get_initial_generation(cls):
+        return time.time_ns()
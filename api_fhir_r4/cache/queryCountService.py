@@ -0,0 +1,148 @@
+import hashlib
+import json
+import logging
+
+from django.core.cache import caches
+from django.db import connections, DatabaseError
+from django.db.models.sql import Query
+from rest_framework.exceptions import ValidationError
+
+from api_fhir_r4.cache.modelGenerationCache import ModelGenerationCache
+from api_fhir_r4.configurations import GeneralConfiguration
+
+logger = logging.getLogger(__name__)
+
+
+class QueryCountService(object):
+    """
+        Counts search results for a request. Accurate counts are cached under a key built from the model,
+        the request path, the user and the normalized filter parameters, together with the generations of every
+        table the query reads from, so the cached value is dropped as soon as one of those tables changes.
+        Generations are bumped only by `post_save`/`post_delete` signals, changes made with `QuerySet.update()`,
+        `bulk_create()`, `bulk_update()` or raw SQL are visible only once `count_cache_timeout` passes.
+    """
+    TOTAL_NONE = 'none'
+    TOTAL_ESTIMATE = 'estimate'
+    TOTAL_ACCURATE = 'accurate'
+    TOTAL_MODES = (TOTAL_NONE, TOTAL_ESTIMATE, TOTAL_ACCURATE)
+
+    total_query_param = '_total'
+    cache_name = 'default'
+    key_prefix = 'api_fhir_r4:count:'
+
+    def __init__(self, request, ignored_query_params=()):
+        self.request = request
+        self.ignored_query_params = set(ignored_query_params) | {self.total_query_param}
+
+    def get_total_mode(self):
+        mode = self.request.query_params.get(self.total_query_param) or self.TOTAL_ACCURATE
+        if mode not in self.TOTAL_MODES:
+            raise ValidationError({self.total_query_param: f'Invalid value, should be one of: {self.TOTAL_MODES}'})
+        return mode
+
+    def count(self, queryset, mode=TOTAL_ACCURATE):
+        if mode == self.TOTAL_NONE:
+            return None
+        if mode == self.TOTAL_ESTIMATE:
+            estimate = self.estimate_count(queryset)
+            if estimate is not None and estimate >= GeneralConfiguration.get_count_estimate_threshold():
+                return estimate
+        return self.accurate_count(queryset)
+
+    def accurate_count(self, queryset, real_count=None):
+        real_count = real_count or queryset.count
+        timeout = GeneralConfiguration.get_count_cache_timeout()
+        if not timeout:
+            return real_count()
+        cache = caches[self.cache_name]
+        cache_key = self.get_cache_key(queryset)
+        value = cache.get(cache_key)
+        if value is None:
+            value = real_count()
+            cache.set(cache_key, value, timeout)
+        return value
+
+    def estimate_count(self, queryset):
+        """
+            Planner statistics instead of COUNT(*), available on PostgreSQL only. Returns None when no estimate
+            can be provided, callers should fall back to an accurate count.
+        """
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return None
+        try:
+            with connection.cursor() as cursor:
+                if not queryset.query.where:
+                    cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                                   [queryset.model._meta.db_table])
+                    row = cursor.fetchone()
+                    # reltuples is -1 (or 0) for tables that were never analyzed
+                    if row and row[0] and row[0] > 0:
+                        return int(row[0])
+                query = queryset.query.chain()
+                query.clear_ordering(force=True)
+                sql, params = query.sql_with_params()
+                cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+                plan = cursor.fetchone()[0]
+        except DatabaseError as e:
+            logger.debug("Count estimate not available: %s", e)
+            return None
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    def with_counted_queryset(self, queryset):
+        """
+            Return copy of queryset with queryset.count() served by the accurate cached count of this service,
+            so paginators use it transparently.
+        """
+        queryset = queryset._chain()
+        real_count = queryset.count
+        service = self
+
+        def count(queryset):
+            return service.accurate_count(queryset, real_count)
+
+        queryset.count = count.__get__(queryset, type(queryset))
+        return queryset
+
+    def get_cache_key(self, queryset):
+        generations = ModelGenerationCache.get_generations(self.get_query_tables(queryset.query))
+        key = json.dumps([
+            queryset.model._meta.label,
+            queryset.db,
+            self.request.path,
+            getattr(self.request.user, 'pk', None),
+            self.get_normalized_filter_params(),
+            sorted(generations.items()),
+        ], default=str)
+        return self.key_prefix + hashlib.md5(key.encode('utf8')).hexdigest()
+
+    def get_normalized_filter_params(self):
+        return sorted(
+            (param, sorted(values)) for param, values in self.request.query_params.lists()
+            if param not in self.ignored_query_params
+        )
+
+    @classmethod
+    def get_query_tables(cls, query, tables=None):
+        tables = tables if tables is not None else set()
+        tables.add(query.get_meta().db_table)
+        tables.update(join.table_name for join in query.alias_map.values())
+        # subqueries (Exists, __in=queryset) read from other tables as well
+        for expression in [*query.annotations.values(), query.where]:
+            cls._collect_expression_tables(expression, tables)
+        return tables
+
+    @classmethod
+    def _collect_expression_tables(cls, expression, tables):
+        if isinstance(expression, Query):
+            cls.get_query_tables(expression, tables)
+            return
+        inner_query = getattr(expression, 'query', None)
+        if isinstance(inner_query, Query):
+            cls.get_query_tables(inner_query, tables)
+        if hasattr(expression, 'get_source_expressions'):
+            for source in expression.get_source_expressions():
+                if source is not None:
+                    cls._collect_expression_tables(source, tables)
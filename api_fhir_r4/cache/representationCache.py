@@ -0,0 +1,182 @@
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.core.cache import caches
+
+from api_fhir_r4.configurations import GeneralConfiguration
+from api_fhir_r4.utils import VersionUtils
+
+
+class FHIRRepresentationCache(object):
+    """
+        Cache of FHIR representations (`to_fhir_obj(...).dict()`) of IMIS objects, keyed by the converter,
+        the reference type, the uuid and the version stamp of the object (`validity_from` of versioned models,
+        `date_updated` of history models), so a new version of an object never hits an old representation.
+        Representations are kept in a process LRU (`representation_cache_size` entries, for
+        `representation_cache_local_timeout` seconds) and optionally in the Django cache
+        (`representation_cache_timeout` seconds). Changes which don't move the stamp of the object are invalidated
+        by the service signals of the resource (see `signals.bind_service_signals`), which replace the epoch
+        of the changed object kept in the Django cache. The epoch is a part of the keys of both tiers, so
+        invalidations reach the caches of all processes. Changes of related objects (e.g. a renamed location
+        or health facility) are not tracked, they're visible once the entries expire.
+        Serializers opt in with `representation_cache` only when their resources are invalidated.
+    """
+    cache_name = 'default'
+    key_prefix = 'api_fhir_r4:representation:'
+    epoch_key_prefix = 'api_fhir_r4:representation_epoch:'
+
+    _lock = threading.Lock()
+    _entries = OrderedDict()
+    _keys_by_uuid = {}
+    # epochs of the objects of the page being serialized, see `page_scope`
+    _page_epochs = ContextVar('api_fhir_r4_representation_epochs', default=None)
+
+    @classmethod
+    def is_enabled(cls):
+        return bool(GeneralConfiguration.get_representation_cache_size()
+                    or GeneralConfiguration.get_representation_cache_timeout())
+
+    @classmethod
+    @contextmanager
+    def page_scope(cls, objs):
+        """
+            Read epochs of all objects of a page with a single request to the Django cache.
+        """
+        if not cls.is_enabled() or cls._page_epochs.get() is not None:
+            yield
+            return
+        epoch_keys = [cls._get_epoch_key(obj) for obj in objs if getattr(obj, 'uuid', None) is not None]
+        epochs = caches[cls.cache_name].get_many(epoch_keys) if epoch_keys else {}
+        token = cls._page_epochs.set({key: epochs.get(key, 0) for key in epoch_keys})
+        try:
+            yield
+        finally:
+            cls._page_epochs.reset(token)
+
+    @classmethod
+    def get_or_convert(cls, converter, obj, reference_type, convert, variant=None):
+        """
+            Return representation of `obj` from the cache, or the result of `convert()` which is cached.
+            Objects without uuid or version stamp are always converted. `variant` distinguishes representations
+            of the same object which differ (e.g. element projections).
+        """
+        key = cls.build_key(converter, obj, reference_type, variant) if cls.is_enabled() else None
+        if key is None:
+            return convert()
+        key = (*key, cls._get_epoch(obj))
+        representation = cls._get_local(key)
+        if representation is None:
+            representation = cls._get_shared(key)
+            if representation is not None:
+                cls._set_local(key, representation)
+        if representation is None:
+            representation = convert()
+            cls._set_local(key, representation)
+            cls._set_shared(key, representation)
+        # callers are free to modify the returned representation (e.g. add contained resources)
+        return copy.deepcopy(representation)
+
+    @classmethod
+    def build_key(cls, converter, obj, reference_type, variant=None):
+        uuid = getattr(obj, 'uuid', None)
+        stamp = VersionUtils.get_version_stamp(obj)
+        if uuid is None or stamp is None:
+            return None
+        converter_cls = converter if isinstance(converter, type) else type(converter)
+        return (f'{converter_cls.__module__}.{converter_cls.__qualname__}', reference_type,
+                str(uuid).lower(), stamp.isoformat(), variant)
+
+    @classmethod
+    def invalidate(cls, obj):
+        """
+            Drop cached representations of the object from the process cache and replace its epoch,
+            which drops its representations cached by other processes and in the shared tier.
+        """
+        uuid = getattr(obj, 'uuid', None)
+        if uuid is None:
+            return
+        with cls._lock:
+            for key in cls._keys_by_uuid.pop(str(uuid).lower(), ()):
+                cls._entries.pop(key, None)
+        # a new unique value instead of a counter, so an expired epoch never brings back older entries;
+        # it's kept as long as entries created with the previous one can live
+        timeout = max(GeneralConfiguration.get_representation_cache_local_timeout(),
+                      GeneralConfiguration.get_representation_cache_timeout())
+        if timeout:
+            caches[cls.cache_name].set(cls._get_epoch_key(obj), time.time_ns(), timeout)
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._entries.clear()
+            cls._keys_by_uuid.clear()
+
+    @classmethod
+    def _get_local(cls, key):
+        with cls._lock:
+            entry = cls._entries.get(key)
+            if entry is None:
+                return None
+            expires, representation = entry
+            if expires <= time.monotonic():
+                cls._remove_local(key)
+                return None
+            cls._entries.move_to_end(key)
+            return representation
+
+    @classmethod
+    def _set_local(cls, key, representation):
+        max_size = GeneralConfiguration.get_representation_cache_size()
+        timeout = GeneralConfiguration.get_representation_cache_local_timeout()
+        if not max_size or not timeout:
+            return
+        with cls._lock:
+            cls._entries[key] = (time.monotonic() + timeout, representation)
+            cls._entries.move_to_end(key)
+            cls._keys_by_uuid.setdefault(key[2], set()).add(key)
+            while len(cls._entries) > max_size:
+                cls._remove_local(next(iter(cls._entries)))
+
+    @classmethod
+    def _remove_local(cls, key):
+        # called with the lock held
+        cls._entries.pop(key, None)
+        uuid_keys = cls._keys_by_uuid.get(key[2])
+        if uuid_keys is not None:
+            uuid_keys.discard(key)
+            if not uuid_keys:
+                del cls._keys_by_uuid[key[2]]
+
+    @classmethod
+    def _get_shared(cls, key):
+        if not GeneralConfiguration.get_representation_cache_timeout():
+            return None
+        return caches[cls.cache_name].get(cls._get_shared_key(key))
+
+    @classmethod
+    def _set_shared(cls, key, representation):
+        timeout = GeneralConfiguration.get_representation_cache_timeout()
+        if timeout:
+            caches[cls.cache_name].set(cls._get_shared_key(key), representation, timeout)
+
+    @classmethod
+    def _get_shared_key(cls, key):
+        digest = hashlib.md5(':'.join(str(part) for part in key).encode('utf8')).hexdigest()
+        return f'{cls.key_prefix}{digest}'
+
+    @classmethod
+    def _get_epoch(cls, obj):
+        epoch_key = cls._get_epoch_key(obj)
+        page_epochs = cls._page_epochs.get()
+        if page_epochs is not None and epoch_key in page_epochs:
+            return page_epochs[epoch_key]
+        return caches[cls.cache_name].get(epoch_key, 0)
+
+    @classmethod
+    def _get_epoch_key(cls, obj):
+        return f'{cls.epoch_key_prefix}{obj._meta.label}:{str(obj.uuid).lower()}'
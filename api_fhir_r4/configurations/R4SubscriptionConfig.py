@@ -45,3 +45,59 @@ class R4SubscriptionConfig(SubscriptionConfiguration):
     def get_fhir_sub_criteria_key_resource_type(cls):
         return cls.get_config_attribute('R4_fhir_subscription_config').get('get_fhir_sub_criteria_key_resource_type',
                                                                            'resource_type')
+
+    @classmethod
+    def get_notification_dispatch_mode(cls):
+        return cls.get_config_attribute('R4_fhir_subscription_config').get('notification_dispatch_mode', 'sync')
+
+    @classmethod
+    def get_notification_connection_pool(cls):
+        return cls.get_config_attribute('R4_fhir_subscription_config').get('notification_connection_pool', True)
+
+    @classmethod
+    def get_notification_pool_size(cls):
+        return cls.get_config_attribute('R4_fhir_subscription_config').get('notification_pool_size', 100)
+
+    @classmethod
+    def get_notification_pool_size_per_host(cls):
+        return cls.get_config_attribute('R4_fhir_subscription_config').get('notification_pool_size_per_host', 10)
+
+    @classmethod
+    def get_notification_keepalive_timeout(cls):
+        return cls.get_config_attribute('R4_fhir_subscription_config').get('notification_keepalive_timeout', 30)
+
+    @classmethod
+    def get_notification_timeout(cls):
+        return cls.get_config_attribute('R4_fhir_subscription_config').get('notification_timeout', 10)
+
+    @classmethod
+    def get_outbox_batch_size(cls):
+        return cls.get_config_attribute('R4_fhir_subscription_config').get('outbox_batch_size', 100)
+
+    @classmethod
+    def get_outbox_poll_interval(cls):
+        return cls.get_config_attribute('R4_fhir_subscription_config').get('outbox_poll_interval', 5)
+
+    @classmethod
+    def get_outbox_max_attempts(cls):
+        return cls.get_config_attribute('R4_fhir_subscription_config').get('outbox_max_attempts', 5)
+
+    @classmethod
+    def get_outbox_retry_delay(cls):
+        return cls.get_config_attribute('R4_fhir_subscription_config').get('outbox_retry_delay', 60)
+
+    @classmethod
+    def get_outbox_lease_timeout(cls):
+        return cls.get_config_attribute('R4_fhir_subscription_config').get('outbox_lease_timeout', 300)
+
+    @classmethod
+    def get_notification_result_retention_days(cls):
+        return cls.get_config_attribute('R4_fhir_subscription_config').get('notification_result_retention_days')
+
+    @classmethod
+    def get_notification_result_max_per_subscription(cls):
+        return cls.get_config_attribute('R4_fhir_subscription_config').get('notification_result_max_per_subscription')
+
+    @classmethod
+    def get_subscription_index_timeout(cls):
+        return cls.get_config_attribute('R4_fhir_subscription_config').get('subscription_index_timeout', 60)
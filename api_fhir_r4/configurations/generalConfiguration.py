@@ -18,6 +18,20 @@ class GeneralConfiguration(BaseConfiguration):
         config.default_response_page_size = cfg['default_response_page_size']
         config.claim_rule_engine_validation = cfg['claim_rule_engine_validation']
         config.subscribe_insuree_signal = cfg['subscribe_insuree_signal']
+        config.count_cache_timeout = cfg.get('count_cache_timeout', DEFAULT_CFG['count_cache_timeout'])
+        config.count_estimate_threshold = cfg.get('count_estimate_threshold', DEFAULT_CFG['count_estimate_threshold'])
+        config.identifier_cache_timeout = cfg.get('identifier_cache_timeout', DEFAULT_CFG['identifier_cache_timeout'])
+        config.representation_cache_size = cfg.get(
+            'representation_cache_size', DEFAULT_CFG['representation_cache_size'])
+        config.representation_cache_timeout = cfg.get(
+            'representation_cache_timeout', DEFAULT_CFG['representation_cache_timeout'])
+        config.representation_cache_local_timeout = cfg.get(
+            'representation_cache_local_timeout', DEFAULT_CFG['representation_cache_local_timeout'])
+        config.export_chunk_size = cfg.get('export_chunk_size', DEFAULT_CFG['export_chunk_size'])
+        config.export_directory = cfg.get('export_directory', DEFAULT_CFG['export_directory'])
+        config.export_job_heartbeat_timeout = cfg.get(
+            'export_job_heartbeat_timeout', DEFAULT_CFG['export_job_heartbeat_timeout'])
+        config.export_retention_hours = cfg.get('export_retention_hours', DEFAULT_CFG['export_retention_hours'])
 
     @classmethod
     def get_default_audit_user_id(cls):
@@ -89,3 +103,43 @@ class GeneralConfiguration(BaseConfiguration):
     @classmethod
     def get_subscribe_insuree_signal(cls):
         return cls.get_config_attribute("subscribe_insuree_signal")
+
+    @classmethod
+    def get_count_cache_timeout(cls):
+        return cls.get_config_attribute("count_cache_timeout")
+
+    @classmethod
+    def get_count_estimate_threshold(cls):
+        return cls.get_config_attribute("count_estimate_threshold")
+
+    @classmethod
+    def get_identifier_cache_timeout(cls):
+        return cls.get_config_attribute("identifier_cache_timeout")
+
+    @classmethod
+    def get_representation_cache_size(cls):
+        return cls.get_config_attribute("representation_cache_size")
+
+    @classmethod
+    def get_representation_cache_timeout(cls):
+        return cls.get_config_attribute("representation_cache_timeout")
+
+    @classmethod
+    def get_representation_cache_local_timeout(cls):
+        return cls.get_config_attribute("representation_cache_local_timeout")
+
+    @classmethod
+    def get_export_chunk_size(cls):
+        return cls.get_config_attribute("export_chunk_size")
+
+    @classmethod
+    def get_export_directory(cls):
+        return cls.get_config_attribute("export_directory")
+
+    @classmethod
+    def get_export_job_heartbeat_timeout(cls):
+        return cls.get_config_attribute("export_job_heartbeat_timeout")
+
+    @classmethod
+    def get_export_retention_hours(cls):
+        return cls.get_config_attribute("export_retention_hours")
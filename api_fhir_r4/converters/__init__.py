@@ -1,7 +1,7 @@
 from abc import ABC
-from typing import Union
+from typing import Union, NamedTuple, Tuple
 
-from django.db.models import Model
+from django.db.models import Model, Prefetch
 from fhir.resources.R4B.extension import Extension
 from fhir.resources.R4B.money import Money
 from fhir.resources.R4B.quantity import Quantity
@@ -16,9 +16,34 @@ from fhir.resources.R4B.coding import Coding
 from fhir.resources.R4B.reference import Reference
 from fhir.resources.R4B.identifier import Identifier
 from api_fhir_r4.configurations import GeneralConfiguration
+from api_fhir_r4.converters.pageReferenceBuilder import PageReferenceBuilder
+
+
+class FHIRElementBuilder(NamedTuple):
+    """
+    Builder of a top level element of a resource, `method` is the name of the converter classmethod and
+    `relations` are the `select_related_fields` and `reference_related_fields` it reads.
+    """
+    method: str
+    relations: Tuple[str, ...] = ()
+    with_reference_type: bool = False
+
+    def build(self, converter, fhir_obj, imis_obj, reference_type):
+        args = (reference_type,) if self.with_reference_type else ()
+        getattr(converter, self.method)(fhir_obj, imis_obj, *args)
 
 
 class BaseFHIRConverter(ABC):
+    # relations read by `to_fhir_obj`, viewsets apply them to the querysets of list endpoints
+    select_related_fields = ()
+    prefetch_related_fields = ()
+    # relations only references are built from, loaded for whole pages of results (see `PageReferenceBuilder`)
+    reference_related_fields = ()
+    # `{element: FHIRElementBuilder}`, converters declaring builders build only the elements requested
+    # with `_elements`/`_summary` (see `ElementProjection`) and load only relations the builders read
+    fhir_element_builders = {}
+    # elements returned for `_summary=true`, the whole resource is returned if not declared
+    summary_elements = ()
 
     @classmethod
     def to_fhir_obj(cls, obj, reference_type):
@@ -32,6 +57,48 @@ class BaseFHIRConverter(ABC):
     def get_fhir_code_identifier_type(cls):
         raise NotImplementedError('get_fhir_code_identifier_type() must be implemented')
 
+    @classmethod
+    def build_fhir_elements(cls, fhir_obj, imis_obj, reference_type, elements=None):
+        for element, builder in cls.fhir_element_builders.items():
+            if elements is None or element in elements:
+                builder.build(cls, fhir_obj, imis_obj, reference_type)
+
+    @classmethod
+    def get_select_related_fields(cls, elements=None):
+        return cls._get_element_relations(cls.select_related_fields, elements)
+
+    @classmethod
+    def get_reference_related_fields(cls, elements=None):
+        return cls._get_element_relations(cls.reference_related_fields, elements)
+
+    @classmethod
+    def _get_element_relations(cls, fields, elements):
+        if elements is None or not cls.fhir_element_builders:
+            return fields
+        relations = {relation for element, builder in cls.fhir_element_builders.items()
+                     if element in elements for relation in builder.relations}
+        return tuple(field for field in fields if field in relations)
+
+    @classmethod
+    def apply_prefetch_plan(cls, queryset, elements=None):
+        select_related_fields = cls.get_select_related_fields(elements)
+        if select_related_fields:
+            queryset = queryset.select_related(*select_related_fields)
+        # lookups already prefetched by the queryset are skipped, prefetching them twice is an error
+        applied = {cls._get_prefetch_to(lookup) for lookup in queryset._prefetch_related_lookups}
+        lookups = [lookup for lookup in cls.prefetch_related_fields if cls._get_prefetch_to(lookup) not in applied]
+        if lookups:
+            queryset = queryset.prefetch_related(*lookups)
+        return queryset
+
+    @classmethod
+    def is_prefetched(cls, obj, relation):
+        return relation in getattr(obj, '_prefetched_objects_cache', {})
+
+    @classmethod
+    def _get_prefetch_to(cls, lookup):
+        return lookup.prefetch_to if isinstance(lookup, Prefetch) else lookup
+
     @classmethod
     def _build_simple_pk(cls, fhir_obj, resource_id):
         if type(resource_id) is not str:
@@ -134,21 +201,27 @@ class BaseFHIRConverter(ABC):
 
     @classmethod
     def __build_uuid_identifier(cls, uuid):
-        return cls.build_fhir_identifier(uuid,
-                                         R4IdentifierConfig.get_fhir_identifier_type_system(),
-                                         R4IdentifierConfig.get_fhir_uuid_type_code())
+        return cls.__build_identifier_of_type(uuid, 'uuid', R4IdentifierConfig.get_fhir_uuid_type_code)
 
     @classmethod
     def __build_id_identifier(cls, db_id):
-        return cls.build_fhir_identifier(db_id,
-                                         R4IdentifierConfig.get_fhir_identifier_type_system(),
-                                         R4IdentifierConfig.get_fhir_id_type_code())
+        return cls.__build_identifier_of_type(db_id, 'id', R4IdentifierConfig.get_fhir_id_type_code)
 
     @classmethod
     def __build_code_identifier(cls, code):
-        return cls.build_fhir_identifier(code,
-                                         R4IdentifierConfig.get_fhir_identifier_type_system(),
-                                         cls.get_fhir_code_identifier_type())
+        return cls.__build_identifier_of_type(code, 'code', cls.get_fhir_code_identifier_type)
+
+    @classmethod
+    def __build_identifier_of_type(cls, value, kind, get_type_code):
+        # types are built once per page of results, identifiers built within `PageReferenceBuilder.scope` share them
+        identifier_type = PageReferenceBuilder.get_identifier_type(
+            (cls, kind),
+            lambda: cls.build_codeable_concept(get_type_code(), R4IdentifierConfig.get_fhir_identifier_type_system())
+        )
+        identifier = Identifier.construct()
+        identifier.type = identifier_type
+        identifier.value = str(value)
+        return identifier
 
     @classmethod
     def build_fhir_identifier(cls, value, type_system, type_code):
@@ -8,10 +8,12 @@ from typing import Type
 from claim.services import ClaimElementSubmit
 from claim.apps import ClaimConfig
 from claim.models import Claim, ClaimItem, ClaimService, ClaimAttachment
+from django.db.models import Prefetch
+from insuree.models import InsureePolicy
 
 from api_fhir_r4.containedResources.converterUtils import get_from_contained_or_by_reference
 from api_fhir_r4.mapping.claimMapping import ClaimPriorityMapping, ClaimVisitTypeMapping
-from medical.models import Diagnosis
+from medical.models import Diagnosis, Item, Service
 from django.utils.translation import gettext as _
 
 from api_fhir_r4.configurations import R4IdentifierConfig, R4ClaimConfig, GeneralConfiguration
@@ -25,12 +27,19 @@ from fhir.resources.R4B.attachment import Attachment
 from fhir.resources.R4B.period import Period
 from fhir.resources.R4B.claim import ClaimDiagnosis, ClaimSupportingInfo, ClaimItem as FHIRClaimItem
 
-from api_fhir_r4.utils import TimeUtils, FhirUtils, DbManagerUtils
+from api_fhir_r4.utils import TimeUtils, FhirUtils, DbManagerUtils, ReferenceResolutionCache
 
 import logging
 logger = logging.getLogger('openimis.' + __name__)
 
 class ClaimConverter(BaseFHIRConverter, ReferenceConverterMixin):
+    select_related_fields = ('insuree', 'health_facility', 'admin', 'icd', 'icd_1', 'icd_2', 'icd_3', 'icd_4')
+    prefetch_related_fields = (
+        Prefetch('items', queryset=ClaimItem.objects.filter(validity_to__isnull=True).select_related('item')),
+        Prefetch('services', queryset=ClaimService.objects.filter(validity_to__isnull=True).select_related('service')),
+        Prefetch('insuree__insuree_policies',
+                 queryset=InsureePolicy.objects.filter(validity_to__isnull=True).select_related('policy')),
+    )
 
     @classmethod
     def to_fhir_obj(cls, imis_claim, reference_type=ReferenceConverterMixin.UUID_REFERENCE_TYPE):
@@ -57,6 +66,7 @@ class ClaimConverter(BaseFHIRConverter, ReferenceConverterMixin):
         fhir_claim = FHIRClaim(**fhir_claim)
         imis_claim = Claim()
         imis_claim.audit_user_id = audit_user_id
+        cls.prefetch_imis_references(fhir_claim)
         cls.build_imis_date_claimed(imis_claim, fhir_claim, errors)
         cls.build_imis_health_facility(errors, fhir_claim, imis_claim, audit_user_id=audit_user_id)
         cls.build_imis_identifier(imis_claim, fhir_claim, errors)
@@ -98,6 +108,24 @@ class ClaimConverter(BaseFHIRConverter, ReferenceConverterMixin):
             **cls.get_database_query_id_parameteres_from_reference(reference))
 
 
+    @classmethod
+    def prefetch_imis_references(cls, fhir_claim):
+        # diagnoses, items and services are loaded with a single query per model instead of one per element
+        if fhir_claim.diagnosis:
+            ReferenceResolutionCache.prefetch(
+                Diagnosis, 'code', [cls.get_imis_diagnosis_code(diagnosis) for diagnosis in fhir_claim.diagnosis])
+        item_references, service_references = [], []
+        for fhir_item in fhir_claim.item or []:
+            if not fhir_item.extension or not fhir_item.category:
+                continue
+            category = fhir_item.category.text
+            if category == R4ClaimConfig.get_fhir_claim_item_code():
+                item_references.append(fhir_item.extension[0].valueReference)
+            elif category == R4ClaimConfig.get_fhir_claim_service_code():
+                service_references.append(fhir_item.extension[0].valueReference)
+        MedicationConverter.prefetch_imis_objs_by_fhir_references(Item, item_references)
+        ActivityDefinitionConverter.prefetch_imis_objs_by_fhir_references(Service, service_references)
+
     @classmethod
     def build_imis_date_claimed(cls, imis_claim, fhir_claim, errors):
         if fhir_claim.created:
@@ -196,7 +224,8 @@ class ClaimConverter(BaseFHIRConverter, ReferenceConverterMixin):
 
     @classmethod
     def get_imis_diagnosis_by_code(cls, icd_code):
-        return Diagnosis.objects.get(code=icd_code)
+        return ReferenceResolutionCache.get_object(
+            Diagnosis, 'code', icd_code, lambda: Diagnosis.objects.get(code=icd_code))
 
     @classmethod
     def get_imis_diagnosis_code(cls, diagnosis):
@@ -284,7 +313,9 @@ class ClaimConverter(BaseFHIRConverter, ReferenceConverterMixin):
 
     @classmethod
     def build_fhir_items_for_imis_items(cls, fhir_claim, imis_claim, reference_type):
-        for claim_item in imis_claim.items.filter(validity_to=None).all():
+        claim_items = imis_claim.items.all() if cls.is_prefetched(imis_claim, 'items') \
+            else imis_claim.items.filter(validity_to=None)
+        for claim_item in claim_items:
             if claim_item:
                 item_type = R4ClaimConfig.get_fhir_claim_item_code()
                 cls.build_fhir_item(fhir_claim, claim_item.item.code, item_type, claim_item, reference_type)
@@ -318,7 +349,9 @@ class ClaimConverter(BaseFHIRConverter, ReferenceConverterMixin):
 
     @classmethod
     def build_fhir_items_for_imis_services(cls, fhir_claim, imis_claim, reference_type):
-        for claim_service in imis_claim.services.filter(validity_to=None).all():
+        claim_services = imis_claim.services.all() if cls.is_prefetched(imis_claim, 'services') \
+            else imis_claim.services.filter(validity_to=None)
+        for claim_service in claim_services:
             if claim_service:
                 item_type = R4ClaimConfig.get_fhir_claim_service_code()
                 cls.build_fhir_item(fhir_claim, claim_service.service.code, item_type, claim_service, reference_type)
@@ -9,6 +9,7 @@ from fhir.resources.R4B.extension import Extension
 
 
 class CommunicationRequestConverter(BaseFHIRConverter, ReferenceConverterMixin):
+    select_related_fields = ('admin', 'insuree')
 
     @classmethod
     def to_fhir_obj(cls, imis_claim, reference_type=ReferenceConverterMixin.UUID_REFERENCE_TYPE):
@@ -1,6 +1,6 @@
 import core
 
-from django.db.models import Q
+from django.db.models import Prefetch, Q
 from django.utils.translation import gettext as _
 from api_fhir_r4.configurations import GeneralConfiguration, R4CoverageConfig
 from api_fhir_r4.converters import BaseFHIRConverter, ReferenceConverterMixin
@@ -24,6 +24,11 @@ from api_fhir_r4.utils import DbManagerUtils, TimeUtils
 
 
 class ContractConverter(BaseFHIRConverter, ReferenceConverterMixin):
+    select_related_fields = ('product', 'officer', 'family__head_insuree', 'family__location')
+    prefetch_related_fields = (
+        Prefetch('insuree_policies',
+                 queryset=InsureePolicy.objects.filter(validity_to__isnull=True).select_related('insuree')),
+    )
     @classmethod
     def to_fhir_obj(cls, imis_policy, reference_type=ReferenceConverterMixin.UUID_REFERENCE_TYPE):
         fhir_contract = Contract.construct()
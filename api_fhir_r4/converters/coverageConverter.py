@@ -13,6 +13,7 @@ from api_fhir_r4.utils import TimeUtils
 
 
 class CoverageConverter(BaseFHIRConverter, ReferenceConverterMixin):
+    select_related_fields = ('family__head_insuree', 'product')
 
     @classmethod
     def to_fhir_obj(cls, imis_policy, reference_type=ReferenceConverterMixin.UUID_REFERENCE_TYPE):
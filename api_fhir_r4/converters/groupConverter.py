@@ -1,3 +1,4 @@
+from django.db.models import Prefetch
 from django.db.models.query import Q
 from django.utils.translation import gettext as _
 from fhir.resources.R4B.humanname import HumanName
@@ -17,6 +18,15 @@ from api_fhir_r4.exceptions import FHIRException
 
 
 class GroupConverter(BaseFHIRConverter, ReferenceConverterMixin):
+    # provided by querysets of GroupViewSet, computed with a query per family when missing
+    MEMBER_COUNT_ANNOTATION = 'fhir_member_count'
+    ACTIVE_POLICY_COUNT_ANNOTATION = 'fhir_active_policy_count'
+    ACTIVE_MEMBERS_PREFETCH = 'fhir_active_members'
+
+    select_related_fields = ('head_insuree', 'location__parent__parent__parent', 'family_type', 'confirmation_type')
+    prefetch_related_fields = (
+        Prefetch('members', queryset=Insuree.objects.filter(validity_to__isnull=True), to_attr=ACTIVE_MEMBERS_PREFETCH),
+    )
 
     @classmethod
     def to_fhir_obj(cls, imis_family, reference_type=ReferenceConverterMixin.UUID_REFERENCE_TYPE):
@@ -138,11 +148,13 @@ class GroupConverter(BaseFHIRConverter, ReferenceConverterMixin):
         
     @classmethod
     def build_fhir_active(cls, fhir_family, imis_family):
-        number_of_active_policy = InsureePolicy.objects.filter(
-            Q(insuree__family__uuid=imis_family.uuid),
-            Q(policy__status=Policy.STATUS_ACTIVE),
-            Q(validity_to__isnull=True)
-        ).count()
+        number_of_active_policy = getattr(imis_family, cls.ACTIVE_POLICY_COUNT_ANNOTATION, None)
+        if number_of_active_policy is None:
+            number_of_active_policy = InsureePolicy.objects.filter(
+                Q(insuree__family__uuid=imis_family.uuid),
+                Q(policy__status=Policy.STATUS_ACTIVE),
+                Q(validity_to__isnull=True)
+            ).count()
         fhir_family.active = True if number_of_active_policy > 0 else False
 
     @classmethod
@@ -151,7 +163,9 @@ class GroupConverter(BaseFHIRConverter, ReferenceConverterMixin):
 
     @classmethod
     def build_fhir_quantity(cls,fhir_family, imis_family):
-        quantity = Insuree.objects.filter(family__uuid=imis_family.uuid, validity_to__isnull=True).count()
+        quantity = getattr(imis_family, cls.MEMBER_COUNT_ANNOTATION, None)
+        if quantity is None:
+            quantity = Insuree.objects.filter(family__uuid=imis_family.uuid, validity_to__isnull=True).count()
         fhir_family.quantity = quantity
 
     @classmethod
@@ -292,7 +306,9 @@ class GroupConverter(BaseFHIRConverter, ReferenceConverterMixin):
 
     @classmethod
     def build_fhir_members(cls, family):
-        family_insurees = family.members.all()
+        family_insurees = getattr(family, cls.ACTIVE_MEMBERS_PREFETCH, None)
+        if family_insurees is None:
+            family_insurees = family.members.filter(validity_to__isnull=True)
         members = [cls._create_group_member(member) for member in family_insurees]
         return members
 
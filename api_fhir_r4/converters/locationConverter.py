@@ -12,6 +12,8 @@ from api_fhir_r4.utils import DbManagerUtils
 
 
 class LocationConverter(BaseFHIRConverter, ReferenceConverterMixin):
+    select_related_fields = ('parent',)
+
     PHYSICAL_TYPES = LocationTypeMapping.PHYSICAL_TYPES_DEFINITIONS
 
     @classmethod
@@ -0,0 +1,44 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db.models import prefetch_related_objects
+
+
+class PageReferenceBuilder(object):
+    """
+        Prepares a page of IMIS objects for conversion. Relations the converter builds references from
+        (`reference_related_fields`) are loaded for the whole page with one query per relation, objects already
+        loaded (e.g. with `select_related`) are skipped. Within the scope identifier types are built once and
+        shared by identifiers of all resources and references of the page.
+    """
+    _identifier_types = ContextVar('api_fhir_r4_identifier_types', default=None)
+
+    @classmethod
+    @contextmanager
+    def scope(cls, converter, objs, elements=None):
+        cls.prefetch_references(converter, objs, elements)
+        if cls._identifier_types.get() is not None:
+            # nested pages (e.g. contained resources) share identifier types of the outer one
+            yield
+            return
+        token = cls._identifier_types.set({})
+        try:
+            yield
+        finally:
+            cls._identifier_types.reset(token)
+
+    @classmethod
+    def prefetch_references(cls, converter, objs, elements=None):
+        get_reference_related_fields = getattr(converter, 'get_reference_related_fields', None)
+        fields = get_reference_related_fields(elements) if get_reference_related_fields else ()
+        if objs and fields:
+            prefetch_related_objects(objs, *fields)
+
+    @classmethod
+    def get_identifier_type(cls, key, build):
+        identifier_types = cls._identifier_types.get()
+        if identifier_types is None:
+            return build()
+        if key not in identifier_types:
+            identifier_types[key] = build()
+        return identifier_types[key]
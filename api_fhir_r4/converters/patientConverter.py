@@ -9,7 +9,8 @@ from insuree.models import Insuree, Gender, Education, Profession, Family, \
     InsureePhoto, Relation, IdentificationType
 from location.models import Location, HealthFacility
 from api_fhir_r4.configurations import R4IdentifierConfig, GeneralConfiguration, R4MaritalConfig
-from api_fhir_r4.converters import BaseFHIRConverter, PersonConverterMixin, ReferenceConverterMixin
+from api_fhir_r4.converters import BaseFHIRConverter, PersonConverterMixin, ReferenceConverterMixin, \
+    FHIRElementBuilder
 from api_fhir_r4.converters.groupConverter import GroupConverter
 from api_fhir_r4.converters.locationConverter import LocationConverter
 from api_fhir_r4.mapping.patientMapping import RelationshipMapping, EducationLevelMapping, \
@@ -19,25 +20,39 @@ from fhir.resources.R4B.patient import Patient, PatientContact
 from fhir.resources.R4B.extension import Extension
 from fhir.resources.R4B.attachment import Attachment
 from api_fhir_r4.exceptions import FHIRException
-from api_fhir_r4.utils import TimeUtils, DbManagerUtils
+from api_fhir_r4.utils import TimeUtils, DbManagerUtils, ReferenceResolutionCache
 
 class PatientConverter(BaseFHIRConverter, PersonConverterMixin, ReferenceConverterMixin):
-
-    @classmethod
-    def to_fhir_obj(cls, imis_insuree, reference_type=ReferenceConverterMixin.UUID_REFERENCE_TYPE):
+    select_related_fields = ('gender', 'photo', 'education', 'profession', 'relationship', 'type_of_id',
+                             'family__head_insuree', 'family__location')
+    reference_related_fields = ('current_village__parent__parent__parent', 'family__location__parent__parent__parent',
+                                'health_facility')
+    fhir_element_builders = {
+        'name': FHIRElementBuilder('build_human_names'),
+        'identifier': FHIRElementBuilder('build_fhir_identifiers', ('type_of_id',)),
+        'birthDate': FHIRElementBuilder('build_fhir_birth_date'),
+        'gender': FHIRElementBuilder('build_fhir_gender', ('gender',)),
+        'maritalStatus': FHIRElementBuilder('build_fhir_marital_status'),
+        'telecom': FHIRElementBuilder('build_fhir_telecom'),
+        'address': FHIRElementBuilder('build_fhir_addresses',
+                                      ('family__location', 'current_village__parent__parent__parent',
+                                       'family__location__parent__parent__parent'),
+                                      with_reference_type=True),
+        'extension': FHIRElementBuilder('build_fhir_extentions',
+                                        ('education', 'profession', 'type_of_id', 'family__head_insuree'),
+                                        with_reference_type=True),
+        'contact': FHIRElementBuilder('build_fhir_contact', ('relationship', 'family__head_insuree')),
+        'photo': FHIRElementBuilder('build_fhir_photo', ('photo',)),
+        'generalPractitioner': FHIRElementBuilder('build_fhir_general_practitioner', ('health_facility',),
+                                                  with_reference_type=True),
+    }
+    summary_elements = ('identifier', 'active', 'name', 'telecom', 'gender', 'birthDate', 'address')
+
+    @classmethod
+    def to_fhir_obj(cls, imis_insuree, reference_type=ReferenceConverterMixin.UUID_REFERENCE_TYPE, elements=None):
         fhir_patient = Patient.construct()
         cls.build_fhir_pk(fhir_patient, imis_insuree, reference_type)
-        cls.build_human_names(fhir_patient, imis_insuree)
-        cls.build_fhir_identifiers(fhir_patient, imis_insuree)
-        cls.build_fhir_birth_date(fhir_patient, imis_insuree)
-        cls.build_fhir_gender(fhir_patient, imis_insuree)
-        cls.build_fhir_marital_status(fhir_patient, imis_insuree)
-        cls.build_fhir_telecom(fhir_patient, imis_insuree)
-        cls.build_fhir_addresses(fhir_patient, imis_insuree, reference_type)
-        cls.build_fhir_extentions(fhir_patient, imis_insuree, reference_type)
-        cls.build_fhir_contact(fhir_patient, imis_insuree)
-        cls.build_fhir_photo(fhir_patient, imis_insuree)
-        cls.build_fhir_general_practitioner(fhir_patient, imis_insuree, reference_type)
+        cls.build_fhir_elements(fhir_patient, imis_insuree, reference_type, elements)
         return fhir_patient
 
     @classmethod
@@ -524,7 +539,8 @@ class PatientConverter(BaseFHIRConverter, PersonConverterMixin, ReferenceConvert
 
         hf_uuid = cls.get_resource_id_from_reference(fhir_patient.generalPractitioner[0])
         try:
-            health_facility = HealthFacility.objects.get(uuid=hf_uuid)
+            health_facility = ReferenceResolutionCache.get_object(
+                HealthFacility, 'uuid', hf_uuid, lambda: HealthFacility.objects.get(uuid=hf_uuid))
             imis_insuree.health_facility = health_facility
         except HealthFacility.DoesNotExist:
             raise FHIRException(F"Invalid location reference, {hf_uuid} doesn't match any HealthFacility.")
@@ -1,9 +1,11 @@
 import inspect
 import logging
 
+from collections import defaultdict
 from typing import Tuple
 import uuid
 from api_fhir_r4.exceptions import FHIRRequestProcessException
+from api_fhir_r4.utils import ReferenceResolutionCache
 from fhir.resources.R4B.reference import Reference
 
 
@@ -35,6 +37,26 @@ class ReferenceConverterMixin(object):
     def get_imis_obj_by_fhir_reference(cls, reference, errors=None):
         raise NotImplementedError('`get_imis_object_by_fhir_reference()` must be implemented.')  # pragma: no cover
 
+    @classmethod
+    def prefetch_imis_objs_by_fhir_references(cls, model, references, code_keyword_name='code'):
+        """
+        Loads objects for all given references into the identity map of the current request, with one query
+        per lookup field, so following `get_imis_obj_by_fhir_reference` calls don't hit the database.
+        """
+        lookups = defaultdict(list)
+        for reference in references:
+            if reference is None:
+                continue
+            try:
+                id_parameters = cls.get_database_query_id_parameteres_from_reference(reference, code_keyword_name)
+            except FHIRRequestProcessException:
+                # invalid references are reported when the reference is resolved
+                continue
+            for field_name, value in id_parameters.items():
+                lookups[field_name].append(value)
+        for field_name, values in lookups.items():
+            ReferenceResolutionCache.prefetch(model, field_name, values)
+
     @classmethod
     def build_fhir_resource_reference(cls, obj, type=None, display=None, reference_type=UUID_REFERENCE_TYPE):
         if obj:
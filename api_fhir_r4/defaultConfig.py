@@ -13,6 +13,16 @@ DEFAULT_CFG = {
     "default_response_page_size": 10,
     "claim_rule_engine_validation": True,
     "subscribe_insuree_signal": False,
+    "count_cache_timeout": 60,
+    "count_estimate_threshold": 100000,
+    "identifier_cache_timeout": 5 * 60,
+    "representation_cache_size": 0,
+    "representation_cache_timeout": 0,
+    "representation_cache_local_timeout": 60,
+    "export_chunk_size": 500,
+    "export_directory": "",
+    "export_job_heartbeat_timeout": 5 * 60,
+    "export_retention_hours": 24,
     "R4_fhir_identifier_type_config": {
         "system": "https://openimis.github.io/openimis_fhir_r4_ig/CodeSystem/openimis-identifiers",
         "fhir_code_for_imis_db_uuid_type": "UUID",
@@ -188,7 +198,21 @@ DEFAULT_CFG = {
         "fhir_sub_status_off": "off",
         "fhir_sub_status_active": "active",
         "get_fhir_sub_criteria_key_resource": "resource",
-        "get_fhir_sub_criteria_key_resource_type": "resource_type"
+        "get_fhir_sub_criteria_key_resource_type": "resource_type",
+        "notification_dispatch_mode": "sync",
+        "notification_connection_pool": True,
+        "notification_pool_size": 100,
+        "notification_pool_size_per_host": 10,
+        "notification_keepalive_timeout": 30,
+        "notification_timeout": 10,
+        "outbox_batch_size": 100,
+        "outbox_poll_interval": 5,
+        "outbox_max_attempts": 5,
+        "outbox_retry_delay": 60,
+        "outbox_lease_timeout": 300,
+        "notification_result_retention_days": None,
+        "notification_result_max_per_subscription": None,
+        "subscription_index_timeout": 60
     },
     "R4_fhir_payment_notice_config": {
         "get_fhir_payment_notice_status_active": "active",
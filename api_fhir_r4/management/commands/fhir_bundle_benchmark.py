@@ -0,0 +1,64 @@
+import json
+import os
+import timeit
+import urllib
+import uuid
+
+from django.core.management.base import BaseCommand
+from fhir.resources.R4B.bundle import Bundle, BundleEntry, BundleLink
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api_fhir_r4.paginations import FhirBundleResultsSetPagination
+
+
+class _BenchmarkPagination(FhirBundleResultsSetPagination):
+    # no real page behind the benchmark, only the Bundle building is measured
+
+    def get_bundle_total(self):
+        return len(self.benchmark_data)
+
+    def get_next_link(self):
+        return None
+
+    def get_previous_link(self):
+        return None
+
+
+def build_pydantic_bundle(pagination, data):
+    # previous implementation, every entry goes through BundleEntry validation and back through `.dict()`
+    bundle = Bundle.construct()
+    bundle.type = "searchset"
+    bundle.total = pagination.get_bundle_total()
+    bundle.link = [BundleLink(url=urllib.parse.quote_plus(pagination.request.build_absolute_uri()), relation="self")]
+    bundle.entry = [BundleEntry(fullUrl=pagination.build_full_url_for_resource(obj), resource=obj) for obj in data]
+    return bundle.dict()
+
+
+class Command(BaseCommand):
+    help = "Compare building searchset Bundles as plain dicts with building them through pydantic models."
+    sample_resource_path = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'tests', 'test', 'test_patient.json')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, nargs='+', default=[100, 1000],
+                            help="Bundle sizes (_count) to benchmark")
+        parser.add_argument('--repeat', type=int, default=5, help="Number of builds measured per Bundle size")
+
+    def handle(self, *args, **options):
+        with open(self.sample_resource_path) as sample_file:
+            sample = json.load(sample_file)
+        request = Request(APIRequestFactory().get('/api_fhir_r4/Patient/'))
+
+        for count in options['count']:
+            pagination = _BenchmarkPagination()
+            pagination.request = request
+            pagination.benchmark_data = [{**sample, 'id': str(uuid.uuid4())} for _ in range(count)]
+
+            raw = min(timeit.repeat(lambda: pagination.build_bundle_set(pagination.benchmark_data),
+                                    number=1, repeat=options['repeat']))
+            pydantic = min(timeit.repeat(lambda: build_pydantic_bundle(pagination, pagination.benchmark_data),
+                                         number=1, repeat=options['repeat']))
+            self.stdout.write(
+                f"_count={count}: dict builder {raw * 1000:.2f} ms, "
+                f"pydantic builder {pydantic * 1000:.2f} ms ({pydantic / raw:.0f}x)")
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from api_fhir_r4.bulkExport import ExportJobWorker
+
+
+class Command(BaseCommand):
+    help = "Run asynchronous $export jobs, fail stale jobs and remove expired ones."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Run accepted jobs and exit")
+        parser.add_argument('--poll-interval', type=float, default=5,
+                            help="Seconds to wait when no jobs are accepted")
+
+    def handle(self, *args, **options):
+        worker = ExportJobWorker()
+        if options['once']:
+            executed = worker.run_pending()
+            self.stdout.write(f"Executed {executed} export jobs")
+            return
+        worker.run(poll_interval=options['poll_interval'])
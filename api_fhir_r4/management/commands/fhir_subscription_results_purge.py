@@ -0,0 +1,26 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from api_fhir_r4.configurations import R4SubscriptionConfig
+from api_fhir_r4.models import SubscriptionNotificationResult
+from core.datetimes.ad_datetime import AdDatetime
+
+
+class Command(BaseCommand):
+    help = "Delete old subscription notification results (retention and per subscription limit)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--retention-days', type=int, default=None,
+                            help="Delete results older than given number of days")
+        parser.add_argument('--max-per-subscription', type=int, default=None,
+                            help="Number of the newest results kept for every subscription")
+
+    def handle(self, *args, **options):
+        retention_days = options['retention_days'] \
+            or R4SubscriptionConfig.get_notification_result_retention_days()
+        max_per_subscription = options['max_per_subscription'] \
+            or R4SubscriptionConfig.get_notification_result_max_per_subscription()
+        older_than = AdDatetime.now() - timedelta(days=retention_days) if retention_days else None
+        deleted = SubscriptionNotificationResult.objects.purge(older_than, max_per_subscription)
+        self.stdout.write(f"Deleted {deleted} subscription notification results")
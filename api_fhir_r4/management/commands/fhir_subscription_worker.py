@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from api_fhir_r4.subscriptions.notificationOutbox import SubscriptionNotificationOutboxWorker
+
+
+class Command(BaseCommand):
+    help = "Send subscription notifications stored in the outbox (notification_dispatch_mode 'outbox')."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Send pending notifications and exit")
+        parser.add_argument('--batch-size', type=int, default=None,
+                            help="Number of notifications claimed and sent at once")
+        parser.add_argument('--poll-interval', type=float, default=None,
+                            help="Seconds to wait when no notifications are pending")
+
+    def handle(self, *args, **options):
+        worker = SubscriptionNotificationOutboxWorker(batch_size=options['batch_size'])
+        if options['once']:
+            dispatched = 0
+            while True:
+                batch = worker.dispatch_pending()
+                dispatched += batch
+                if batch < worker.batch_size:
+                    break
+            self.stdout.write(f"Dispatched {dispatched} notifications")
+            return
+        worker.run(poll_interval=options['poll_interval'])
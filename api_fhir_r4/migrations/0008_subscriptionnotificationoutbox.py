@@ -0,0 +1,33 @@
+import core.datetimes.ad_datetime
+import core.fields
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_fhir_r4', '0007_alter_historicalsubscription_criteria_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubscriptionNotificationOutbox',
+            fields=[
+                ('id', models.UUIDField(db_column='UUID', default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('payload', models.TextField(db_column='Payload')),
+                ('status', models.SmallIntegerField(choices=[(0, 'pending'), (1, 'failed')], db_column='Status', default=0)),
+                ('attempts', models.SmallIntegerField(db_column='Attempts', default=0)),
+                ('created_at', core.fields.DateTimeField(db_column='CreatedAt', default=core.datetimes.ad_datetime.AdDatetime.now)),
+                ('next_attempt_at', core.fields.DateTimeField(db_column='NextAttemptAt', default=core.datetimes.ad_datetime.AdDatetime.now)),
+                ('last_error', models.TextField(blank=True, db_column='LastError', default=None, null=True)),
+                ('subscription', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='outbox_notifications', to='api_fhir_r4.subscription')),
+            ],
+            options={
+                'db_table': 'tblSubscriptionNotificationOutbox',
+                'managed': True,
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='fhir_outbox_pending_idx')],
+            },
+        ),
+    ]
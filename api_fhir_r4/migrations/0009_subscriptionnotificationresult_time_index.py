@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_fhir_r4', '0008_subscriptionnotificationoutbox'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='subscriptionnotificationresult',
+            index=models.Index(fields=['subscription', 'notification_time'], name='fhir_sub_result_time_idx'),
+        ),
+    ]
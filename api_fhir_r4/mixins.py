@@ -4,13 +4,19 @@ from typing import List
 
 from django.core.exceptions import ObjectDoesNotExist, FieldError
 from django.http import Http404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 
 from rest_framework import mixins
+from rest_framework.permissions import BasePermission
 
-from api_fhir_r4.model_retrievers import GenericModelRetriever
+from api_fhir_r4.cache import IdentifierLookupCache
+from api_fhir_r4.model_retrievers import GenericModelRetriever, CombinedModelRetriever, IdentifierLookupMetrics
 from rest_framework.response import Response
 
 from api_fhir_r4.multiserializer.mixins import MultiSerializerUpdateModelMixin, MultiSerializerRetrieveModelMixin
+from api_fhir_r4.projections import ElementProjection
+from api_fhir_r4.utils import VersionUtils
 
 logger = logging.getLogger(__name__)
 
@@ -24,32 +30,134 @@ class GenericMultiIdentifierMixin(ABC):
         # Identifiers available for given resource
         pass
 
+    def _get_valid_retrievers(self, identifier):
+        return [retriever for retriever in self.retrievers if retriever.identifier_validator(identifier)]
+
+    def _get_retrieve_queryset(self, queryset):
+        # relations declared by the converter are loaded together with the retrieved object
+        apply_prefetch_plan = getattr(self, 'apply_prefetch_plan', None)
+        return apply_prefetch_plan(queryset) if apply_prefetch_plan else queryset
+
+    def _get_object_with_retrievers(self, queryset, identifier, retrievers):
+        """
+        Resolve identifier with all valid retrievers at once. Identifiers resolved before are fetched
+        by the primary key cached in `IdentifierLookupCache` (see `CombinedModelRetriever.filter_resolved`).
+        """
+        if not IdentifierLookupCache.is_enabled():
+            return CombinedModelRetriever.get_model_object(queryset, identifier, retrievers)
+
+        retrievers = CombinedModelRetriever.get_resolvable_retrievers(queryset, identifier, retrievers)
+        lookup = CombinedModelRetriever.get_lookup(identifier, retrievers, queryset)
+        cached = IdentifierLookupCache.get(queryset, retrievers, identifier, lookup)
+        if cached is not None:
+            retriever, pk, _ = cached
+            resource = next(iter(CombinedModelRetriever.filter_resolved(queryset, retriever, pk)[:1]), None)
+            if resource is not None:
+                return retriever, resource
+
+        retriever, resource = CombinedModelRetriever.get_model_object_with_resolvable_retrievers(
+            queryset, identifier, retrievers, lookup)
+        IdentifierLookupCache.set(queryset, retrievers, identifier, lookup, retriever, resource.pk,
+                                  VersionUtils.get_version_stamp(resource))
+        return retriever, resource
+
     def _get_object_with_first_valid_retriever(self, identifier):
-        for retriever in self.retrievers:
-            if retriever.identifier_validator(identifier):
-                try:
-                    queryset = retriever.retriever_additional_queryset_filtering(self.get_queryset())
-                    resource = retriever.get_model_object(queryset, identifier)
-
-                    # May raise a permission denied
-                    self.check_object_permissions(self.request, resource)
-                    return retriever.serializer_reference_type, resource
-                except ObjectDoesNotExist as e:
-                    logger.exception(
-                        F"Failed to retrieve object from queryset {self.get_queryset()} using"
-                        F"identifier {identifier} for matching retriever: {retriever}"
-                    )
+        retrievers = self._get_valid_retrievers(identifier)
+        if retrievers:
+            queryset = self._get_retrieve_queryset(self.get_queryset())
+            try:
+                retriever, resource = self._get_object_with_retrievers(queryset, identifier, retrievers)
+
+                # May raise a permission denied
+                self.check_object_permissions(self.request, resource)
+                return retriever.serializer_reference_type, resource
+            except ObjectDoesNotExist:
+                IdentifierLookupMetrics.record_miss(queryset.model, retrievers, identifier)
 
         # Raise Http404 if resource couldn't be fetched with any of the retrievers
         raise Http404(f"Resource for identifier {identifier} not found")
 
 
-class MultiIdentifierRetrieverMixin(mixins.RetrieveModelMixin, GenericMultiIdentifierMixin, ABC):
+class ConditionalReadMixin(object):
+    """
+    Weak `ETag` and `Last-Modified` headers derived from the version stamp of the resource (see `VersionUtils`),
+    `If-None-Match` and `If-Modified-Since` requests for the current version are answered with 304. The `ETag` also
+    depends on the elements requested with `_elements`/`_summary`, so it's never shared by the full resource
+    and its projections.
+    """
+
+    @staticmethod
+    def _is_conditional_read(request):
+        return 'HTTP_IF_NONE_MATCH' in request.META or 'HTTP_IF_MODIFIED_SINCE' in request.META
+
+    def _checks_object_permissions(self):
+        return any(type(permission).has_object_permission is not BasePermission.has_object_permission
+                   for permission in self.get_permissions())
+
+    def _get_version_stamp_with_retrievers(self, queryset, identifier, retrievers):
+        """
+        Version stamp of the resource read with a `.values()` query, without loading and converting it,
+        or taken from `IdentifierLookupCache` without any query if the identifier was resolved before.
+        None if the stamp can't be determined this way (ambiguous identifier, model without version stamp).
+        """
+        stamp_field = VersionUtils.get_version_stamp_field(queryset.model)
+        if stamp_field is None:
+            return None
+        try:
+            retrievers = CombinedModelRetriever.get_resolvable_retrievers(queryset, identifier, retrievers)
+        except FieldError:
+            return None
+        lookup = CombinedModelRetriever.get_lookup(identifier, retrievers, queryset)
+        cached = IdentifierLookupCache.get(queryset, retrievers, identifier, lookup) \
+            if IdentifierLookupCache.is_enabled() else None
+        if cached is not None and cached[2] is not None:
+            # entries are dropped when the table changes, so the cached stamp is the current one
+            return cached[2]
+        queryset = queryset.filter(lookup)
+        stamps = list(queryset.prefetch_related(None).order_by().values_list(stamp_field, flat=True)[:2])
+        return stamps[0] if len(stamps) == 1 else None
+
+    @staticmethod
+    def _get_etag(request, stamp, converter):
+        variant = ElementProjection.get_variant(ElementProjection.get_elements(request, converter))
+        return VersionUtils.get_etag(stamp, variant)
+
+    def _get_conditional_response(self, request, stamp, converter):
+        if stamp is None:
+            return None
+        response = get_conditional_response(
+            request, etag=self._get_etag(request, stamp, converter),
+            last_modified=VersionUtils.get_last_modified(stamp))
+        return self._set_version_headers(request, response, stamp, converter) if response is not None else None
+
+    def _set_version_headers(self, request, response, stamp, converter):
+        if stamp is not None:
+            response['ETag'] = self._get_etag(request, stamp, converter)
+            response['Last-Modified'] = http_date(VersionUtils.get_last_modified(stamp))
+        return response
+
+
+class MultiIdentifierRetrieverMixin(mixins.RetrieveModelMixin, GenericMultiIdentifierMixin, ConditionalReadMixin, ABC):
 
     def retrieve(self, request, *args, **kwargs):
-        ref_type, instance = self._get_object_with_first_valid_retriever(kwargs['identifier'])
+        identifier = kwargs['identifier']
+        converter = getattr(self.get_serializer_class(), 'fhirConverter', None)
+        # object permissions need the instance, then the stamp is checked after loading it
+        if self._is_conditional_read(request) and not self._checks_object_permissions():
+            retrievers = self._get_valid_retrievers(identifier)
+            if retrievers:
+                stamp = self._get_version_stamp_with_retrievers(self.get_queryset(), identifier, retrievers)
+                conditional_response = self._get_conditional_response(request, stamp, converter)
+                if conditional_response is not None:
+                    return conditional_response
+
+        ref_type, instance = self._get_object_with_first_valid_retriever(identifier)
+        stamp = VersionUtils.get_version_stamp(instance)
+        conditional_response = self._get_conditional_response(request, stamp, converter)
+        if conditional_response is not None:
+            return conditional_response
         serializer = self.get_serializer(instance, reference_type=ref_type)
-        return Response(serializer.data)
+        return self._set_version_headers(request, Response(serializer.data), stamp, converter)
 
 
 class MultiIdentifierUpdateMixin(mixins.UpdateModelMixin, GenericMultiIdentifierMixin, ABC):
@@ -72,23 +180,19 @@ class MultiIdentifierUpdateMixin(mixins.UpdateModelMixin, GenericMultiIdentifier
 class GenericMultiIdentifierForManySerializers(GenericMultiIdentifierMixin, ABC):
 
     def _get_object_with_first_valid_retriever(self, queryset, identifier):
-        for retriever in self.retrievers:
-            if retriever.identifier_validator(identifier):
-                try:
-                    queryset = retriever.retriever_additional_queryset_filtering(queryset)
-                    resource = retriever.get_model_object(queryset, identifier)
-
-                    # May raise a permission denied
-                    self.check_object_permissions(self.request, resource)
-                    return retriever.serializer_reference_type, resource
-                except ObjectDoesNotExist:
-                    logger.exception(
-                        F"Failed to retrieve object from queryset {queryset} using"
-                        F"identifier {identifier} for matching retriever: {retriever}"
-                    )
-                except FieldError:
-                    logger.exception(F"Failed to retrieve object from queryset {queryset} using"
-                                     F"{self.lookup_field}, field does not available for given model {queryset.model}")
+        retrievers = self._get_valid_retrievers(identifier)
+        if retrievers:
+            try:
+                retriever, resource = self._get_object_with_retrievers(queryset, identifier, retrievers)
+
+                # May raise a permission denied
+                self.check_object_permissions(self.request, resource)
+                return retriever.serializer_reference_type, resource
+            except ObjectDoesNotExist:
+                IdentifierLookupMetrics.record_miss(queryset.model, retrievers, identifier)
+            except FieldError:
+                logger.exception(F"Failed to retrieve object from queryset {queryset} using"
+                                 F"{self.lookup_field}, field does not available for given model {queryset.model}")
         return None, None
 
 
@@ -109,20 +213,31 @@ class MultiIdentifierUpdateManySerializersMixin(MultiSerializerUpdateModelMixin,
 
 
 class MultiIdentifierRetrieveManySerializersMixin(MultiSerializerRetrieveModelMixin,
-                                                  GenericMultiIdentifierForManySerializers, ABC):
+                                                  GenericMultiIdentifierForManySerializers, ConditionalReadMixin, ABC):
     def retrieve(self, request, *args, **kwargs):
         self._validate_retrieve_model_request()
-        retrieved = []
+        found = []
         for serializer, (qs, _, _) in self.get_eligible_serializers_iterator():
             ref_type, instance = self._get_object_with_first_valid_retriever(qs, kwargs['identifier'])
             if instance:
-                serializer = serializer(instance, reference_type=ref_type)
-                if serializer.data:
-                    retrieved.append(serializer.data)
+                found.append((serializer, ref_type, instance))
+
+        # instances are loaded for all serializers anyway, the version is checked on them before conversion
+        stamp = VersionUtils.get_version_stamp(found[0][2]) if len(found) == 1 else None
+        converter = getattr(found[0][0], 'fhirConverter', None) if len(found) == 1 else None
+        conditional_response = self._get_conditional_response(request, stamp, converter)
+        if conditional_response is not None:
+            return conditional_response
+
+        retrieved = []
+        for serializer, ref_type, instance in found:
+            serializer = serializer(instance, reference_type=ref_type)
+            if serializer.data:
+                retrieved.append(serializer.data)
 
         if len(retrieved) > 1:
             raise ValueError("Ambiguous retrieve result, object found for multiple serializers.")
         if len(retrieved) == 0:
             raise Http404(f"Resource for identifier {kwargs['identifier']} not found")
 
-        return Response(retrieved[0])
+        return self._set_version_headers(request, Response(retrieved[0]), stamp, converter)
@@ -1,12 +1,19 @@
+import logging
 import uuid
 from abc import ABC, abstractmethod, abstractproperty
-from typing import Union
+from collections import Counter
+from functools import reduce
+from operator import or_
+from typing import Union, List, Tuple, Type
 
+from django.core.exceptions import FieldError
 from django.db.models.query import QuerySet
-from django.db.models import Model
+from django.db.models import Model, Q, Case, When, Value, IntegerField
 
 from api_fhir_r4.converters import ReferenceConverterMixin
 
+logger = logging.getLogger(__name__)
+
 
 class GenericModelRetriever(ABC):
 
@@ -34,9 +41,13 @@ class GenericModelRetriever(ABC):
         # By default no additional changes are made in queryset
         return queryset
 
+    @classmethod
+    def get_lookup(cls, identifier_value) -> Q:
+        return Q(**{cls.identifier_field: identifier_value})
+
     @classmethod
     def get_model_object(cls, queryset: QuerySet, identifier_value) -> Model:
-        return queryset.get(**{cls.identifier_field: identifier_value})
+        return queryset.get(cls.get_lookup(identifier_value))
 
 
 class UUIDIdentifierModelRetriever(GenericModelRetriever):
@@ -88,10 +99,129 @@ class CHFIdentifierModelRetriever(CodeIdentifierModelRetriever):
         return isinstance(identifier_value, str) and len(identifier_value) <= 12
 
     @classmethod
-    def get_model_object(cls, queryset: QuerySet, identifier_value) -> Model:
-        return queryset.get(**{cls.identifier_field: identifier_value, 'validity_to__isnull': True})
+    def get_lookup(cls, identifier_value) -> Q:
+        return Q(**{cls.identifier_field: identifier_value, 'validity_to__isnull': True})
 
 
 class GroupIdentifierModelRetriever(CHFIdentifierModelRetriever):
     identifier_field = 'head_insuree_id__chf_id'
 
+
+
+class CombinedModelRetriever(object):
+    """
+    Resolves an identifier valid for many retrievers (e.g. UUID-shaped code) with a single query
+    `Q(<first lookup>) | Q(<second lookup>) ...`. If rows match different lookups the one of the retriever
+    listed first wins, the same way as if the retrievers were tried one after another. Additional filtering
+    of a retriever restricts only its own lookup.
+    """
+    _MATCHED_RETRIEVER_ANNOTATION = 'fhir_matched_retriever'
+
+    @classmethod
+    def get_model_object(cls, queryset: QuerySet, identifier_value, retrievers: List[Type[GenericModelRetriever]]) \
+            -> Tuple[Type[GenericModelRetriever], Model]:
+        retrievers = cls.get_resolvable_retrievers(queryset, identifier_value, retrievers)
+        return cls.get_model_object_with_resolvable_retrievers(queryset, identifier_value, retrievers)
+
+    @classmethod
+    def get_model_object_with_resolvable_retrievers(cls, queryset: QuerySet, identifier_value,
+                                                    retrievers: List[Type[GenericModelRetriever]], lookup: Q = None) \
+            -> Tuple[Type[GenericModelRetriever], Model]:
+        """
+        Same as `get_model_object` for retrievers already returned by `get_resolvable_retrievers`,
+        `lookup` built for them with `get_lookup` can be passed as well.
+        """
+        if len(retrievers) == 1:
+            retriever = retrievers[0]
+            queryset = retriever.retriever_additional_queryset_filtering(queryset)
+            return retriever, retriever.get_model_object(queryset, identifier_value)
+
+        retriever_lookups = cls.get_retriever_lookups(identifier_value, retrievers, queryset)
+        lookup = lookup if lookup is not None else reduce(or_, retriever_lookups)
+        matched_retriever = Case(
+            *(When(retriever_lookup, then=Value(index)) for index, retriever_lookup in enumerate(retriever_lookups)),
+            output_field=IntegerField()
+        )
+        # two rows are enough to tell if the best matching lookup is ambiguous
+        rows = list(queryset
+                    .filter(lookup)
+                    .annotate(**{cls._MATCHED_RETRIEVER_ANNOTATION: matched_retriever})
+                    .order_by(cls._MATCHED_RETRIEVER_ANNOTATION)[:2])
+        if not rows:
+            raise queryset.model.DoesNotExist(
+                f"{queryset.model._meta.object_name} matching identifier {identifier_value} does not exist.")
+        best_match = getattr(rows[0], cls._MATCHED_RETRIEVER_ANNOTATION)
+        if len(rows) > 1 and getattr(rows[1], cls._MATCHED_RETRIEVER_ANNOTATION) == best_match:
+            raise queryset.model.MultipleObjectsReturned(
+                f"More than one {queryset.model._meta.object_name} matching identifier {identifier_value}.")
+        return retrievers[best_match], rows[0]
+
+    @classmethod
+    def filter_resolved(cls, queryset: QuerySet, retriever: Type[GenericModelRetriever], pk) -> QuerySet:
+        """
+        Queryset of the row an identifier was resolved to before by `retriever`. Only the filters which could
+        exclude the row since then are applied: the additional filtering of the retriever and, for versioned models,
+        the active row condition. Rows which don't pass them have to be resolved by the lookup again.
+        """
+        queryset = retriever.retriever_additional_queryset_filtering(queryset).filter(pk=pk)
+        if any(field.name == 'validity_to' for field in queryset.model._meta.get_fields()):
+            queryset = queryset.filter(validity_to__isnull=True)
+        return queryset
+
+    @classmethod
+    def get_lookup(cls, identifier_value, retrievers: List[Type[GenericModelRetriever]],
+                   queryset: QuerySet = None) -> Q:
+        return reduce(or_, cls.get_retriever_lookups(identifier_value, retrievers, queryset))
+
+    @classmethod
+    def get_retriever_lookups(cls, identifier_value, retrievers: List[Type[GenericModelRetriever]],
+                              queryset: QuerySet = None) -> List[Q]:
+        """
+        Lookup of every retriever. With `queryset` the lookup of a retriever with additional filtering is limited
+        to rows of the filtered queryset (`Q(lookup) & Q(pk__in=<filtered>)`), so it doesn't affect other lookups.
+        """
+        lookups = []
+        for retriever in retrievers:
+            lookup = retriever.get_lookup(identifier_value)
+            if queryset is not None:
+                filtered = retriever.retriever_additional_queryset_filtering(queryset)
+                if filtered is not queryset:
+                    lookup &= Q(pk__in=filtered.values('pk'))
+            lookups.append(lookup)
+        return lookups
+
+    @classmethod
+    def get_resolvable_retrievers(cls, queryset, identifier_value, retrievers):
+        resolvable = []
+        for retriever in retrievers:
+            try:
+                # filtering only builds the query, so it validates lookup fields without hitting the database
+                queryset.filter(retriever.get_lookup(identifier_value))
+                resolvable.append(retriever)
+            except FieldError:
+                logger.debug(f"Retriever {retriever.__name__} not applicable to {queryset.model}")
+        if not resolvable:
+            raise FieldError(f"None of retrievers {retrievers} is applicable to {queryset.model}")
+        return resolvable
+
+
+class IdentifierLookupMetrics(object):
+    """
+    Counters of identifier lookups which didn't match any object, per model and retrievers.
+    Misses are expected (e.g. probing many resource types), so they're counted and logged on debug level.
+    """
+    _misses = Counter()
+
+    @classmethod
+    def record_miss(cls, model, retrievers, identifier_value):
+        key = (model._meta.label, tuple(retriever.__name__ for retriever in retrievers))
+        cls._misses[key] += 1
+        logger.debug(f"No {key[0]} found for identifier {identifier_value} using retrievers {key[1]}")
+
+    @classmethod
+    def get_misses(cls):
+        return dict(cls._misses)
+
+    @classmethod
+    def reset(cls):
+        cls._misses.clear()
@@ -12,5 +12,6 @@ from api_fhir_r4.models.fhirModels import (
 from api_fhir_r4.models.imisModelEnums import BundleType
 from api_fhir_r4.models.subscription import (
     Subscription,
-    SubscriptionNotificationResult
+    SubscriptionNotificationResult,
+    SubscriptionNotificationOutbox
 )
@@ -37,6 +37,24 @@ class SubscriptionNotificationResultManager(models.Manager):
     def subscriber_notifications(self, subscriber: Subscription):
         return self.get_queryset().filter(subscription__id=subscriber.id)
 
+    def purge(self, older_than=None, max_per_subscription=None):
+        """
+        Delete results sent before `older_than` and results exceeding `max_per_subscription` newest ones
+        of every subscription. Returns number of deleted results.
+        """
+        deleted = 0
+        if older_than is not None:
+            deleted += super().get_queryset().filter(notification_time__lt=older_than).delete()[0]
+        if max_per_subscription:
+            crowded = (super().get_queryset().values('subscription_id')
+                       .annotate(results=models.Count('id')).filter(results__gt=max_per_subscription))
+            for row in crowded:
+                results = super().get_queryset().filter(subscription_id=row['subscription_id'])
+                oldest_kept = results.order_by('-notification_time')[max_per_subscription - 1:max_per_subscription] \
+                    .values_list('notification_time', flat=True)
+                deleted += results.filter(notification_time__lt=oldest_kept[0]).delete()[0] if oldest_kept else 0
+        return deleted
+
 
 class SubscriptionNotificationResult(models.Model):
     id = models.UUIDField(primary_key=True, db_column="UUID", default=uuid.uuid4, editable=False)
@@ -51,3 +69,34 @@ class SubscriptionNotificationResult(models.Model):
     class Meta:
         managed = True
         db_table = 'tblSubscriptionNotificationResult'
+        indexes = [
+            models.Index(fields=['subscription', 'notification_time'], name='fhir_sub_result_time_idx'),
+        ]
+
+
+class SubscriptionNotificationOutbox(models.Model):
+    """
+    Notifications waiting to be dispatched to the subscriber by the outbox worker
+    (`manage.py fhir_subscription_worker`). Entries are deleted once delivered.
+    """
+    class OutboxStatus(models.IntegerChoices):
+        PENDING = 0, _('pending')
+        FAILED = 1, _('failed')
+
+    id = models.UUIDField(primary_key=True, db_column="UUID", default=uuid.uuid4, editable=False)
+    subscription = models.ForeignKey(
+        Subscription, on_delete=models.CASCADE, related_name='outbox_notifications', null=False)
+    payload = models.TextField(db_column='Payload', null=False)
+    status = models.SmallIntegerField(db_column='Status', null=False, choices=OutboxStatus.choices,
+                                      default=OutboxStatus.PENDING)
+    attempts = models.SmallIntegerField(db_column='Attempts', null=False, default=0)
+    created_at = DateTimeField(db_column='CreatedAt', null=False, default=ad_datetime.AdDatetime.now)
+    next_attempt_at = DateTimeField(db_column='NextAttemptAt', null=False, default=ad_datetime.AdDatetime.now)
+    last_error = models.TextField(db_column='LastError', blank=True, null=True, default=None)
+
+    class Meta:
+        managed = True
+        db_table = 'tblSubscriptionNotificationOutbox'
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='fhir_outbox_pending_idx'),
+        ]
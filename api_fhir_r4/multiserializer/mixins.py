@@ -7,6 +7,7 @@ which allows mixin classes to be composed in interesting ways.
 import logging
 from abc import ABC, abstractmethod
 from collections import defaultdict
+from functools import lru_cache
 from itertools import chain
 from typing import Dict, Type, Callable, Iterable, Tuple, List
 
@@ -25,6 +26,25 @@ from api_fhir_r4.permissions import FHIRApiPermissions
 logger = logging.getLogger(__name__)
 
 
+def _user_has_perms(user, perms):
+    """
+    Permission checks of the user are memoized on the user object, which lives as long as the request,
+    so permissions repeated by the serializers of a view (or by many views of a Bundle) are resolved once.
+    """
+    decisions = getattr(user, '_fhir_permission_decisions', None)
+    if decisions is None:
+        decisions = {}
+        try:
+            user._fhir_permission_decisions = decisions
+        except AttributeError:
+            return user.has_perms(perms)
+    key = frozenset(perms)
+    if key not in decisions:
+        decisions[key] = user.has_perms(perms)
+    return decisions[key]
+
+
+@lru_cache(maxsize=None)
 def _MultiserializerPermissionClassWrapper(PermissionClass):
     def has_permission(self, request, view, queryset):
         if getattr(view, '_ignore_model_permissions', False):
@@ -34,7 +54,7 @@ def _MultiserializerPermissionClassWrapper(PermissionClass):
             return False
 
         perms = self.get_required_permissions(request.method, queryset.model)
-        return request.user.has_perms(perms)
+        return _user_has_perms(request.user, perms)
 
     permission_class = type('PermissionClassWrapper', PermissionClass.__bases__, dict(PermissionClass.__dict__))
     permission_class.has_permission = has_permission
@@ -63,6 +83,14 @@ class GenericMultiSerializerViewsetMixin(ABC):
     def serializer_class(self):
         raise NotImplementedError("serializer_class is not meant to be used in Multiserializer viewset context")
 
+    def get_serializers(self):
+        """
+        `serializers` built once per view instance (i.e. per request), querysets are lazy so they can be reused.
+        """
+        if getattr(self, '_serializers_cache', None) is None:
+            self._serializers_cache = self.serializers
+        return self._serializers_cache
+
     @property
     @abstractmethod
     def serializers(self) \
@@ -82,12 +110,18 @@ class GenericMultiSerializerViewsetMixin(ABC):
         raise NotImplementedError('serializers method has to return dictionary of serializers')
 
     def get_eligible_serializers(self) -> List[Type[Serializer]]:
+        # eligibility depends only on the request, it's resolved once per view instance
+        if getattr(self, '_eligible_serializers_cache', None) is None:
+            self._eligible_serializers_cache = self._get_eligible_serializers()
+        return list(self._eligible_serializers_cache)
+
+    def _get_eligible_serializers(self) -> List[Type[Serializer]]:
         eligible = []
         context = self.get_serializer_context()
 
         eligible_from_permissions = self._get_eligible_from_user_permissions()
 
-        for serializer, (queryset, eligibility_validator, permission_class) in self.serializers.items():
+        for serializer, (queryset, eligibility_validator, permission_class) in self.get_serializers().items():
             if eligibility_validator(context) and serializer in eligible_from_permissions:
                 eligible.append(serializer)
         return eligible
@@ -140,7 +174,7 @@ class GenericMultiSerializerViewsetMixin(ABC):
 
     def get_eligible_serializers_iterator(self):
         for serializer in self.get_eligible_serializers():
-            yield serializer, self.serializers[serializer]
+            yield serializer, self.get_serializers()[serializer]
 
     def _raise_no_eligible_serializer(self):
         raise AssertionError("Failed to match serializer eligible for given request")
@@ -150,11 +184,11 @@ class GenericMultiSerializerViewsetMixin(ABC):
 
     def _get_eligible_from_user_permissions(self):
         eligible_serializers = []
-        for serializer, (queryset, eligibility_validator, permission_classes) in self.serializers.items():
-            permission_classes = [
-                _MultiserializerPermissionClassWrapper(perm_cls)() for perm_cls in permission_classes
-            ]
-            if all([p.has_permission(self.request, self, queryset) for p in permission_classes]):
+        for serializer, (queryset, eligibility_validator, permission_classes) in self.get_serializers().items():
+            if all(
+                _MultiserializerPermissionClassWrapper(perm_cls)().has_permission(self.request, self, queryset)
+                for perm_cls in permission_classes
+            ):
                 eligible_serializers.append(serializer)
 
         if len(eligible_serializers) == 0:
@@ -202,53 +236,53 @@ class MultiSerializerCreateModelMixin(GenericMultiSerializerViewsetMixin, ABC):
 
 
 class _JoinedQuerysets:
+    """
+    Querysets joined one after another. Counts of the querysets are computed once, slices are translated into
+    a single bounded (LIMIT/OFFSET) query for every queryset overlapping the slice, so a page costs O(page size).
+    Plain sequences (e.g. resources defined in configuration) can be joined as well.
+    """
     def __init__(self, *qs):
-        self.querysets = qs
+        # pages are cut with LIMIT/OFFSET, so every queryset needs a deterministic order
+        self.querysets = tuple(
+            queryset.order_by('pk') if isinstance(queryset, QuerySet) and not queryset.ordered else queryset
+            for queryset in qs
+        )
+        self._counts = None
 
     def __iter__(self):
-        return chain(self.querysets)
+        return chain(*self.querysets)
 
     def __len__(self):
-        return sum([len(qs) for qs in self.querysets])
+        return self.count()
 
     def __getitem__(self, k):
-        if not isinstance(k, (int, slice)):
-            raise TypeError
-
-        return self.__get_queryset_for_item(k)
-
-    def __get_queryset_for_item(self, k):
         if isinstance(k, int):
-            return self.__get_queryset_for_index(k)
-        else:
-            # slice
+            if k < 0:
+                k += self.count()
+            qs, index_in_queryset = self.__get_queryset_for_index(k)
+            return qs[index_in_queryset]
+        if isinstance(k, slice):
             if k.step:
                 raise ValidationError("Step not supported in joined queryset context.")
-            start, end = int(k.start) if k else None, int(k.stop) if k else None
-            intersection = [None, None]
-            final_query = []
-            if start:
-                start_qs, qs_idx = self.__get_queryset_for_index(start)
-                intersection[0] = self.querysets.index(start_qs) + 1
-                start_qs = start_qs.all()[qs_idx:]
-            if end:
-                end_qs, qs_idx = self.__get_queryset_for_index(end)
-                intersection[1] = self.querysets.index(end_qs)
-                end_qs = end_qs.all()[:qs_idx]
-
-            if start:
-                final_query.append(start_qs)
-
-            final_query.extend(self.querysets[intersection[0]:intersection[1]])
-
-            if end:
-                final_query.append(end_qs)
-
-            return list(chain(*final_query))
+            start, stop, _ = k.indices(self.count())
+            return self.__get_slice(start, stop)
+        raise TypeError
+
+    def __get_slice(self, start, stop):
+        result = []
+        queryset_offset = 0
+        for qs, qs_count in zip(self.querysets, self.get_counts()):
+            if queryset_offset >= stop:
+                break
+            qs_start, qs_stop = max(start - queryset_offset, 0), min(stop - queryset_offset, qs_count)
+            if qs_start < qs_stop:
+                result.extend(qs[qs_start:qs_stop])
+            queryset_offset += qs_count
+        return result
 
     def __get_queryset_for_index(self, k):
         """
-        Return queryset for which given index is relevant. If given index is out of range it raises IndexEr
+        Return queryset for which given index is relevant. If given index is out of range it raises IndexError
         Args:
             k: index of element.
 
@@ -256,19 +290,28 @@ class _JoinedQuerysets:
             Tuple of queryset and index k relative for given queryset
 
         """
-        next_queryset_last_index = 0
-        for qs in self.querysets:
-            qs_len = qs.count()
-            next_queryset_last_index += qs_len
-            if k < next_queryset_last_index:
-                index_in_queryset = k - (next_queryset_last_index - qs_len)
-                return qs, index_in_queryset
-            if k == next_queryset_last_index:
-                return qs, 0
+        queryset_offset = 0
+        for qs, qs_count in zip(self.querysets, self.get_counts()):
+            if 0 <= k - queryset_offset < qs_count:
+                return qs, k - queryset_offset
+            queryset_offset += qs_count
         raise IndexError(f"for index {k}")
 
+    def get_counts(self):
+        if self._counts is None:
+            self._counts = [qs.count() if isinstance(qs, QuerySet) else len(qs) for qs in self.querysets]
+        return self._counts
+
     def count(self):
-        return sum([qs.count() for qs in self.querysets])
+        return sum(self.get_counts())
+
+    def with_counted_querysets(self, count_service):
+        """
+        Copy with counts of the querysets served by the `count_service` (see `QueryCountService`).
+        """
+        return type(self)(*(
+            count_service.with_counted_queryset(qs) if isinstance(qs, QuerySet) else qs for qs in self.querysets
+        ))
 
 
 class MultiSerializerListModelMixin(GenericMultiSerializerViewsetMixin, ABC):
@@ -329,10 +372,8 @@ class MultiSerializerListModelMixin(GenericMultiSerializerViewsetMixin, ABC):
         elif len(querysets) == 1:
             return querysets[0]
         else:
-            # Inefficient due to pulling every entry and not only paginated chunk
-            chained = _JoinedQuerysets(*querysets)
-            # Chain doesn't provide len, but it's required by paginator
-            return chained
+            # Only rows of the requested page are fetched, counts of the querysets are computed once
+            return _JoinedQuerysets(*querysets)
 
 
 class MultiSerializerRetrieveModelMixin(GenericMultiSerializerViewsetMixin, ABC):
@@ -0,0 +1,24 @@
+from rest_framework.negotiation import DefaultContentNegotiation
+
+
+class FHIRContentNegotiation(DefaultContentNegotiation):
+    """
+        Adds support of the FHIR `_format` parameter on top of the standard `Accept` header negotiation.
+    """
+    format_query_param = '_format'
+    format_aliases = {
+        'json': 'json',
+        'application/json': 'json',
+        'fhir+json': 'fhir+json',
+        'application/fhir+json': 'fhir+json',
+        'html': 'api',
+        'text/html': 'api',
+    }
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        requested_format = request.query_params.get(self.format_query_param)
+        if requested_format and not format_suffix:
+            # `+` of an unencoded `application/fhir+json` is decoded to a space
+            requested_format = requested_format.strip().replace(' ', '+')
+            format_suffix = self.format_aliases.get(requested_format, requested_format)
+        return super().select_renderer(request, renderers, format_suffix)
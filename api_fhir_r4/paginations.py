@@ -1,10 +1,16 @@
-import hashlib
+import base64
+import datetime
+import json
 import urllib
+from api_fhir_r4.cache import QueryCountService
 from api_fhir_r4.configurations import GeneralConfiguration
-from fhir.resources.R4B.bundle import Bundle, BundleEntry, BundleLink
+from api_fhir_r4.projections import ElementProjection
+from rest_framework.exceptions import ValidationError
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
-from django.core.cache import caches
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
+from django.db.models import Q
 from django.db.models.query import QuerySet
 
 
@@ -13,14 +19,39 @@ class FhirBundleResultsSetPagination(PageNumberPagination):
     page_size = GeneralConfiguration.get_default_response_page_size()
     page_query_param = 'page-offset'
     page_size_query_param = '_count'
+    # presence of `_cursor` (even empty, for the first page) switches to keyset pagination
+    cursor_query_param = '_cursor'
+    # first field found on the model wins, `pk` is always appended as a tie-breaker
+    cursor_ordering_fields = ('validity_from', 'date_created')
+    invalid_cursor_message = 'Invalid cursor'
+
+    cursor_mode = False
+    count_mode = False
+    total_mode = QueryCountService.TOTAL_ACCURATE
 
     def get_paginated_response(self, data):
-        return Response(self.build_bundle_set(data).dict())
+        if self.count_mode:
+            return Response(self.build_bundle_count())
+        return Response(self.build_bundle_set(data))
+
+    def build_bundle_count(self):
+        """
+            `_summary=count` Bundle, only the total of the search is returned.
+        """
+        bundle = {'resourceType': 'Bundle', 'type': 'searchset', 'total': self.count_total}
+        self.build_bundle_link(bundle, "self", self.request.build_absolute_uri())
+        return bundle
 
     def build_bundle_set(self, data):
-        bundle = Bundle.construct()
-        bundle.type = "searchset"
-        bundle.total = self.page.paginator.count
+        """
+            Build the searchset Bundle as a plain dict. Entries are already serialized FHIR resources,
+            so wrapping (and validating) each of them in pydantic models only to dump them back is avoided.
+            Keys follow the order of `Bundle.dict()`, empty elements are omitted the same way.
+        """
+        bundle = {'resourceType': 'Bundle', 'type': 'searchset'}
+        total = self.get_bundle_total()
+        if total is not None:
+            bundle['total'] = total
         self.build_bundle_links(bundle)
         self.build_bundle_entry(bundle, data)
         return bundle
@@ -35,23 +66,20 @@ class FhirBundleResultsSetPagination(PageNumberPagination):
             self.build_bundle_link(bundle, "previous", previous_link)
 
     def build_bundle_link(self, bundle, relation, url):
-        self_link = {}
-        self_link['url'] = urllib.parse.quote_plus(url)
-        self_link['relation'] = relation
-        bundle_link = BundleLink(**self_link)
-        if type(bundle.link) is not list:
-           bundle.link = [bundle_link]
-        else:
-           bundle.link.append(bundle_link)
+        bundle.setdefault('link', []).append({'relation': relation, 'url': urllib.parse.quote_plus(url)})
 
     def build_bundle_entry(self, bundle, data):
-        bundle.entry = []
+        resource_base_url = self.exclude_query_parameter_from_url(self.request.build_absolute_uri())
+        entries = []
         for obj in data:
             entry = {}
-            entry['fullUrl'] = self.build_full_url_for_resource(obj)
+            resource_pk = self.get_object_pk(obj)
+            if resource_pk:
+                entry['fullUrl'] = resource_base_url + resource_pk
             entry['resource'] = obj
-            bundle_entry = BundleEntry(**entry)
-            bundle.entry.append(bundle_entry)
+            entries.append(entry)
+        if entries:
+            bundle['entry'] = entries
 
     def build_full_url_for_resource(self, fhir_object):
         url = None
@@ -76,32 +104,135 @@ class FhirBundleResultsSetPagination(PageNumberPagination):
         o = urlparse(url)
         return o._replace(query=None).geturl()
 
-    def paginate_queryset(self, queryset, *args, **kwargs):
+    def get_bundle_total(self):
+        if self.cursor_mode:
+            return self.cursor_total_count
+        if self.total_mode == QueryCountService.TOTAL_NONE:
+            return None
+        return self.page.paginator.count
+
+    def get_count_service(self, request):
+        return QueryCountService(request, ignored_query_params=(
+            self.page_query_param, self.page_size_query_param, self.cursor_query_param, '_format', '_pretty',
+            ElementProjection.ELEMENTS_PARAMETER, ElementProjection.SUMMARY_PARAMETER
+        ))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        count_service = self.get_count_service(request)
+        self.total_mode = count_service.get_total_mode()
+        self.count_mode = ElementProjection.is_count(request)
+        if self.count_mode:
+            # no rows are fetched, views serialize the empty page and return the count Bundle
+            self.request = request
+            self.count_total = self.count_results(queryset, count_service)
+            return []
+        self.cursor_mode = isinstance(queryset, QuerySet) and self.cursor_query_param in request.query_params
+        if self.cursor_mode:
+            # keyset pages don't need the count for navigation, `_total` decides whether and how it's computed
+            self.cursor_total_count = count_service.count(queryset, self.total_mode)
+            return self.paginate_queryset_by_cursor(queryset, request, view)
         if isinstance(queryset, QuerySet) and hasattr(queryset, 'count'):
-            queryset = CachedCountQueryset(queryset)
-        return super().paginate_queryset(queryset, *args, **kwargs)
-
-
-def CachedCountQueryset(queryset, timeout=60*60, cache_name='default'):
-    """
-        Return copy of queryset with queryset.count() wrapped to cache result for `timeout` seconds.
-    """
-    cache = caches[cache_name]
-    queryset = queryset._chain()
-    real_count = queryset.count
-
-    def count(queryset):
-        cache_key = 'query-count:' + hashlib.md5(str(queryset.query).encode('utf8')).hexdigest()
-
-        # return existing value, if any
-        value = cache.get(cache_key)
-        if value is not None:
+            # page numbers are validated against the count, so it stays accurate regardless of `_total`
+            queryset = count_service.with_counted_queryset(queryset)
+        elif callable(getattr(queryset, 'with_counted_querysets', None)):
+            # querysets joined by multiserializer views
+            queryset = queryset.with_counted_querysets(count_service)
+        return super().paginate_queryset(queryset, request, view)
+
+    def count_results(self, queryset, count_service):
+        # the count is the only content of the response, `_total=none` is ignored
+        mode = self.total_mode if self.total_mode == QueryCountService.TOTAL_ESTIMATE \
+            else QueryCountService.TOTAL_ACCURATE
+        if isinstance(queryset, QuerySet):
+            return count_service.count(queryset, mode)
+        querysets = getattr(queryset, 'querysets', None)
+        if querysets is not None:
+            # querysets joined by multiserializer views are counted separately
+            return sum(self.count_results(qs, count_service) for qs in querysets)
+        return len(queryset)
+
+    def paginate_queryset_by_cursor(self, queryset, request, view=None):
+        """
+            Keyset pagination: instead of OFFSET, every page filters on the ordering key of the
+            last returned row, so each page costs the same regardless of its depth.
+        """
+        self.request = request
+        page_size = self.get_page_size(request)
+        self.cursor_ordering = self.get_cursor_ordering(queryset.model)
+
+        queryset = queryset.order_by(*self.cursor_ordering)
+        position = self.decode_cursor(request.query_params.get(self.cursor_query_param))
+        if position:
+            try:
+                queryset = queryset.filter(self.build_cursor_filter(self.cursor_ordering, position))
+            except (DjangoValidationError, TypeError, ValueError):
+                # values which can't be converted to the ordering fields (e.g. a date which isn't one)
+                raise ValidationError({self.cursor_query_param: self.invalid_cursor_message})
+
+        results = list(queryset[:page_size + 1])
+        self.cursor_has_next = len(results) > page_size
+        self.cursor_page = results[:page_size]
+        return self.cursor_page
+
+    def get_cursor_ordering(self, model):
+        for field_name in self.cursor_ordering_fields:
+            try:
+                model._meta.get_field(field_name)
+                return field_name, 'pk'
+            except FieldDoesNotExist:
+                continue
+        return 'pk',
+
+    @classmethod
+    def build_cursor_filter(cls, ordering, position):
+        # (a, b) > (x, y)  <=>  a > x OR (a = x AND b > y)
+        cursor_filter = Q()
+        for index, field_name in enumerate(ordering):
+            condition = Q(**{f'{field_name}__gt': position[index]})
+            for previous_field, previous_value in zip(ordering[:index], position[:index]):
+                condition &= Q(**{previous_field: previous_value})
+            cursor_filter |= condition
+        return cursor_filter
+
+    def decode_cursor(self, token):
+        if not token:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode('ascii')).decode('utf8'))
+            fields, position = payload['f'], payload['v']
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise ValidationError({self.cursor_query_param: self.invalid_cursor_message})
+        if not isinstance(fields, list) or not isinstance(position, list) \
+                or tuple(fields) != tuple(self.cursor_ordering) or len(position) != len(fields) \
+                or not all(isinstance(value, (int, str)) and not isinstance(value, bool) for value in position):
+            raise ValidationError({self.cursor_query_param: self.invalid_cursor_message})
+        return position
+
+    @classmethod
+    def encode_cursor(cls, ordering, position):
+        payload = {'f': list(ordering), 'v': [cls._cursor_value(value) for value in position]}
+        return base64.urlsafe_b64encode(json.dumps(payload).encode('utf8')).decode('ascii')
+
+    @classmethod
+    def _cursor_value(cls, value):
+        if isinstance(value, (datetime.date, datetime.datetime)):
+            return value.isoformat()
+        if isinstance(value, (int, str)):
             return value
-
-        # cache new value
-        value = real_count()
-        cache.set(cache_key, value, timeout)
-        return value
-
-    queryset.count = count.__get__(queryset, type(queryset))
-    return queryset
\ No newline at end of file
+        return str(value)
+
+    def get_next_link(self):
+        if not self.cursor_mode:
+            return super().get_next_link()
+        if not self.cursor_has_next:
+            return None
+        last = self.cursor_page[-1]
+        position = [getattr(last, field_name) for field_name in self.cursor_ordering]
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.cursor_ordering, position))
+
+    def get_previous_link(self):
+        if self.cursor_mode:
+            # keyset pages are forward-only
+            return None
+        return super().get_previous_link()
@@ -0,0 +1,66 @@
+class ElementProjection(object):
+    """
+    Top level elements of resources requested with the `_elements` or `_summary` search parameters
+    (https://hl7.org/fhir/R4B/search.html#elements). `None` stands for the whole resource.
+    Converters declaring `fhir_element_builders` build only the requested elements, representations of the
+    others are stripped after the conversion.
+    """
+    ELEMENTS_PARAMETER = '_elements'
+    SUMMARY_PARAMETER = '_summary'
+
+    SUMMARY_TRUE = 'true'
+    SUMMARY_TEXT = 'text'
+    SUMMARY_DATA = 'data'
+    SUMMARY_COUNT = 'count'
+    SUMMARY_FALSE = 'false'
+
+    # returned regardless of the projection
+    mandatory_elements = frozenset({'resourceType', 'id', 'meta'})
+    subsetted_tag = {
+        'system': 'http://terminology.hl7.org/CodeSystem/v3-ObservationValue',
+        'code': 'SUBSETTED',
+        'display': 'subsetted',
+    }
+
+    @classmethod
+    def get_summary(cls, request):
+        summary = request.GET.get(cls.SUMMARY_PARAMETER) if request is not None else None
+        return summary.strip().lower() if summary else None
+
+    @classmethod
+    def is_count(cls, request):
+        return cls.get_summary(request) == cls.SUMMARY_COUNT
+
+    @classmethod
+    def get_elements(cls, request, converter=None):
+        if request is None:
+            return None
+        elements = request.GET.get(cls.ELEMENTS_PARAMETER)
+        if elements:
+            # only top level elements are supported in R4, `name.given` selects the whole `name`
+            requested = {element.strip().split('.')[0] for element in elements.split(',')}
+            return frozenset(element for element in requested if element) | cls.mandatory_elements
+
+        summary = cls.get_summary(request)
+        if summary == cls.SUMMARY_TRUE:
+            summary_elements = getattr(converter, 'summary_elements', None)
+            return frozenset(summary_elements) | cls.mandatory_elements if summary_elements else None
+        if summary == cls.SUMMARY_TEXT:
+            return frozenset({'text'}) | cls.mandatory_elements
+        if summary == cls.SUMMARY_COUNT:
+            return cls.mandatory_elements
+        # `data` excludes only the narrative, which is never generated
+        return None
+
+    @classmethod
+    def get_variant(cls, elements):
+        return ','.join(sorted(elements)) if elements is not None else None
+
+    @classmethod
+    def project(cls, representation, elements):
+        if elements is None:
+            return representation
+        projected = {key: value for key, value in representation.items() if key in elements}
+        meta = projected.setdefault('meta', {})
+        meta['tag'] = [*meta.get('tag', []), dict(cls.subsetted_tag)]
+        return projected
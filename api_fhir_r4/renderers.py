@@ -0,0 +1,56 @@
+import decimal
+
+import orjson
+from django.utils.encoding import force_str
+from django.utils.functional import Promise
+from rest_framework.renderers import BaseRenderer
+
+
+def _default(obj):
+    # orjson handles uuid, date/datetime, dataclasses and dict/list/str subclasses natively
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, Promise):
+        return force_str(obj)
+    if hasattr(obj, '__iter__'):
+        return list(obj)
+    raise TypeError
+
+
+def fhir_json_dumps(data, pretty=False):
+    # non-str keys (e.g. ids or dates used as keys) are serialized as strings, like json.dumps does
+    option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+    return orjson.dumps(data, default=_default, option=option)
+
+
+class FHIRJSONRenderer(BaseRenderer):
+    """
+        orjson based renderer for FHIR resources. Indentation is applied only when asked for,
+        with `_pretty=true`, an `indent` media type parameter or by the browsable API.
+    """
+    media_type = 'application/fhir+json'
+    format = 'fhir+json'
+    charset = None
+    pretty_query_param = '_pretty'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return fhir_json_dumps(data, pretty=self.is_pretty(accepted_media_type, renderer_context or {}))
+
+    def is_pretty(self, accepted_media_type, renderer_context):
+        request = renderer_context.get('request')
+        pretty = request.query_params.get(self.pretty_query_param) if hasattr(request, 'query_params') else None
+        if pretty is not None:
+            return pretty.lower() == 'true'
+        if accepted_media_type and 'indent' in accepted_media_type:
+            return True
+        return bool(renderer_context.get('indent'))
+
+
+class FHIRCompatibleJSONRenderer(FHIRJSONRenderer):
+    """
+        Same rendering for clients that accept plain `application/json` only.
+    """
+    media_type = 'application/json'
+    format = 'json'
@@ -1,12 +1,17 @@
 import logging
+from contextlib import nullcontext
 from typing import Union
 
+from django.db.models.manager import BaseManager
 from django.http.response import HttpResponseBase
 from fhir.resources.R4B import FHIRAbstractModel
 from rest_framework import serializers
 
 from api_fhir_r4.configurations import GeneralConfiguration
-from api_fhir_r4.converters import BaseFHIRConverter, OperationOutcomeConverter, ReferenceConverterMixin
+from api_fhir_r4.converters import BaseFHIRConverter, OperationOutcomeConverter, ReferenceConverterMixin, \
+    PageReferenceBuilder
+from api_fhir_r4.projections import ElementProjection
+from api_fhir_r4.utils import VersionUtils
 from core.models import User, TechnicalUser
 
 
@@ -14,8 +19,31 @@ from core.models import User, TechnicalUser
 logger = logging.getLogger(__name__)
 
 
+class FHIRListSerializer(serializers.ListSerializer):
+    """
+    Serializes a page of results within `PageReferenceBuilder.scope`, relations referenced by the resources
+    are loaded for the whole page instead of one object at a time. Set as `list_serializer_class` of
+    `BaseFHIRSerializer.Meta`, subclasses declaring their own `Meta` (e.g. with `model` and `fields`, as the
+    serializers of `policyHolderGroupContractSerializer` do) silently lose it, unless their `Meta` inherits
+    from `BaseFHIRSerializer.Meta`.
+    """
+
+    def to_representation(self, data):
+        objs = list(data.all() if isinstance(data, BaseManager) else data)
+        representation_cache = self.child.representation_cache
+        with PageReferenceBuilder.scope(self.child.fhirConverter, objs, self.child.elements), \
+                (representation_cache.page_scope(objs) if representation_cache is not None else nullcontext()):
+            return super().to_representation(objs)
+
+
 class BaseFHIRSerializer(serializers.Serializer):
     fhirConverter = BaseFHIRConverter()
+    # cache of representations of IMIS objects (e.g. `FHIRRepresentationCache`), enable it only for resources
+    # invalidated by service signals (see `signals.bind_service_signals`)
+    representation_cache = None
+
+    class Meta:
+        list_serializer_class = FHIRListSerializer
 
     def __init__(self, *args, **kwargs):
         self._reference_type = kwargs.pop('reference_type', ReferenceConverterMixin.UUID_REFERENCE_TYPE)
@@ -27,13 +55,45 @@ class BaseFHIRSerializer(serializers.Serializer):
                 return OperationOutcomeConverter.to_fhir_obj(obj).dict()
             elif isinstance(obj, FHIRAbstractModel):
                 return obj.dict()
-            return self.fhirConverter.to_fhir_obj(obj, self.reference_type).dict()
+            elements = self.elements
+            if self.representation_cache is not None:
+                representation = self.representation_cache.get_or_convert(
+                    self.fhirConverter, obj, self.reference_type,
+                    lambda: self._to_projected_representation(obj, elements),
+                    variant=ElementProjection.get_variant(elements))
+            else:
+                representation = self._to_projected_representation(obj, elements)
+            return self._add_version_meta(obj, representation)
         except Exception as e:
             from django.conf import settings
             if settings.DEBUG:
                 self._print_debug_log(e)
             raise e
 
+    @property
+    def elements(self):
+        """
+        Top level elements requested with `_elements`/`_summary`, None for the whole resource.
+        """
+        if not hasattr(self, '_elements'):
+            self._elements = ElementProjection.get_elements(self.context.get('request'), self.fhirConverter)
+        return self._elements
+
+    def _to_projected_representation(self, obj, elements):
+        if elements is not None and self.fhirConverter.fhir_element_builders:
+            fhir_obj = self.fhirConverter.to_fhir_obj(obj, self.reference_type, elements=elements)
+        else:
+            fhir_obj = self.fhirConverter.to_fhir_obj(obj, self.reference_type)
+        return ElementProjection.project(fhir_obj.dict(), elements)
+
+    def _add_version_meta(self, obj, representation):
+        stamp = VersionUtils.get_version_stamp(obj)
+        if stamp is not None and isinstance(representation, dict):
+            meta = representation.setdefault('meta', {})
+            meta['versionId'] = VersionUtils.get_version_id(stamp)
+            meta['lastUpdated'] = VersionUtils.get_last_updated(stamp)
+        return representation
+
     def to_internal_value(self, data):
         audit_user_id = self.get_audit_user_id()
         return self.fhirConverter.to_imis_obj(data, audit_user_id).__dict__
@@ -13,6 +13,7 @@ from django.shortcuts import get_object_or_404
 from api_fhir_r4.configurations import R4ClaimConfig, GeneralConfiguration
 from api_fhir_r4.converters import ClaimResponseConverter, OperationOutcomeConverter, ReferenceConverterMixin as r
 from api_fhir_r4.converters.claimConverter import ClaimConverter
+from api_fhir_r4.projections import ElementProjection
 from fhir.resources.R4B import FHIRAbstractModel
 from api_fhir_r4.serializers import BaseFHIRSerializer
 
@@ -61,7 +62,7 @@ class ClaimSerializer(ContainedContentSerializerMixin, BaseFHIRSerializer):
         fhir_dict = fhir_obj.dict()
         if self.context.get('contained', False):
             fhir_dict['contained'] = self._create_contained_obj_dict(obj)
-        return fhir_dict
+        return self._add_version_meta(obj, ElementProjection.project(fhir_dict, self.elements))
 
     def remove_attachment_data(self, fhir_obj):
         if hasattr(self.parent, 'many') and self.parent.many is True:
@@ -2,12 +2,14 @@ import copy
 
 from location.gql_mutations import update_or_create_health_facility
 
+from api_fhir_r4.cache import FHIRRepresentationCache
 from api_fhir_r4.converters import HealthFacilityOrganisationConverter
 from api_fhir_r4.serializers import BaseFHIRSerializer
 
 
 class HealthFacilityOrganisationSerializer(BaseFHIRSerializer):
     fhirConverter = HealthFacilityOrganisationConverter()
+    representation_cache = FHIRRepresentationCache
 
     def create(self, validated_data):
         data = copy.deepcopy(validated_data)
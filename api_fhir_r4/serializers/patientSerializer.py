@@ -5,6 +5,7 @@ from insuree.models import Insuree, Family
 
 # from core.models import resolve_id_reference
 
+from api_fhir_r4.cache import FHIRRepresentationCache
 from api_fhir_r4.converters import PatientConverter
 from api_fhir_r4.exceptions import FHIRException
 from api_fhir_r4.serializers import BaseFHIRSerializer
@@ -13,6 +14,7 @@ from insuree.services import InsureeService
 
 class PatientSerializer(BaseFHIRSerializer):
     fhirConverter = PatientConverter()
+    representation_cache = FHIRRepresentationCache
 
     def create(self, validated_data):
         # validated_data = resolve_id_reference(Insuree, validated_data)
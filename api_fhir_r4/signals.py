@@ -1,9 +1,12 @@
 import logging
 
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import models, transaction
 
 from api_fhir_r4.apps import ApiFhirConfig
-from api_fhir_r4.configurations import R4LocationConfig, R4InvoiceConfig, GeneralConfiguration
+from api_fhir_r4.cache import FHIRRepresentationCache
+from api_fhir_r4.configurations import R4LocationConfig, R4InvoiceConfig, GeneralConfiguration, \
+    R4SubscriptionConfig
 from api_fhir_r4.converters import PatientConverter, BillInvoiceConverter, InvoiceConverter, \
     HealthFacilityOrganisationConverter
 from api_fhir_r4.mapping.invoiceMapping import InvoiceTypeMapping, BillTypeMapping
@@ -19,6 +22,20 @@ imis_modules = openimis_apps()
 
 
 def bind_service_signals():
+    if FHIRRepresentationCache.is_enabled():
+        def on_resource_changed(**kwargs):
+            result = kwargs.get('result', None)
+            if isinstance(result, models.Model):
+                FHIRRepresentationCache.invalidate(result)
+
+        cached_resource_signals = {
+            'insuree': 'insuree_service.create_or_update',
+            'location': 'health_facility_service.update_or_create',
+        }
+        for module, signal in cached_resource_signals.items():
+            if module in imis_modules:
+                bind_service_signal(signal, on_resource_changed, bind_type=ServiceSignalBindType.AFTER)
+
     if 'insuree' in imis_modules and GeneralConfiguration.get_subscribe_insuree_signal():
         def on_insuree_create_or_update(**kwargs):
             try:
@@ -86,11 +103,28 @@ def bind_service_signals():
 
 
 def notify_subscribers(model, converter, resource_name, resource_type_name):
+    if R4SubscriptionConfig.get_notification_dispatch_mode() == 'outbox':
+        # notifications are stored once the change is committed and sent by the outbox worker
+        transaction.on_commit(lambda: enqueue_notifications(model, converter, resource_name, resource_type_name))
+        return
     try:
         subscriptions = SubscriptionCriteriaFilter(model, resource_name,
                                                    resource_type_name).get_filtered_subscriptions()
-        RestSubscriptionNotificationManager(converter).notify_subscribers_with_resource(model, subscriptions)
+        if subscriptions:
+            RestSubscriptionNotificationManager(converter).notify_subscribers_with_resource(model, subscriptions)
     except Exception as e:
         logger.error(f'Notifying subscribers failed: {e}')
         import traceback
         logger.debug(traceback.format_exc())
+
+
+def enqueue_notifications(model, converter, resource_name, resource_type_name):
+    try:
+        subscriptions = SubscriptionCriteriaFilter(model, resource_name,
+                                                   resource_type_name).get_filtered_subscriptions()
+        if subscriptions:
+            RestSubscriptionNotificationManager(converter).enqueue_notifications_with_resource(model, subscriptions)
+    except Exception as e:
+        logger.error(f'Storing subscriber notifications failed: {e}')
+        import traceback
+        logger.debug(traceback.format_exc())
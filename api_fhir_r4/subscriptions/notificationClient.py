@@ -1,17 +1,22 @@
 import asyncio
+import atexit
+import concurrent.futures
 import decimal
 import json
 import logging
+import threading
 import uuid
 from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
 
 import aiohttp
 
-from typing import Union, Dict, List, Any, TypeVar, Generic, Iterable
+from typing import Union, Dict, List, Any, TypeVar, Generic, Iterable, Tuple
 
 import orjson
 
+from api_fhir_r4.configurations import R4SubscriptionConfig
 from api_fhir_r4.models import Subscription
 
 NOTIFICATION_CONTENT_TYPE = TypeVar('NOTIFICATION_CONTENT_TYPE')  # FHIR INPUT
@@ -35,12 +40,12 @@ class AbstractAsyncSubscriptionNotificationClient(
         Returns:
             List of responses or errors occurred during notifying subscribers
         """
-        return asyncio.run(self.propagate_notifications_async(notification_content, subscribers))
+        return self._run(self.propagate_notifications_async(notification_content, subscribers))
 
     async def propagate_notifications_async(self, content: NOTIFICATION_CONTENT_TYPE, subscribers: List[Subscription])\
             -> Iterable[NOTIFICATION_OUTPUT_TYPE]:
         payload = self._normalize_payload(content)
-        async with aiohttp.ClientSession() as session:
+        async with self._client_session() as session:
             tasks = []
             for sub in subscribers:
                 task = asyncio.ensure_future(self._send_notification_async(payload, sub, session))
@@ -48,6 +53,39 @@ class AbstractAsyncSubscriptionNotificationClient(
             result = await asyncio.gather(*tasks)
             return result
 
+    def propagate_notification_batch(
+            self, notifications: List[Tuple[CLIENT_ACCEPTABLE_CONTENT_TYPE, Subscription]]) \
+            -> Iterable[NOTIFICATION_OUTPUT_TYPE]:
+        """
+        Send notifications with different (already normalized) payloads concurrently.
+
+        Args:
+            notifications: List of pairs of the payload and its recipient.
+
+        Returns:
+            List of responses or errors, in the order of notifications.
+        """
+        return self._run(self.propagate_notification_batch_async(notifications))
+
+    async def propagate_notification_batch_async(
+            self, notifications: List[Tuple[CLIENT_ACCEPTABLE_CONTENT_TYPE, Subscription]]) \
+            -> Iterable[NOTIFICATION_OUTPUT_TYPE]:
+        async with self._client_session() as session:
+            return await asyncio.gather(*(
+                self._send_notification_async(payload, sub, session) for payload, sub in notifications
+            ))
+
+    def normalize_payload(self, payload: NOTIFICATION_CONTENT_TYPE) -> CLIENT_ACCEPTABLE_CONTENT_TYPE:
+        return self._normalize_payload(payload)
+
+    def _run(self, coroutine):
+        # By default every call gets its own event loop
+        return asyncio.run(coroutine)
+
+    def _client_session(self):
+        # By default every call opens (and closes) its own session
+        return aiohttp.ClientSession()
+
     @abstractmethod
     def _normalize_payload(self, payload: NOTIFICATION_CONTENT_TYPE) -> CLIENT_ACCEPTABLE_CONTENT_TYPE:
         """
@@ -137,3 +175,112 @@ class RestSubscriptionNotificationClient(AbstractAsyncSubscriptionNotificationCl
             'url': subscriber.endpoint,
             'data': content
         }
+
+
+class NotificationSessionPool:
+    """
+    Event loop running in a daemon thread with a single `aiohttp.ClientSession` used by all notifications
+    of the process, so connections (and TLS sessions) to subscribers are kept alive and reused.
+    Limits of the connection pool and timeouts are taken from `R4_fhir_subscription_config`.
+    """
+    _lock = threading.Lock()
+    _loop = None
+    _thread = None
+    _session = None
+    _atexit_registered = False
+    # seconds allowed on top of `notification_timeout` for scheduling and closing the session
+    result_timeout_margin = 5
+
+    @classmethod
+    def run(cls, coroutine):
+        """
+        Run coroutine in the loop of the pool and wait for the result in the calling thread. Each notification
+        times out after `notification_timeout` (waiting for a free connection included), so the wait is bounded
+        by it as well. The coroutine is cancelled if it doesn't finish in time.
+        """
+        future = asyncio.run_coroutine_threadsafe(coroutine, cls._get_loop())
+        try:
+            return future.result(timeout=cls._get_result_timeout())
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    @classmethod
+    async def get_session(cls) -> aiohttp.ClientSession:
+        # only called from the loop of the pool, no locking required
+        if cls._session is None or cls._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=R4SubscriptionConfig.get_notification_pool_size(),
+                limit_per_host=R4SubscriptionConfig.get_notification_pool_size_per_host(),
+                keepalive_timeout=R4SubscriptionConfig.get_notification_keepalive_timeout(),
+            )
+            cls._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=R4SubscriptionConfig.get_notification_timeout()),
+            )
+        return cls._session
+
+    @classmethod
+    def shutdown(cls):
+        with cls._lock:
+            loop, cls._loop = cls._loop, None
+            thread, cls._thread = cls._thread, None
+            session, cls._session = cls._session, None
+        if loop is None or not thread.is_alive():
+            return
+        if session is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(session.close(), loop).result(timeout=cls._get_result_timeout())
+            except concurrent.futures.TimeoutError:
+                logger.warning("Closing of the notification session has timed out")
+        loop.call_soon_threadsafe(loop.stop)
+        # the loop is closed by its thread once it stops
+        thread.join(timeout=cls._get_result_timeout())
+
+    @classmethod
+    def _get_loop(cls):
+        with cls._lock:
+            if cls._thread is None or not cls._thread.is_alive():
+                # loop of a thread which has stopped is already closed, its session can't be used anymore
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=cls._run_loop, args=(loop,), name='fhir-notification-loop',
+                                          daemon=True)
+                thread.start()
+                cls._loop, cls._thread, cls._session = loop, thread, None
+                if not cls._atexit_registered:
+                    atexit.register(cls.shutdown)
+                    cls._atexit_registered = True
+            return cls._loop
+
+    @staticmethod
+    def _run_loop(loop):
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_forever()
+        finally:
+            # coroutines abandoned by `run` after the timeout
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.close()
+
+    @classmethod
+    def _get_result_timeout(cls):
+        timeout = R4SubscriptionConfig.get_notification_timeout()
+        return timeout + cls.result_timeout_margin if timeout is not None else None
+
+
+class PooledRestSubscriptionNotificationClient(RestSubscriptionNotificationClient):
+    """
+    REST client sending notifications through the `NotificationSessionPool` instead of opening a new event loop
+    and session for every notification.
+    """
+
+    def _run(self, coroutine):
+        return NotificationSessionPool.run(coroutine)
+
+    @asynccontextmanager
+    async def _client_session(self):
+        # session is shared, it's not closed after the notifications are sent
+        yield await NotificationSessionPool.get_session()
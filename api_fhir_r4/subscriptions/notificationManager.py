@@ -6,18 +6,20 @@ from django.core.validators import URLValidator
 
 import core.datetimes.ad_datetime
 from api_fhir_r4.converters import BaseFHIRConverter, ReferenceConverterMixin
-from api_fhir_r4.models import Subscription, SubscriptionNotificationResult
+from api_fhir_r4.models import Subscription, SubscriptionNotificationResult, SubscriptionNotificationOutbox
+from api_fhir_r4.configurations import R4SubscriptionConfig
 from api_fhir_r4.subscriptions.notificationClient import RestSubscriptionNotificationClient, \
-    SubscriberNotificationOutput
+    PooledRestSubscriptionNotificationClient, SubscriberNotificationOutput
 from core.models import HistoryModel, VersionedModel
 
 
 class RestSubscriptionNotificationManager:
 
-    def __init__(self,  fhir_converter: BaseFHIRConverter,
+    def __init__(self,  fhir_converter: BaseFHIRConverter = None,
                  client: RestSubscriptionNotificationClient = None):
         if client is None:
-            client = RestSubscriptionNotificationClient()
+            client = PooledRestSubscriptionNotificationClient() \
+                if R4SubscriptionConfig.get_notification_connection_pool() else RestSubscriptionNotificationClient()
         self.client = client
         self.fhir_converter = fhir_converter
 
@@ -30,6 +32,37 @@ class RestSubscriptionNotificationManager:
         combined_result = [*result, *rejected]
         return self._handle_notification_results(combined_result)
 
+    def enqueue_notifications_with_resource(
+            self, imis_resource: Union[HistoryModel, VersionedModel], subscribers: List[Subscription])\
+            -> List[SubscriptionNotificationOutbox]:
+        """
+        Store notifications in the outbox instead of sending them, they're sent by the outbox worker.
+        Subscribers rejected by the validation are recorded right away.
+        """
+        fhir_content = self._resource_to_fhir(imis_resource)
+        valid, rejected = self._validate_subscribers(subscribers)
+        payload = self.client.normalize_payload(fhir_content)
+        if isinstance(payload, bytes):
+            payload = payload.decode('utf-8')
+        entries = SubscriptionNotificationOutbox.objects.bulk_create([
+            SubscriptionNotificationOutbox(subscription=subscriber, payload=payload) for subscriber in valid
+        ])
+        self._handle_notification_results(rejected)
+        return entries
+
+    def send_outbox_entries(self, entries: List[SubscriptionNotificationOutbox])\
+            -> List[SubscriberNotificationOutput]:
+        """
+        Send notifications stored in the outbox concurrently, results aren't recorded
+        (see `record_notification_results`). Returns outputs in the order of entries.
+        """
+        return list(self.client.propagate_notification_batch(
+            [(entry.payload, entry.subscription) for entry in entries]))
+
+    def record_notification_results(self, outputs: Iterable[SubscriberNotificationOutput])\
+            -> Iterable[SubscriptionNotificationResult]:
+        return self._handle_notification_results(outputs)
+
     def _validate_subscribers(self, subscribers: List[Subscription]) \
             -> Tuple[List[Subscription], List[SubscriberNotificationOutput]]:
         url_validator = URLValidator()
@@ -55,15 +88,15 @@ class RestSubscriptionNotificationManager:
 
     def _handle_notification_results(self, notification_result: Iterable[SubscriberNotificationOutput])\
             -> Iterable[SubscriptionNotificationResult]:
-        return [self.__save_result_in_db(result) for result in notification_result]
+        # results of a broadcast are stored with a single INSERT
+        entries = [self.__build_result_entry(result) for result in notification_result]
+        return SubscriptionNotificationResult.objects.bulk_create(entries) if entries else entries
 
-    def __save_result_in_db(self, result: SubscriberNotificationOutput):
-        new_entry = SubscriptionNotificationResult(
+    def __build_result_entry(self, result: SubscriberNotificationOutput):
+        return SubscriptionNotificationResult(
             subscription=result.subscription,
             error=str(result.reason_of_failure) if result.reason_of_failure else None,
             notified_successfully=result.notification_success,
             notification_time=core.datetimes.ad_datetime.AdDatetime.now()
         )
-        new_entry.save()
-        return new_entry
 
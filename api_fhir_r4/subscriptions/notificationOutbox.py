@@ -0,0 +1,100 @@
+import logging
+import time
+from datetime import timedelta
+from typing import List
+
+from django.db import transaction
+
+from api_fhir_r4.configurations import R4SubscriptionConfig
+from api_fhir_r4.models import Subscription, SubscriptionNotificationOutbox
+from api_fhir_r4.subscriptions.notificationClient import SubscriberNotificationOutput
+from api_fhir_r4.subscriptions.notificationManager import RestSubscriptionNotificationManager
+from core.datetimes.ad_datetime import AdDatetime
+
+logger = logging.getLogger('openIMIS')
+
+
+class SubscriptionNotificationOutboxWorker:
+    """
+    Drains `SubscriptionNotificationOutbox`. Each batch is claimed with `SELECT ... FOR UPDATE SKIP LOCKED` in a short
+    transaction, which counts the attempt and leases the entries for `outbox_lease_timeout` seconds, so many workers
+    can run side by side. Notifications are sent concurrently outside of any transaction, results are recorded
+    in a second transaction. Delivered entries are deleted, failed ones are retried with an exponential backoff until
+    `outbox_max_attempts` is reached. Entries of a worker which died in the middle of a batch are claimed again
+    once their lease expires.
+    """
+
+    def __init__(self, manager: RestSubscriptionNotificationManager = None, batch_size: int = None):
+        self.manager = manager or RestSubscriptionNotificationManager()
+        self.batch_size = batch_size or R4SubscriptionConfig.get_outbox_batch_size()
+
+    def run(self, poll_interval: float = None, stop_condition=None):
+        poll_interval = poll_interval if poll_interval is not None else R4SubscriptionConfig.get_outbox_poll_interval()
+        while not (stop_condition and stop_condition()):
+            # a full batch means more entries are likely waiting
+            if self.dispatch_pending() < self.batch_size:
+                time.sleep(poll_interval)
+
+    def dispatch_pending(self) -> int:
+        entries = self._claim_pending_entries()
+        if not entries:
+            return 0
+        try:
+            outputs = self.manager.send_outbox_entries(entries)
+        except Exception as e:
+            # counted as a failed attempt of every entry, so a poison entry eventually ends up failed
+            logger.exception("Subscription outbox: failed to send a batch of notifications")
+            outputs = [SubscriberNotificationOutput(entry.subscription, False, f'Dispatch failed: {e}')
+                       for entry in entries]
+
+        delivered, failed = [], []
+        for entry, output in zip(entries, outputs):
+            if output.notification_success:
+                delivered.append(entry.id)
+            else:
+                self._schedule_retry(entry, output.reason_of_failure)
+                failed.append(entry)
+        with transaction.atomic():
+            self.manager.record_notification_results(outputs)
+            SubscriptionNotificationOutbox.objects.filter(id__in=delivered).delete()
+            SubscriptionNotificationOutbox.objects.bulk_update(failed, ['status', 'next_attempt_at', 'last_error'])
+        logger.debug(f"Subscription outbox: {len(delivered)} notifications delivered, {len(failed)} failed")
+        return len(entries)
+
+    def _claim_pending_entries(self) -> List[SubscriptionNotificationOutbox]:
+        now = AdDatetime.now()
+        max_attempts = R4SubscriptionConfig.get_outbox_max_attempts()
+        with transaction.atomic():
+            locked = list(
+                SubscriptionNotificationOutbox.objects
+                .select_for_update(skip_locked=True)
+                .filter(status=SubscriptionNotificationOutbox.OutboxStatus.PENDING, next_attempt_at__lte=now)
+                .order_by('next_attempt_at')[:self.batch_size]
+            )
+            entries, exhausted = [], []
+            for entry in locked:
+                if entry.attempts >= max_attempts:
+                    # the last attempt was claimed but its result was never recorded
+                    entry.status = SubscriptionNotificationOutbox.OutboxStatus.FAILED
+                    entry.last_error = entry.last_error or 'Delivery not confirmed before the lease expired'
+                    exhausted.append(entry)
+                else:
+                    entry.attempts += 1
+                    entry.next_attempt_at = now + timedelta(seconds=R4SubscriptionConfig.get_outbox_lease_timeout())
+                    entries.append(entry)
+            SubscriptionNotificationOutbox.objects.bulk_update(entries, ['attempts', 'next_attempt_at'])
+            SubscriptionNotificationOutbox.objects.bulk_update(exhausted, ['status', 'last_error'])
+        # subscriptions are loaded separately, locking them isn't needed and FOR UPDATE OF isn't portable
+        subscriptions = Subscription.objects.in_bulk({entry.subscription_id for entry in entries})
+        for entry in entries:
+            entry.subscription = subscriptions[entry.subscription_id]
+        return entries
+
+    def _schedule_retry(self, entry: SubscriptionNotificationOutbox, reason):
+        # the attempt was already counted when the entry was claimed
+        entry.last_error = str(reason) if reason else None
+        if entry.attempts >= R4SubscriptionConfig.get_outbox_max_attempts():
+            entry.status = SubscriptionNotificationOutbox.OutboxStatus.FAILED
+        else:
+            delay = R4SubscriptionConfig.get_outbox_retry_delay() * 2 ** (entry.attempts - 1)
+            entry.next_attempt_at = AdDatetime.now() + timedelta(seconds=delay)
@@ -1,10 +1,8 @@
 from typing import Union
 
-from django.db.models import Q
-
 from api_fhir_r4.configurations import R4SubscriptionConfig
-from api_fhir_r4.models import Subscription
-from core.datetimes.ad_datetime import datetime
+from api_fhir_r4.subscriptions.subscriptionCriteriaMatcher import SubscriptionCriteriaMatcher
+from api_fhir_r4.subscriptions.subscriptionIndex import SubscriptionIndex
 from core.models import HistoryModel, VersionedModel
 
 
@@ -20,17 +18,11 @@ class SubscriptionCriteriaFilter:
         return self._get_matching_subscriptions(subscriptions)
 
     def _get_all_active_subscriptions(self):
-        queryset = Subscription.objects.filter(status=Subscription.SubscriptionStatus.ACTIVE.value,
-                                               expiring__gt=datetime.now(), is_deleted=False)
-        if self.fhir_resource_name:
-            queryset = queryset.filter(criteria__jsoncontains={
-                R4SubscriptionConfig.get_fhir_sub_criteria_key_resource(): self.fhir_resource_name})
-        if self.fhir_resource_type_name:
-            queryset = queryset.filter(
-                ~Q(criteria__jsoncontainskey=R4SubscriptionConfig.get_fhir_sub_criteria_key_resource_type() )| Q(
-                    criteria__jsoncontains={
-                        R4SubscriptionConfig.get_fhir_sub_criteria_key_resource_type(): self.fhir_resource_type_name}))
-        return queryset.all()
+        # subscriptions interested in the resource are looked up in the index, without querying the database
+        subscription_ids = SubscriptionIndex.get_subscription_ids(self.fhir_resource_name, self.fhir_resource_type_name)
+        if not subscription_ids:
+            return []
+        return SubscriptionIndex.get_active_subscriptions().filter(id__in=subscription_ids)
 
     def _get_matching_subscriptions(self, subscriptions):
         return [subscription for subscription in subscriptions
@@ -40,8 +32,8 @@ class SubscriptionCriteriaFilter:
         criteria = {criteria: sub.criteria[criteria] for criteria in sub.criteria if
                     criteria != R4SubscriptionConfig.get_fhir_sub_criteria_key_resource()
                     and criteria != R4SubscriptionConfig.get_fhir_sub_criteria_key_resource_type()}
-        return not criteria or self._is_resource_matching_criteria(criteria)
+        return not criteria or self._is_resource_matching_criteria(sub, criteria)
 
-    def _is_resource_matching_criteria(self, criteria):
-        criteria['uuid'] = self.imis_resource.uuid
-        return type(self.imis_resource).objects.filter(**criteria).exists()
+    def _is_resource_matching_criteria(self, sub, criteria):
+        # criteria are compiled once per subscription, simple field equality doesn't hit the database
+        return SubscriptionCriteriaMatcher.matches(sub, self.imis_resource, criteria)
@@ -0,0 +1,84 @@
+import threading
+from typing import Dict, List, Tuple, Any
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Model
+
+from api_fhir_r4.cache import ModelGenerationCache
+from api_fhir_r4.models import Subscription
+
+
+class CompiledSubscriptionCriteria:
+    """
+    Criteria of a subscription compiled for a model. Equality of concrete fields of the model (`gender`,
+    `chf_id__exact`) is checked against the instance in memory, only the remaining criteria (lookups, fields
+    of related models) are checked in the database, with a single query.
+    """
+    _EXACT_LOOKUP = 'exact'
+
+    def __init__(self, model, criteria: Dict[str, Any]):
+        self.model = model
+        self.in_memory_criteria: List[Tuple[str, Any]] = []
+        self.db_criteria: Dict[str, Any] = {}
+        for key, value in criteria.items():
+            compiled = self._compile_in_memory(key, value)
+            if compiled is None:
+                self.db_criteria[key] = value
+            else:
+                self.in_memory_criteria.append(compiled)
+
+    def matches(self, imis_resource: Model) -> bool:
+        if any(getattr(imis_resource, attname) != value for attname, value in self.in_memory_criteria):
+            return False
+        if self.db_criteria:
+            return self.model.objects.filter(uuid=imis_resource.uuid, **self.db_criteria).exists()
+        return True
+
+    def _compile_in_memory(self, key, value):
+        field_name, _, lookup = key.partition('__')
+        if lookup and lookup != self._EXACT_LOOKUP:
+            return None
+        try:
+            field = self.model._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            return None
+        if not field.concrete or field.many_to_many:
+            return None
+        # foreign keys are compared by the value of the referenced column, the same way the query does it
+        target_field = field.target_field if field.is_relation else field
+        try:
+            return field.attname, target_field.to_python(value)
+        except ValidationError:
+            return None
+
+
+class SubscriptionCriteriaMatcher:
+    """
+    Process wide cache of compiled subscription criteria. Entries are dropped when the generation of the
+    subscription table changes (see `ModelGenerationCache`), i.e. when any Subscription is saved or deleted.
+    """
+    _lock = threading.Lock()
+    _compiled: Dict[Tuple[Any, str], CompiledSubscriptionCriteria] = {}
+    _generation = None
+
+    @classmethod
+    def matches(cls, subscription: Subscription, imis_resource: Model, criteria: Dict[str, Any]) -> bool:
+        return cls.get_compiled_criteria(subscription, type(imis_resource), criteria).matches(imis_resource)
+
+    @classmethod
+    def get_compiled_criteria(cls, subscription: Subscription, model, criteria: Dict[str, Any]) \
+            -> CompiledSubscriptionCriteria:
+        db_table = Subscription._meta.db_table
+        generation = ModelGenerationCache.get_generations([db_table])[db_table]
+        key = (subscription.id, model._meta.label)
+        with cls._lock:
+            if generation != cls._generation:
+                cls._compiled = {}
+                cls._generation = generation
+            compiled = cls._compiled.get(key)
+        if compiled is None:
+            compiled = CompiledSubscriptionCriteria(model, criteria)
+            with cls._lock:
+                if generation == cls._generation:
+                    cls._compiled[key] = compiled
+        return compiled
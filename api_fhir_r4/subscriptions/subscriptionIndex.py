@@ -0,0 +1,68 @@
+from collections import defaultdict
+from typing import List
+
+from django.core.cache import caches
+
+from api_fhir_r4.cache import ModelGenerationCache
+from api_fhir_r4.configurations import R4SubscriptionConfig
+from api_fhir_r4.models import Subscription
+from core.datetimes.ad_datetime import datetime
+
+
+class SubscriptionIndex:
+    """
+    Ids of active, not expired subscriptions grouped by the subscribed resource, kept in the Django cache.
+    The index is rebuilt when the generation of the subscription table changes (any Subscription saved or
+    deleted, see `ModelGenerationCache`), when the first of the indexed subscriptions expires and at the latest
+    after `subscription_index_timeout` seconds, which bounds the delay of changes not seen by the generations
+    (bulk updates, processes without a shared cache).
+    Only ids are cached, subscriptions (with their encrypted headers) are always loaded from the database.
+    """
+    cache_name = 'default'
+    key_prefix = 'api_fhir_r4:subscription_index:'
+
+    @classmethod
+    def get_subscription_ids(cls, resource_name: str, resource_type_name: str = None) -> List:
+        index = cls.get_index()
+        if not resource_name:
+            return [sub_id for entries in index['resources'].values() for sub_id, _ in entries]
+        return [
+            sub_id for sub_id, subscribed_type in index['resources'].get(resource_name, [])
+            # subscriptions without resource type receive all types of the resource
+            if not resource_type_name or subscribed_type is None or subscribed_type == resource_type_name
+        ]
+
+    @classmethod
+    def get_index(cls):
+        cache = caches[cls.cache_name]
+        key = cls._get_key()
+        index = cache.get(key)
+        if index is None or (index['valid_until'] is not None and index['valid_until'] <= datetime.now()):
+            index = cls.build_index()
+            # indexes of old generations aren't read anymore, they're left to expire
+            cache.set(key, index, R4SubscriptionConfig.get_subscription_index_timeout())
+        return index
+
+    @classmethod
+    def build_index(cls):
+        resource_key = R4SubscriptionConfig.get_fhir_sub_criteria_key_resource()
+        resource_type_key = R4SubscriptionConfig.get_fhir_sub_criteria_key_resource_type()
+        resources = defaultdict(list)
+        valid_until = None
+        subscriptions = cls.get_active_subscriptions().values_list('id', 'criteria', 'expiring')
+        for sub_id, criteria, expiring in subscriptions:
+            criteria = criteria or {}
+            resources[criteria.get(resource_key)].append((sub_id, criteria.get(resource_type_key)))
+            valid_until = expiring if valid_until is None else min(valid_until, expiring)
+        return {'resources': dict(resources), 'valid_until': valid_until}
+
+    @classmethod
+    def get_active_subscriptions(cls):
+        return Subscription.objects.filter(status=Subscription.SubscriptionStatus.ACTIVE.value,
+                                           expiring__gt=datetime.now(), is_deleted=False)
+
+    @classmethod
+    def _get_key(cls):
+        db_table = Subscription._meta.db_table
+        generation = ModelGenerationCache.get_generations([db_table])[db_table]
+        return f'{cls.key_prefix}{generation}'
@@ -0,0 +1,45 @@
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+
+class FhirApiQueryBudgetTestMixin(object):
+    """
+    Checks that the number of queries of the list endpoint doesn't depend on the page size, so relations read by
+    the converter are loaded with the page (see `BaseFHIRConverter.apply_prefetch_plan`) instead of per resource.
+    """
+    _QUERY_BUDGET_PAGE_SIZES = (1, 3)
+
+    @property
+    def base_url(self):
+        raise NotImplementedError()
+
+    def login(self):
+        raise NotImplementedError()
+
+    def create_query_budget_resource(self, index):
+        raise NotImplementedError('`create_query_budget_resource()` must be implemented.')
+
+    def authenticate_query_budget_user(self):
+        self.login()
+
+    def test_list_query_count_should_not_depend_on_page_size(self):
+        self.authenticate_query_budget_user()
+        for index in range(max(self._QUERY_BUDGET_PAGE_SIZES)):
+            self.create_query_budget_resource(index)
+        # first request loads data cached for the whole process (permissions, configuration)
+        self._count_list_queries(self._QUERY_BUDGET_PAGE_SIZES[0])
+        query_counts = {
+            page_size: self._count_list_queries(page_size) for page_size in self._QUERY_BUDGET_PAGE_SIZES
+        }
+        self.assertEqual(len(set(query_counts.values())), 1, f'Queries per page size: {query_counts}')
+
+    def _count_list_queries(self, page_size):
+        # cached counts would make the compared requests differ
+        caches['default'].clear()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.base_url, data={'_count': page_size}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json().get('entry', [])), page_size)
+        return len(context)
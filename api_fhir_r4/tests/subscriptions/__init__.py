@@ -1,2 +1,4 @@
 from .client import TestSubscriptionNotificationClient
 from .manager import TestSubscriptionNotificationManager
+from .outbox import TestSubscriptionNotificationOutbox
+from .pooledClient import TestPooledSubscriptionNotificationClient
@@ -0,0 +1,80 @@
+import datetime
+
+from asynctest import MagicMock
+from django.test import TestCase
+
+from api_fhir_r4.configurations import R4SubscriptionConfig
+from api_fhir_r4.converters import ClaimConverter
+from api_fhir_r4.models import Subscription, SubscriptionNotificationOutbox, SubscriptionNotificationResult
+from api_fhir_r4.subscriptions.notificationClient import SubscriberNotificationOutput
+from api_fhir_r4.subscriptions.notificationManager import RestSubscriptionNotificationManager
+from api_fhir_r4.subscriptions.notificationOutbox import SubscriptionNotificationOutboxWorker
+from api_fhir_r4.tests import CommunicationTestMixin
+from api_fhir_r4.tests.mixin.logInMixin import LogInMixin
+
+
+class TestSubscriptionNotificationOutbox(CommunicationTestMixin, LogInMixin, TestCase):
+    TEST_HEADERS = """{"test-header": "123"}"""
+
+    def setUp(self) -> None:
+        super(TestSubscriptionNotificationOutbox, self).setUp()
+        self._test_user = self.get_or_create_user_api()
+        self._test_subscriptions = [self._create_valid(), self._create_valid()]
+
+    def test_notifications_are_stored_and_dispatched(self):
+        mocked_client = MagicMock()
+        mocked_client.normalize_payload = MagicMock(return_value=b'{"resourceType":"Claim"}')
+        mocked_client.propagate_notification_batch = MagicMock(side_effect=lambda notifications: [
+            SubscriberNotificationOutput(notifications[0][1], True),
+            SubscriberNotificationOutput(notifications[1][1], False, {"ServerError": "Endpoint Unavailable"}),
+        ])
+        manager = RestSubscriptionNotificationManager(fhir_converter=ClaimConverter(), client=mocked_client)
+
+        manager.enqueue_notifications_with_resource(self._TEST_CLAIM, self._test_subscriptions)
+        self.assertEqual(SubscriptionNotificationOutbox.objects.count(), 2)
+        mocked_client.propagate_notification_batch.assert_not_called()
+
+        dispatched = SubscriptionNotificationOutboxWorker(manager=manager).dispatch_pending()
+        self.assertEqual(dispatched, 2)
+        self.assertEqual(SubscriptionNotificationResult.objects.count(), 2)
+        # delivered notification is removed, failed one waits for a retry
+        remaining = SubscriptionNotificationOutbox.objects.get()
+        self.assertEqual(remaining.attempts, 1)
+        self.assertEqual(remaining.status, SubscriptionNotificationOutbox.OutboxStatus.PENDING)
+        self.assertEqual(remaining.payload, '{"resourceType":"Claim"}')
+        self.assertEqual(SubscriptionNotificationOutboxWorker(manager=manager).dispatch_pending(), 0)
+
+    def test_failed_dispatch_counts_as_attempt(self):
+        mocked_client = MagicMock()
+        mocked_client.normalize_payload = MagicMock(return_value=b'{"resourceType":"Claim"}')
+        mocked_client.propagate_notification_batch = MagicMock(side_effect=ConnectionError("Connection reset"))
+        manager = RestSubscriptionNotificationManager(fhir_converter=ClaimConverter(), client=mocked_client)
+        manager.enqueue_notifications_with_resource(self._TEST_CLAIM, self._test_subscriptions)
+
+        self.assertEqual(SubscriptionNotificationOutboxWorker(manager=manager).dispatch_pending(), 2)
+        self.assertEqual(SubscriptionNotificationResult.objects.count(), 2)
+        for entry in SubscriptionNotificationOutbox.objects.all():
+            self.assertEqual(entry.attempts, 1)
+            self.assertEqual(entry.status, SubscriptionNotificationOutbox.OutboxStatus.PENDING)
+            self.assertIn("Connection reset", entry.last_error)
+
+    def test_entry_with_expired_lease_of_last_attempt_fails(self):
+        mocked_client = MagicMock()
+        mocked_client.normalize_payload = MagicMock(return_value=b'{"resourceType":"Claim"}')
+        manager = RestSubscriptionNotificationManager(fhir_converter=ClaimConverter(), client=mocked_client)
+        manager.enqueue_notifications_with_resource(self._TEST_CLAIM, self._test_subscriptions[:1])
+        # a worker claimed the last attempt and died before recording the result
+        SubscriptionNotificationOutbox.objects.update(attempts=R4SubscriptionConfig.get_outbox_max_attempts())
+
+        self.assertEqual(SubscriptionNotificationOutboxWorker(manager=manager).dispatch_pending(), 0)
+        mocked_client.propagate_notification_batch.assert_not_called()
+        entry = SubscriptionNotificationOutbox.objects.get()
+        self.assertEqual(entry.status, SubscriptionNotificationOutbox.OutboxStatus.FAILED)
+
+    def _create_valid(self):
+        sub = Subscription(
+            status=1, channel=0, endpoint='http://test-subscription-endpoint.io/post_uri/',
+            headers=self.TEST_HEADERS, expiring=datetime.datetime.now() + datetime.timedelta(days=10)
+        )
+        sub.save(username=self._test_user.username)
+        return sub
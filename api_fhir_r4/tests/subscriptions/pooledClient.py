@@ -0,0 +1,106 @@
+import asyncio
+import concurrent.futures
+import datetime
+
+from asynctest import CoroutineMock, patch
+from django.test import TestCase
+
+from api_fhir_r4.configurations import R4SubscriptionConfig
+from api_fhir_r4.models import Subscription
+from api_fhir_r4.subscriptions.notificationClient import NotificationSessionPool, \
+    PooledRestSubscriptionNotificationClient, SubscriberNotificationOutput
+from api_fhir_r4.tests.mixin.logInMixin import LogInMixin
+
+
+@patch("api_fhir_r4.subscriptions.notificationClient.aiohttp.ClientSession.post")
+class TestPooledSubscriptionNotificationClient(LogInMixin, TestCase):
+    TEST_HEADERS = """{"test-header": "123"}"""
+    NOTIFICATION_PAYLOAD = b'{"notification_content":"content"}'
+
+    def setUp(self) -> None:
+        super().setUp()
+        self._test_user = self.get_or_create_user_api()
+        self._test_subscription = self._create_valid()
+        self.addCleanup(NotificationSessionPool.shutdown)
+
+    def test_session_is_reused_between_calls(self, post):
+        self._mock_response(post)
+        client = PooledRestSubscriptionNotificationClient()
+
+        response = client.propagate_notification_batch([(self.NOTIFICATION_PAYLOAD, self._test_subscription)])
+        session = NotificationSessionPool._session
+        client.propagate_notification_batch([(self.NOTIFICATION_PAYLOAD, self._test_subscription)])
+
+        self.assertListEqual(list(response), [SubscriberNotificationOutput(self._test_subscription, True, None)])
+        self.assertIs(NotificationSessionPool._session, session)
+        self.assertFalse(session.closed)
+        self.assertEqual(post.call_count, 2)
+
+    @patch.object(R4SubscriptionConfig, 'get_notification_pool_size', return_value=20)
+    @patch.object(R4SubscriptionConfig, 'get_notification_pool_size_per_host', return_value=5)
+    @patch.object(R4SubscriptionConfig, 'get_notification_keepalive_timeout', return_value=15)
+    @patch.object(R4SubscriptionConfig, 'get_notification_timeout', return_value=3)
+    def test_pool_is_configured(self, *mocks):
+        post = mocks[-1]
+        self._mock_response(post)
+        PooledRestSubscriptionNotificationClient().propagate_notification_batch(
+            [(self.NOTIFICATION_PAYLOAD, self._test_subscription)])
+
+        session = NotificationSessionPool._session
+        self.assertEqual(session.connector.limit, 20)
+        self.assertEqual(session.connector.limit_per_host, 5)
+        self.assertEqual(session.timeout.total, 3)
+
+    def test_shutdown_closes_session(self, post):
+        self._mock_response(post)
+        client = PooledRestSubscriptionNotificationClient()
+        client.propagate_notification_batch([(self.NOTIFICATION_PAYLOAD, self._test_subscription)])
+        session = NotificationSessionPool._session
+
+        NotificationSessionPool.shutdown()
+        self.assertTrue(session.closed)
+        self.assertIsNone(NotificationSessionPool._session)
+        self.assertIsNone(NotificationSessionPool._loop)
+
+        # the pool is started again by the next notification
+        client.propagate_notification_batch([(self.NOTIFICATION_PAYLOAD, self._test_subscription)])
+        self.assertIsNot(NotificationSessionPool._session, session)
+
+    def test_shutdown_closes_loop(self, post):
+        self._mock_response(post)
+        PooledRestSubscriptionNotificationClient().propagate_notification_batch(
+            [(self.NOTIFICATION_PAYLOAD, self._test_subscription)])
+        loop = NotificationSessionPool._loop
+
+        NotificationSessionPool.shutdown()
+        self.assertTrue(loop.is_closed())
+
+    @patch.object(NotificationSessionPool, '_atexit_registered', False)
+    @patch("api_fhir_r4.subscriptions.notificationClient.atexit.register")
+    def test_shutdown_is_registered_at_exit_once(self, register, post):
+        self._mock_response(post)
+        client = PooledRestSubscriptionNotificationClient()
+        for _ in range(2):
+            client.propagate_notification_batch([(self.NOTIFICATION_PAYLOAD, self._test_subscription)])
+            NotificationSessionPool.shutdown()
+
+        register.assert_called_once_with(NotificationSessionPool.shutdown)
+
+    @patch.object(NotificationSessionPool, 'result_timeout_margin', 0)
+    @patch.object(R4SubscriptionConfig, 'get_notification_timeout', return_value=0.1)
+    def test_run_is_bounded_by_notification_timeout(self, timeout, post):
+        with self.assertRaises(concurrent.futures.TimeoutError):
+            NotificationSessionPool.run(asyncio.sleep(5))
+
+    def _mock_response(self, post):
+        post.return_value.__aenter__.return_value.json = CoroutineMock(
+            return_value={'Notification': 'Thanks for notification'})
+        post.return_value.__aenter__.return_value.status = 200
+
+    def _create_valid(self):
+        sub = Subscription(
+            status=1, channel=0, endpoint='http://test-subscription-endpoint.io/post_uri/',
+            headers=self.TEST_HEADERS, expiring=datetime.datetime.now() + datetime.timedelta(days=10)
+        )
+        sub.save(username=self._test_user.username)
+        return sub
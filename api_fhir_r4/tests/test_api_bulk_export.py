@@ -0,0 +1,121 @@
+import gzip
+import json
+import shutil
+import tempfile
+from unittest import mock
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api_fhir_r4.bulkExport import ExportJobWorker, FileSystemExportBackend, ExportJobStatus
+from api_fhir_r4.configurations import GeneralConfiguration
+from api_fhir_r4.serializers import PatientSerializer
+from api_fhir_r4.tests import GenericFhirAPITestMixin
+from insuree.test_helpers import create_test_insuree
+
+
+class BulkExportAPITests(GenericFhirAPITestMixin, APITestCase):
+    base_url = GeneralConfiguration.get_base_url() + '$export'
+
+    def setUp(self):
+        super(BulkExportAPITests, self).setUp()
+        self.test_insuree = create_test_insuree()
+
+    def _get_ndjson_resources(self, response):
+        content = b''.join(response.streaming_content).decode('utf-8')
+        return [json.loads(line) for line in content.splitlines() if line]
+
+    def test_export_should_stream_ndjson(self):
+        self.login()
+        response = self.client.get(self.base_url, data={'_type': 'Patient'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/fhir+ndjson')
+        resources = self._get_ndjson_resources(response)
+        self.assertTrue(all(resource['resourceType'] == 'Patient' for resource in resources))
+        self.assertIn(str(self.test_insuree.uuid).lower(), [resource['id'].lower() for resource in resources])
+
+    def test_export_conversion_error_should_stream_operation_outcome(self):
+        self.login()
+        with mock.patch.object(PatientSerializer, 'to_representation', side_effect=ValueError('Invalid gender')):
+            response = self.client.get(self.base_url, data={'_type': 'Patient'})
+            resources = self._get_ndjson_resources(response)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(resources)
+        self.assertTrue(all(resource['resourceType'] == 'OperationOutcome' for resource in resources))
+        self.assertIn(f'Failed to export Patient {self.test_insuree.uuid}', [
+            issue.get('diagnostics') for resource in resources for issue in resource['issue']])
+
+    def test_export_since_should_filter(self):
+        self.login()
+        response = self.client.get(self.base_url, data={'_type': 'Patient', '_since': '2999-01-01T00:00:00Z'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._get_ndjson_resources(response), [])
+
+    def test_export_unsupported_type_should_fail(self):
+        self.login()
+        response = self.client.get(self.base_url, data={'_type': 'Observation'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_bad_authorization(self):
+        response = self.client.get(self.base_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class AsyncBulkExportAPITests(GenericFhirAPITestMixin, APITestCase):
+    base_url = GeneralConfiguration.get_base_url() + '$export'
+
+    def setUp(self):
+        super(AsyncBulkExportAPITests, self).setUp()
+        self.test_insuree = create_test_insuree()
+        self.export_directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.export_directory, True)
+
+    def test_async_export_workflow(self):
+        self.login()
+        with mock.patch.object(GeneralConfiguration, 'get_export_directory', return_value=self.export_directory):
+            response = self.client.get(self.base_url, data={'_type': 'Patient'}, HTTP_PREFER='respond-async')
+            self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+            self.assertEqual(self.client.get(response['Content-Location']).status_code, status.HTTP_202_ACCEPTED)
+
+            # run the job in the test thread, a worker process doesn't see the test transaction
+            self.assertEqual(ExportJobWorker().run_pending(), 1)
+            status_response = self.client.get(response['Content-Location'])
+            self.assertEqual(status_response.status_code, status.HTTP_200_OK)
+            manifest = status_response.json()
+            self.assertTrue(manifest['requiresAccessToken'])
+            self.assertEqual([output['type'] for output in manifest['output']], ['Patient'])
+
+            file_response = self.client.get(manifest['output'][0]['url'])
+            self.assertEqual(file_response.status_code, status.HTTP_200_OK)
+            content = gzip.decompress(b''.join(file_response.streaming_content)).decode('utf-8')
+            self.assertEqual(len(content.splitlines()), manifest['output'][0]['count'])
+
+            delete_response = self.client.delete(response['Content-Location'])
+            self.assertEqual(delete_response.status_code, status.HTTP_202_ACCEPTED)
+            self.assertEqual(self.client.get(response['Content-Location']).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_stale_job_fails(self):
+        backend = FileSystemExportBackend(self.export_directory)
+        job = backend.create_job(mock.Mock(pk=1), 'http://localhost/$export')
+        self.assertTrue(backend.claim_job(job['id']))
+        job['status'] = ExportJobStatus.IN_PROGRESS
+        job['heartbeat'] = 0
+        backend.save_job(job)
+
+        now = backend.get_claim_time(job['id']) + 120
+        with mock.patch.object(GeneralConfiguration, 'get_export_job_heartbeat_timeout', return_value=60), \
+                mock.patch('api_fhir_r4.bulkExport.exportJobs.time.time', return_value=now):
+            ExportJobWorker(backend).fail_stale_jobs()
+        self.assertEqual(backend.load_job(job['id'])['status'], ExportJobStatus.ERROR)
+
+    def test_expired_job_is_removed(self):
+        backend = FileSystemExportBackend(self.export_directory)
+        finished_job = backend.create_job(mock.Mock(pk=1), 'http://localhost/$export')
+        finished_job.update(status=ExportJobStatus.COMPLETED, finished=0)
+        backend.save_job(finished_job)
+        accepted_job = backend.create_job(mock.Mock(pk=1), 'http://localhost/$export')
+
+        with mock.patch.object(GeneralConfiguration, 'get_export_retention_hours', return_value=1):
+            ExportJobWorker(backend).remove_expired_jobs()
+        self.assertFalse(backend.job_exists(finished_job['id']))
+        self.assertTrue(backend.job_exists(accepted_job['id']))
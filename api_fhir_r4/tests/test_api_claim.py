@@ -5,7 +5,7 @@ from rest_framework import status
 from rest_framework.test import APITestCase
 
 from api_fhir_r4.configurations import GeneralConfiguration
-from api_fhir_r4.tests import GenericFhirAPITestMixin
+from api_fhir_r4.tests import GenericFhirAPITestMixin, FhirApiQueryBudgetTestMixin
 from api_fhir_r4.tests import LocationTestMixin, ClaimAdminPractitionerTestMixin
 from api_fhir_r4.tests.mixin.logInMixin import LogInMixin
 from api_fhir_r4.utils import TimeUtils
@@ -20,7 +20,7 @@ from medical.models import Diagnosis
 from medical.test_helpers import create_test_item, create_test_service
 from claim.test_helpers import create_test_claimservice,create_test_claimitem,create_test_claim_admin
 
-class ClaimAPITests(GenericFhirAPITestMixin, APITestCase, LogInMixin):
+class ClaimAPITests(GenericFhirAPITestMixin, FhirApiQueryBudgetTestMixin, APITestCase, LogInMixin):
     base_url = GeneralConfiguration.get_base_url() + 'Claim/'
     _test_json_path = "/test/test_claim.json"
 
@@ -143,6 +143,26 @@ class ClaimAPITests(GenericFhirAPITestMixin, APITestCase, LogInMixin):
 
 
 
+    def authenticate_query_budget_user(self):
+        # claims are listed for the districts of the claim administrator
+        self.client.force_authenticate(user=self._TEST_USER)
+
+    def create_query_budget_resource(self, index):
+        claim = Claim.objects.create(
+            code=f'QB{index}',
+            insuree=self.test_insuree,
+            health_facility=self.test_hf,
+            admin=self.test_claim_admin,
+            icd=self.test_icd,
+            date_from=TimeUtils.now().date(),
+            date_claimed=TimeUtils.now().date(),
+            claimed=self._TEST_ITEM_PRICE_ASKED + self._TEST_SERVICE_PRICE_ASKED,
+            status=Claim.STATUS_ENTERED,
+            audit_user_id=self._ADMIN_AUDIT_USER_ID,
+        )
+        create_test_claimitem(claim, self._TEST_ITEM_TYPE, custom_props={'item': self._TEST_ITEM})
+        create_test_claimservice(claim, self._TEST_SERVICE_TYPE, custom_props={'service': self._TEST_SERVICE})
+
     def _post_claim(self, data, headers):
         return self.client.post(self.base_url, data=data, format='json', **headers)
 
@@ -193,3 +213,34 @@ class ClaimAPITests(GenericFhirAPITestMixin, APITestCase, LogInMixin):
         response = self.client.get(GeneralConfiguration.get_base_url() + 'ClaimResponse/', data=None, format='json',
                                    **headers)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_post_batch_bundle_should_create_claims(self):
+        response = self.client.post(
+            GeneralConfiguration.get_base_url() + 'login/', data=get_connection_payload(self._TEST_DATA_USER), format='json'
+        )
+        token = response.json()["token"]
+        headers = {
+            "Content-Type": "application/json",
+            "HTTP_AUTHORIZATION": f"Bearer {token}"
+        }
+        bundle = {
+            "resourceType": "Bundle",
+            "type": "batch",
+            "entry": [
+                {"resource": load_and_replace_json(self._test_json_path, self.sub_str),
+                 "request": {"method": "POST", "url": "Claim"}},
+                {"resource": load_and_replace_json(self._test_json_path_with_code_references, self.sub_str),
+                 "request": {"method": "POST", "url": "Claim"}},
+                {"resource": {"resourceType": "Patient"}, "request": {"method": "POST", "url": "Patient"}},
+            ]
+        }
+        response = self.client.post(GeneralConfiguration.get_base_url(), data=bundle, format='json', **headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.json())
+        response_json = response.json()
+        self.assertEqual(response_json["type"], 'batch-response')
+        claim_entries, unsupported_entry = response_json["entry"][:2], response_json["entry"][2]
+        for entry in claim_entries:
+            self.assertEqual(entry["response"]["status"], '201 Created')
+            self.assertEqual(entry["resource"]["resourceType"], 'ClaimResponse')
+        self.assertEqual(unsupported_entry["response"]["status"], '400 Bad Request')
+        self.assertEqual(unsupported_entry["response"]["outcome"]["resourceType"], 'OperationOutcome')
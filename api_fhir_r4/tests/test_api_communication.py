@@ -5,7 +5,7 @@ from rest_framework import status
 from rest_framework.test import APITestCase
 
 from api_fhir_r4.configurations import GeneralConfiguration, R4CommunicationRequestConfig as Config
-from api_fhir_r4.tests import GenericFhirAPITestMixin
+from api_fhir_r4.tests import GenericFhirAPITestMixin, FhirApiQueryBudgetTestMixin
 from api_fhir_r4.tests import LocationTestMixin
 from api_fhir_r4.tests.utils import load_and_replace_json
 
@@ -21,7 +21,7 @@ from medical.test_helpers import create_test_item, create_test_service
 from location.test_helpers import create_test_village, create_test_health_facility
 
 
-class CommunicationAPITests(GenericFhirAPITestMixin, APITestCase, LogInMixin):
+class CommunicationAPITests(GenericFhirAPITestMixin, FhirApiQueryBudgetTestMixin, APITestCase, LogInMixin):
     base_url = GeneralConfiguration.get_base_url() + 'Communication/'
     _test_json_path = "/test/test_communication.json"
 
@@ -121,6 +121,28 @@ class CommunicationAPITests(GenericFhirAPITestMixin, APITestCase, LogInMixin):
 
 
 
+    def create_query_budget_resource(self, index):
+        claim = Claim.objects.create(
+            code=f'QB{index}',
+            status=self._TEST_STATUS,
+            insuree=self.test_insuree,
+            health_facility=self.test_hf,
+            admin=self.test_claim_admin,
+            icd=self.test_claim.icd,
+            date_from=datetime.date(2018, 12, 12),
+            date_claimed=datetime.date(2018, 12, 14),
+            audit_user_id=self._ADMIN_AUDIT_USER_ID,
+        )
+        Feedback.objects.create(
+            claim=claim,
+            care_rendered=self._TEST_CARE_RENDERED,
+            payment_asked=self._TEST_PAYMENT_ASKED,
+            drug_prescribed=self._TEST_DRUG_PRESCRIBED,
+            drug_received=self._TEST_DRUG_RECEIVED,
+            asessment=self._TEST_ASESSMENT,
+            audit_user_id=self._ADMIN_AUDIT_USER_ID,
+        )
+
     def create_test_claim_item(self):
         item = ClaimItem()
         item.item = create_test_item(
@@ -5,16 +5,24 @@ from rest_framework import status
 from rest_framework.test import APITestCase
 
 from api_fhir_r4.configurations import GeneralConfiguration
-from api_fhir_r4.tests import GenericFhirAPITestMixin
+from api_fhir_r4.tests import GenericFhirAPITestMixin, FhirApiQueryBudgetTestMixin
 from api_fhir_r4.tests.mixin.logInMixin import LogInMixin
+from api_fhir_r4.utils import TimeUtils
+from claim.models import Claim
+from claim.test_helpers import create_test_claim_admin
+from insuree.test_helpers import create_test_insuree
+from location.models import UserDistrict
+from location.test_helpers import create_test_health_facility
+from medical.models import Diagnosis
 
 
-class CommunicationRequestAPITests(GenericFhirAPITestMixin, APITestCase, LogInMixin):
+class CommunicationRequestAPITests(GenericFhirAPITestMixin, FhirApiQueryBudgetTestMixin, APITestCase, LogInMixin):
     base_url = GeneralConfiguration.get_base_url() + 'CommunicationRequest/'
     _test_json_path = "/test/test_communicationRequest.json"
 
     _test_json_path_credentials = "/test/test_login.json"
     _test_request_data_credentials = None
+    _ADMIN_AUDIT_USER_ID = -1
 
     def setUp(self):
         super(CommunicationRequestAPITests, self).setUp()
@@ -34,3 +42,29 @@ class CommunicationRequestAPITests(GenericFhirAPITestMixin, APITestCase, LogInMi
         }
         response = self.client.get(self.base_url, data=None, format='json', **headers)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def authenticate_query_budget_user(self):
+        # claims are listed for the districts of the user
+        self.test_insuree = create_test_insuree()
+        district = self.test_insuree.family.location.parent.parent
+        self.test_hf = create_test_health_facility('QBHF', district.id)
+        self.test_claim_admin = create_test_claim_admin(custom_props={'health_facility_id': self.test_hf.id})
+        self.test_icd = Diagnosis.objects.create(code='QBICD', name='Test diagnosis',
+                                                 audit_user_id=self._ADMIN_AUDIT_USER_ID)
+        UserDistrict.objects.create(user=self._TEST_USER.i_user, location=district, validity_from=TimeUtils.now(),
+                                    audit_user_id=self._ADMIN_AUDIT_USER_ID)
+        self.client.force_authenticate(user=self._TEST_USER)
+
+    def create_query_budget_resource(self, index):
+        Claim.objects.create(
+            code=f'QB{index}',
+            status=Claim.STATUS_ENTERED,
+            feedback_status=Claim.FEEDBACK_SELECTED,
+            insuree=self.test_insuree,
+            health_facility=self.test_hf,
+            admin=self.test_claim_admin,
+            icd=self.test_icd,
+            date_from=TimeUtils.now().date(),
+            date_claimed=TimeUtils.now().date(),
+            audit_user_id=self._ADMIN_AUDIT_USER_ID,
+        )
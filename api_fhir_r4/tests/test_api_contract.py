@@ -137,13 +137,14 @@ class ContractAPITests(GenericFhirAPITestMixin, APITestCase, LogInMixin):
         
 
 from api_fhir_r4.configurations import GeneralConfiguration
-from api_fhir_r4.tests import GenericFhirAPITestMixin, FhirApiReadTestMixin
+from api_fhir_r4.tests import GenericFhirAPITestMixin, FhirApiReadTestMixin, FhirApiQueryBudgetTestMixin
 from rest_framework.test import APITestCase
 from api_fhir_r4.tests.mixin.logInMixin import LogInMixin
 from graphql_jwt.shortcuts import get_token
 from core.test_helpers import create_test_interactive_user
 from dataclasses import dataclass
 from core.models import User
+from policy.test_helpers import create_test_policy
 from rest_framework import status
 
 
@@ -152,7 +153,8 @@ class DummyContext:
     """ Just because we need a context to generate. """
     user: User
 
-class ContractAPITests(GenericFhirAPITestMixin, FhirApiReadTestMixin, APITestCase, LogInMixin):
+class ContractAPITests(GenericFhirAPITestMixin, FhirApiReadTestMixin, FhirApiQueryBudgetTestMixin, APITestCase,
+                       LogInMixin):
     base_url = GeneralConfiguration.get_base_url() + 'Contract/'
     _test_json_path = None
     _test_request_data_credentials = None
@@ -173,4 +175,12 @@ class ContractAPITests(GenericFhirAPITestMixin, FhirApiReadTestMixin, APITestCas
         }
         response = self.client.get(self.base_url+ '?page-offset=2', format='json', **headers)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertIsNotNone(response.content)
\ No newline at end of file
+        self.assertIsNotNone(response.content)
+
+    def authenticate_query_budget_user(self):
+        self.client.force_authenticate(user=self.admin_user)
+
+    def create_query_budget_resource(self, index):
+        insuree = create_test_insuree(with_family=True, custom_props={'chf_id': f'99900030{index}'})
+        product = create_test_product(f'QBC{index}', valid=True)
+        create_test_policy(product=product, insuree=insuree)
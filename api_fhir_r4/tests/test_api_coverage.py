@@ -0,0 +1,17 @@
+from rest_framework.test import APITestCase
+
+from api_fhir_r4.configurations import GeneralConfiguration
+from api_fhir_r4.tests import GenericFhirAPITestMixin, FhirApiQueryBudgetTestMixin
+from insuree.test_helpers import create_test_insuree
+from policy.test_helpers import create_test_policy
+from product.test_helpers import create_test_product
+
+
+class CoverageAPITests(GenericFhirAPITestMixin, FhirApiQueryBudgetTestMixin, APITestCase):
+    base_url = GeneralConfiguration.get_base_url() + 'Coverage/'
+    _test_json_path = None
+
+    def create_query_budget_resource(self, index):
+        insuree = create_test_insuree(with_family=True, custom_props={'chf_id': f'99900040{index}'})
+        product = create_test_product(f'QBV{index}', valid=True)
+        create_test_policy(product=product, insuree=insuree)
@@ -7,13 +7,14 @@ from rest_framework import status
 from rest_framework.test import APITestCase
 
 from api_fhir_r4.configurations import GeneralConfiguration
-from api_fhir_r4.tests import GenericFhirAPITestMixin, FhirApiReadTestMixin, LocationTestMixin 
+from api_fhir_r4.tests import GenericFhirAPITestMixin, FhirApiReadTestMixin, LocationTestMixin, \
+    FhirApiQueryBudgetTestMixin
 from api_fhir_r4.tests.mixin.logInMixin import LogInMixin
 from insuree.test_helpers import *
 from api_fhir_r4.tests.utils import load_and_replace_json
 
 
-class GroupAPITests(GenericFhirAPITestMixin, FhirApiReadTestMixin, APITestCase, LogInMixin):
+class GroupAPITests(GenericFhirAPITestMixin, FhirApiReadTestMixin, FhirApiQueryBudgetTestMixin, APITestCase, LogInMixin):
     base_url = GeneralConfiguration.get_base_url() + 'Group/'
     _test_json_path = "/test/test_group.json"
     _TEST_INSUREE_CHFID = "TestChfId1"
@@ -56,6 +57,10 @@ class GroupAPITests(GenericFhirAPITestMixin, FhirApiReadTestMixin, APITestCase,
             if "group-poverty-status" in extension["url"]:
                 extension["valueBoolean"] = self._TEST_POVERTY_STATUS
 
+    def create_query_budget_resource(self, index):
+        # family (with location) is created together with its head
+        create_test_insuree(custom_props={'chf_id': f'99900020{index}'})
+
     def create_dependencies(self):
         self.test_insuree = create_test_insuree(
             with_family=False,
@@ -2,11 +2,11 @@ from rest_framework.test import APITestCase
 
 from location.models import Location
 from fhir.resources.R4B.location import Location as FHIRLocation
-from api_fhir_r4.tests import GenericFhirAPITestMixin, FhirApiCreateTestMixin
+from api_fhir_r4.tests import GenericFhirAPITestMixin, FhirApiCreateTestMixin, FhirApiQueryBudgetTestMixin
 from api_fhir_r4.configurations import GeneralConfiguration
 from api_fhir_r4.tests.utils import load_and_replace_json
 
-class LocationAPITests(GenericFhirAPITestMixin, FhirApiCreateTestMixin,
+class LocationAPITests(GenericFhirAPITestMixin, FhirApiCreateTestMixin, FhirApiQueryBudgetTestMixin,
                        APITestCase):
 
     base_url = GeneralConfiguration.get_base_url()+'Location/'
@@ -36,6 +36,7 @@ class LocationAPITests(GenericFhirAPITestMixin, FhirApiCreateTestMixin,
         imis_location_municipality.type = "M"
         imis_location_municipality.parent = imis_location_district
         imis_location_municipality.save()
+        self._test_municipality = imis_location_municipality
         self.sub_str[self._TEST_MUNICIPALITY_UUID] = imis_location_municipality.uuid
         self._TEST_MUNICIPALITY_UUID =  imis_location_municipality.uuid
         self._test_request_data = load_and_replace_json(self._test_json_path,self.sub_str)
@@ -46,3 +47,6 @@ class LocationAPITests(GenericFhirAPITestMixin, FhirApiCreateTestMixin,
 
     def update_resource(self, data):
         data['name'] = self._TEST_EXPECTED_NAME
+
+    def create_query_budget_resource(self, index):
+        Location.objects.create(code=f'QBV{index}', name=f'Test {index}', type='V', parent=self._test_municipality)
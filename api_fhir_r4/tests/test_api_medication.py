@@ -5,11 +5,13 @@ from api_fhir_r4.configurations import R4IdentifierConfig
 from fhir.resources.R4B.medication import Medication as FHIRMedication
 from api_fhir_r4.converters import MedicationConverter
 from api_fhir_r4.tests import GenericFhirAPITestMixin, \
-    FhirApiCreateTestMixin, FhirApiUpdateTestMixin, FhirApiReadTestMixin
+    FhirApiCreateTestMixin, FhirApiUpdateTestMixin, FhirApiReadTestMixin, FhirApiQueryBudgetTestMixin
 from api_fhir_r4.configurations import GeneralConfiguration
+from medical.test_helpers import create_test_item
 
 
-class MedicationAPITests(GenericFhirAPITestMixin, FhirApiCreateTestMixin, FhirApiUpdateTestMixin, FhirApiReadTestMixin, APITestCase):
+class MedicationAPITests(GenericFhirAPITestMixin, FhirApiCreateTestMixin, FhirApiUpdateTestMixin, FhirApiReadTestMixin,
+                         FhirApiQueryBudgetTestMixin, APITestCase):
 
     base_url = GeneralConfiguration.get_base_url()+'Medication/'
     _test_json_path = "/test/test_medication.json"
@@ -29,6 +31,9 @@ class MedicationAPITests(GenericFhirAPITestMixin, FhirApiCreateTestMixin, FhirAp
     def update_resource(self, data):
         data['identifier'][0]["value"] = self._TEST_EXPECTED_CODE
 
+    def create_query_budget_resource(self, index):
+        create_test_item('D', custom_props={'code': f'QB{index}'})
+
     def update_payload_missing_code_identifier(self, data):
         for i in range(len(data["identifier"])):
             if data["identifier"][i]["type"]["coding"][0]["code"] == "Code":
@@ -5,7 +5,11 @@ from api_fhir_r4.tests.mixin.logInMixin import LogInMixin
 from graphql_jwt.shortcuts import get_token
 from core.test_helpers import create_test_interactive_user
 from dataclasses import dataclass
+from urllib.parse import unquote_plus
 from core.models import User
+from location.models import HealthFacility
+from location.test_helpers import create_test_village, create_test_health_facility
+from policyholder.models import PolicyHolder
 from rest_framework import status
 
 
@@ -36,6 +40,50 @@ class OrganisationAPITests(GenericFhirAPITestMixin, FhirApiReadTestMixin, APITes
         response = self.client.get(self.base_url+ '?page-offset=2', format='json', **headers)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIsNotNone(response.content)
+
+    def test_list_pages_across_organisation_types(self):
+        village = create_test_village()
+        for index in range(3):
+            create_test_health_facility(f'QBHF{index}', village.parent.parent.id)
+            PolicyHolder(code=f'QBPH{index}', trade_name=f'Test {index}', locations=village,
+                         contact_name={'name': 'Test', 'surname': 'Test'}, address={'address': 'Test'}) \
+                .save(username=self.admin_user.username)
+        self.client.force_authenticate(user=self.admin_user)
+
+        total, resources = self._get_all_organisation_pages(page_size=2)
+        insurance_total = self._get_organisation_page(self.base_url, {'type': 'ins'})['total']
+        expected_total = HealthFacility.objects.filter(validity_to__isnull=True).count() \
+            + PolicyHolder.objects.filter(is_deleted=False).count() + insurance_total
+        self.assertEqual(total, expected_total)
+        # no organisation is duplicated or skipped between pages
+        self.assertEqual(len(resources), total)
+        self.assertEqual(len(set(resources)), total)
+        # pages follow the same order every time, health facilities first, then policy holders
+        self.assertEqual(self._get_all_organisation_pages(page_size=2), (total, resources))
+        type_order = {'prov': 0, 'bus': 1}
+        types = [type_ for type_, _ in resources]
+        self.assertEqual(types, sorted(types, key=lambda type_: type_order.get(type_, len(type_order))))
+
+    def _get_all_organisation_pages(self, page_size):
+        resources = []
+        bundle = self._get_organisation_page(self.base_url, {'_count': page_size})
+        total = bundle['total']
+        for _ in range(total // page_size + 1):
+            entries = bundle.get('entry', [])
+            self.assertLessEqual(len(entries), page_size)
+            resources.extend(
+                (entry['resource']['type'][0]['coding'][0]['code'], entry['resource']['id']) for entry in entries)
+            next_url = next((link['url'] for link in bundle.get('link', []) if link['relation'] == 'next'), None)
+            if next_url is None:
+                return total, resources
+            # links of the bundle are url-encoded
+            bundle = self._get_organisation_page(unquote_plus(next_url))
+        self.fail(f'More pages than {total} organisations fit in')
+
+    def _get_organisation_page(self, url, data=None):
+        response = self.client.get(url, data=data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+        return response.json()
         
         
     def get_or_create_user_api(self):
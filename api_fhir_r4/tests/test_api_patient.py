@@ -1,3 +1,4 @@
+import datetime
 import json
 import os
 from unittest import skip
@@ -8,13 +9,14 @@ from rest_framework import status
 from rest_framework.test import APITestCase
 
 from api_fhir_r4.configurations import GeneralConfiguration
-from api_fhir_r4.tests import GenericFhirAPITestMixin, PatientTestMixin, FhirApiReadTestMixin
+from api_fhir_r4.tests import GenericFhirAPITestMixin, PatientTestMixin, FhirApiReadTestMixin, \
+    FhirApiQueryBudgetTestMixin
 from api_fhir_r4.tests.utils import get_or_create_user_api,load_and_replace_json ,get_connection_payload
 from insuree.models import Gender
 from insuree.test_helpers import create_test_insuree
 from location.test_helpers import create_test_village
 
-class PatientAPITests(GenericFhirAPITestMixin, FhirApiReadTestMixin, APITestCase):
+class PatientAPITests(GenericFhirAPITestMixin, FhirApiReadTestMixin, FhirApiQueryBudgetTestMixin, APITestCase):
     base_url = GeneralConfiguration.get_base_url() + 'Patient/'
     _json_repr = "/test/test_patient.json"
     _TEST_LAST_NAME = "TEST_LAST_NAME"
@@ -46,6 +48,9 @@ class PatientAPITests(GenericFhirAPITestMixin, FhirApiReadTestMixin, APITestCase
     def update_resource(self, data):
         data['name'][0]['given'][0] = self._TEST_EXPECTED_NAME
 
+    def create_query_budget_resource(self, index):
+        create_test_insuree(custom_props={'chf_id': f'99900010{index}'})
+
 
 
     def update_payload_missing_chfid_identifier(self, data):
@@ -238,3 +243,38 @@ class PatientAPITests(GenericFhirAPITestMixin, FhirApiReadTestMixin, APITestCase
         self.assertIsNotNone(self.get_response_details(json_response))
         # Information regarding field should be part of failure reason
         self.assertIn(field, self.get_response_details(json_response))
+
+    def test_get_conditional_read(self):
+        self.login()
+        insuree = create_test_insuree(custom_props={'chf_id': '999000200'})
+        url = f'{self.base_url}{insuree.uuid}/'
+        response = self.client.get(url, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+        self.assertEqual(etag, f'W/"{response.json()["meta"]["versionId"]}"')
+
+        response = self.client.get(url, format='json', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        response = self.client.get(url, format='json', HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        type(insuree).objects.filter(id=insuree.id).update(
+            validity_from=insuree.validity_from + datetime.timedelta(days=1))
+        response = self.client.get(url, format='json', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_get_conditional_read_of_projection(self):
+        self.login()
+        insuree = create_test_insuree(custom_props={'chf_id': '999000201'})
+        url = f'{self.base_url}{insuree.uuid}/'
+        etag = self.client.get(url, format='json')['ETag']
+
+        response = self.client.get(url, data={'_elements': 'name'}, format='json', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        projection_etag = response['ETag']
+        self.assertNotEqual(projection_etag, etag)
+        response = self.client.get(url, data={'_elements': 'name'}, format='json', HTTP_IF_NONE_MATCH=projection_etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        response = self.client.get(url, format='json', HTTP_IF_NONE_MATCH=projection_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -0,0 +1,43 @@
+from django.test import TestCase, RequestFactory
+from insuree.test_helpers import create_test_insuree
+
+from api_fhir_r4.converters import PatientConverter
+from api_fhir_r4.projections import ElementProjection
+
+
+class ElementProjectionTestCase(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self._factory = RequestFactory()
+
+    def _get_elements(self, **params):
+        return ElementProjection.get_elements(self._factory.get('/', params), PatientConverter)
+
+    def test_elements(self):
+        self.assertEqual(self._get_elements(_elements='name,birthDate'),
+                         {'name', 'birthDate'} | ElementProjection.mandatory_elements)
+        self.assertIsNone(self._get_elements())
+
+    def test_summary(self):
+        self.assertEqual(self._get_elements(_summary='true'),
+                         set(PatientConverter.summary_elements) | ElementProjection.mandatory_elements)
+        self.assertEqual(self._get_elements(_summary='count'), ElementProjection.mandatory_elements)
+        self.assertIsNone(self._get_elements(_summary='data'))
+
+    def test_project(self):
+        elements = self._get_elements(_elements='name')
+        representation = ElementProjection.project(
+            {'resourceType': 'Patient', 'id': '1', 'name': [], 'photo': []}, elements)
+        self.assertEqual(set(representation), {'resourceType', 'id', 'name', 'meta'})
+        self.assertEqual(representation['meta']['tag'][0]['code'], 'SUBSETTED')
+
+    def test_converter_builds_requested_elements(self):
+        insuree = create_test_insuree()
+        elements = self._get_elements(_elements='name,gender')
+        fhir_patient = PatientConverter.to_fhir_obj(insuree, elements=elements)
+        self.assertIsNotNone(fhir_patient.name)
+        self.assertIsNotNone(fhir_patient.gender)
+        self.assertIsNone(fhir_patient.identifier)
+        self.assertIsNone(fhir_patient.photo)
+        self.assertEqual(PatientConverter.get_select_related_fields(elements), ('gender',))
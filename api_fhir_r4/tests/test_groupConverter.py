@@ -12,3 +12,17 @@ class GroupConverterTestCase(GroupTestMixin,
     converter = GroupConverter
     fhir_resource = Group
     json_repr = 'test/test_group.json'
+
+    def test_to_fhir_obj_uses_queryset_annotations(self):
+        imis_family = self.create_test_imis_instance()
+        setattr(imis_family, self.converter.MEMBER_COUNT_ANNOTATION, 1)
+        setattr(imis_family, self.converter.ACTIVE_POLICY_COUNT_ANNOTATION, 0)
+        setattr(imis_family, self.converter.ACTIVE_MEMBERS_PREFETCH, [self.test_insuree])
+        fhir_family = Group.construct()
+        with self.assertNumQueries(0):
+            self.converter.build_fhir_quantity(fhir_family, imis_family)
+            self.converter.build_fhir_active(fhir_family, imis_family)
+            members = self.converter.build_fhir_members(imis_family)
+        self.assertEqual(1, fhir_family.quantity)
+        self.assertFalse(fhir_family.active)
+        self.assertEqual(1, len(members))
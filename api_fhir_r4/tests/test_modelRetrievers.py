@@ -0,0 +1,123 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from medical.models import Diagnosis
+
+from api_fhir_r4.cache import IdentifierLookupCache
+from api_fhir_r4.model_retrievers import CodeIdentifierModelRetriever, CombinedModelRetriever, \
+    GenericModelRetriever
+from api_fhir_r4.converters import ReferenceConverterMixin
+from api_fhir_r4.mixins import GenericMultiIdentifierMixin, ConditionalReadMixin
+
+
+class CombinedModelRetrieverTestCase(TestCase):
+    _TEST_AUDIT_USER_ID = 1
+
+    class NameIdentifierModelRetriever(GenericModelRetriever):
+        identifier_field = 'name'
+        serializer_reference_type = ReferenceConverterMixin.CODE_REFERENCE_TYPE
+
+        @classmethod
+        def identifier_validator(cls, identifier_value):
+            return isinstance(identifier_value, str)
+
+    def setUp(self):
+        super().setUp()
+        self._by_code = Diagnosis.objects.create(code='RT01', name='RT02', audit_user_id=self._TEST_AUDIT_USER_ID)
+        self._by_name = Diagnosis.objects.create(code='RT02', name='RT01', audit_user_id=self._TEST_AUDIT_USER_ID)
+
+    def test_first_retriever_wins_with_single_query(self):
+        retrievers = [CodeIdentifierModelRetriever, self.NameIdentifierModelRetriever]
+        with self.assertNumQueries(1):
+            retriever, diagnosis = CombinedModelRetriever.get_model_object(Diagnosis.objects, 'RT01', retrievers)
+        self.assertIs(retriever, CodeIdentifierModelRetriever)
+        self.assertEqual(diagnosis.id, self._by_code.id)
+
+    def test_missing_object(self):
+        retrievers = [CodeIdentifierModelRetriever, self.NameIdentifierModelRetriever]
+        with self.assertRaises(Diagnosis.DoesNotExist):
+            CombinedModelRetriever.get_model_object(Diagnosis.objects, 'RT03', retrievers)
+
+    def test_additional_filtering_applies_to_own_lookup_only(self):
+        class FilteredCodeRetriever(CodeIdentifierModelRetriever):
+            @classmethod
+            def retriever_additional_queryset_filtering(cls, queryset):
+                return queryset.filter(name__endswith='C')
+
+        class FilteredNameRetriever(self.NameIdentifierModelRetriever):
+            @classmethod
+            def retriever_additional_queryset_filtering(cls, queryset):
+                return queryset.filter(code__endswith='N')
+
+        by_code = Diagnosis.objects.create(code='RF01', name='RF01C', audit_user_id=self._TEST_AUDIT_USER_ID)
+        by_name = Diagnosis.objects.create(code='RF02N', name='RF02', audit_user_id=self._TEST_AUDIT_USER_ID)
+        Diagnosis.objects.create(code='RF03', name='RF03', audit_user_id=self._TEST_AUDIT_USER_ID)
+        retrievers = [FilteredCodeRetriever, FilteredNameRetriever]
+        queryset = Diagnosis.objects.all()
+
+        self.assertEqual(CombinedModelRetriever.get_model_object(queryset, 'RF01', retrievers),
+                         (FilteredCodeRetriever, by_code))
+        self.assertEqual(CombinedModelRetriever.get_model_object(queryset, 'RF02', retrievers),
+                         (FilteredNameRetriever, by_name))
+        # matches both lookups, but neither filter of the retriever whose lookup it matches
+        with self.assertRaises(Diagnosis.DoesNotExist):
+            CombinedModelRetriever.get_model_object(queryset, 'RF03', retrievers)
+
+
+class IdentifierLookupCacheTestCase(TestCase):
+    _TEST_AUDIT_USER_ID = 1
+    _RETRIEVERS = [CodeIdentifierModelRetriever]
+
+    class _DiagnosisRetrieverMixin(GenericMultiIdentifierMixin, ConditionalReadMixin):
+        retrievers = [CodeIdentifierModelRetriever]
+
+    def setUp(self):
+        super().setUp()
+        self._diagnosis = Diagnosis.objects.create(code='IL01', name='IL01', audit_user_id=self._TEST_AUDIT_USER_ID)
+
+    def _lookup(self, code):
+        return CombinedModelRetriever.get_lookup(code, self._RETRIEVERS)
+
+    def test_cached_primary_key(self):
+        lookup = self._lookup('IL01')
+        self.assertIsNone(IdentifierLookupCache.get(Diagnosis.objects.all(), self._RETRIEVERS, 'IL01', lookup))
+        IdentifierLookupCache.set(Diagnosis.objects.all(), self._RETRIEVERS, 'IL01', lookup,
+                                  CodeIdentifierModelRetriever, self._diagnosis.pk)
+        self.assertEqual(
+            IdentifierLookupCache.get(Diagnosis.objects.all(), self._RETRIEVERS, 'IL01', lookup),
+            (CodeIdentifierModelRetriever, self._diagnosis.pk, None)
+        )
+
+    def test_cached_primary_key_is_invalidated_on_save(self):
+        lookup = self._lookup('IL01')
+        IdentifierLookupCache.set(Diagnosis.objects.all(), self._RETRIEVERS, 'IL01', lookup,
+                                  CodeIdentifierModelRetriever, self._diagnosis.pk)
+        self._diagnosis.name = 'IL02'
+        self._diagnosis.save()
+        self.assertIsNone(IdentifierLookupCache.get(Diagnosis.objects.all(), self._RETRIEVERS, 'IL01', lookup))
+
+    def test_cached_identifier_is_fetched_with_fewer_queries(self):
+        retriever_mixin = self._DiagnosisRetrieverMixin()
+        with CaptureQueriesContext(connection) as miss:
+            retriever_mixin._get_version_stamp_with_retrievers(Diagnosis.objects.all(), 'IL01', self._RETRIEVERS)
+            retriever_mixin._get_object_with_retrievers(Diagnosis.objects.all(), 'IL01', self._RETRIEVERS)
+        with CaptureQueriesContext(connection) as hit:
+            stamp = retriever_mixin._get_version_stamp_with_retrievers(
+                Diagnosis.objects.all(), 'IL01', self._RETRIEVERS)
+            retriever, diagnosis = retriever_mixin._get_object_with_retrievers(
+                Diagnosis.objects.all(), 'IL01', self._RETRIEVERS)
+        self.assertEqual(diagnosis.pk, self._diagnosis.pk)
+        self.assertEqual(stamp, self._diagnosis.validity_from)
+        # the object is fetched by the primary key and the stamp of a conditional read comes from the cache
+        self.assertLess(len(hit), len(miss))
+        self.assertEqual(len(hit), 1)
+
+    def test_cached_primary_key_of_inactive_row_is_resolved_again(self):
+        historical = Diagnosis.objects.create(
+            code='IL00', name='IL00', audit_user_id=self._TEST_AUDIT_USER_ID, validity_to=self._diagnosis.validity_from)
+        # e.g. the row was made historical with QuerySet.update(), which doesn't bump the generation of the table
+        IdentifierLookupCache.set(Diagnosis.objects.all(), self._RETRIEVERS, 'IL01', self._lookup('IL01'),
+                                  CodeIdentifierModelRetriever, historical.pk)
+        retriever, diagnosis = self._DiagnosisRetrieverMixin()._get_object_with_retrievers(
+            Diagnosis.objects.all(), 'IL01', self._RETRIEVERS)
+        self.assertEqual(diagnosis.pk, self._diagnosis.pk)
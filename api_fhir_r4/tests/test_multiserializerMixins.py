@@ -0,0 +1,72 @@
+from django.test import TestCase
+from medical.models import Diagnosis
+
+from api_fhir_r4.multiserializer.mixins import _JoinedQuerysets, _MultiserializerPermissionClassWrapper, \
+    _user_has_perms
+from api_fhir_r4.permissions import FHIRApiPractitionerPermissions
+
+
+class JoinedQuerysetsTestCase(TestCase):
+    _TEST_CODES = ('JQA1', 'JQA2', 'JQA3', 'JQB1', 'JQB2')
+    _TEST_AUDIT_USER_ID = 1
+
+    def setUp(self):
+        super().setUp()
+        for code in self._TEST_CODES:
+            Diagnosis.objects.create(code=code, name=f'Test {code}', audit_user_id=self._TEST_AUDIT_USER_ID)
+
+    def _build_joined_querysets(self):
+        return _JoinedQuerysets(
+            Diagnosis.objects.filter(code__startswith='JQA').order_by('code'),
+            Diagnosis.objects.filter(code__startswith='JQB').order_by('code'),
+        )
+
+    def test_slice_across_querysets(self):
+        joined = self._build_joined_querysets()
+        # one count per queryset, one bounded query per queryset overlapping the slice
+        with self.assertNumQueries(4):
+            page = joined[2:4]
+        self.assertEqual([diagnosis.code for diagnosis in page], ['JQA3', 'JQB1'])
+
+    def test_counts_are_computed_once(self):
+        joined = self._build_joined_querysets()
+        with self.assertNumQueries(2):
+            self.assertEqual(len(joined), len(self._TEST_CODES))
+            self.assertEqual(joined.count(), len(self._TEST_CODES))
+
+    def test_slice_within_single_queryset(self):
+        joined = self._build_joined_querysets()
+        joined.count()
+        with self.assertNumQueries(1):
+            page = joined[3:10]
+        self.assertEqual([diagnosis.code for diagnosis in page], ['JQB1', 'JQB2'])
+
+    def test_index(self):
+        joined = self._build_joined_querysets()
+        self.assertEqual(joined[3].code, 'JQB1')
+        self.assertEqual(joined[-1].code, 'JQB2')
+        with self.assertRaises(IndexError):
+            joined[len(self._TEST_CODES)]
+
+
+class MultiserializerPermissionsTestCase(TestCase):
+
+    class _User:
+        def __init__(self):
+            self.checked_perms = []
+
+        def has_perms(self, perms):
+            self.checked_perms.append(list(perms))
+            return True
+
+    def test_permission_class_wrapper_is_created_once(self):
+        self.assertIs(
+            _MultiserializerPermissionClassWrapper(FHIRApiPractitionerPermissions),
+            _MultiserializerPermissionClassWrapper(FHIRApiPractitionerPermissions),
+        )
+
+    def test_user_permissions_are_checked_once(self):
+        user = self._User()
+        self.assertTrue(_user_has_perms(user, ['101001', '101002']))
+        self.assertTrue(_user_has_perms(user, ['101002', '101001']))
+        self.assertEqual(len(user.checked_perms), 1)
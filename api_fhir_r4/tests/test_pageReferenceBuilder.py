@@ -0,0 +1,38 @@
+from django.test import TestCase
+from insuree.models import Insuree
+from insuree.test_helpers import create_test_insuree
+
+from api_fhir_r4.converters import PatientConverter, PageReferenceBuilder
+
+
+class PageReferenceBuilderTestCase(TestCase):
+
+    def _build_uuid_identifiers(self, insurees):
+        identifiers = []
+        for insuree in insurees:
+            PatientConverter.build_fhir_uuid_identifier(identifiers, insuree)
+        return identifiers
+
+    def test_identifier_types_are_shared_within_scope(self):
+        insurees = [create_test_insuree(custom_props={'chf_id': f'99900030{index}'}) for index in range(2)]
+        with PageReferenceBuilder.scope(PatientConverter, insurees):
+            identifiers = self._build_uuid_identifiers(insurees)
+        self.assertIs(identifiers[0].type, identifiers[1].type)
+
+        identifiers = self._build_uuid_identifiers(insurees)
+        self.assertIsNot(identifiers[0].type, identifiers[1].type)
+        self.assertEqual(identifiers[0].type.dict(), identifiers[1].type.dict())
+
+    def test_references_are_loaded_for_page(self):
+        for index in range(2):
+            create_test_insuree(custom_props={'chf_id': f'99900031{index}'})
+        insurees = list(Insuree.objects.filter(chf_id__startswith='99900031'))
+        with PageReferenceBuilder.scope(PatientConverter, insurees):
+            with self.assertNumQueries(0):
+                for insuree in insurees:
+                    insuree.health_facility
+                    insuree.family.location.parent
+
+    def test_reference_related_fields_follow_elements(self):
+        self.assertEqual(PatientConverter.get_reference_related_fields({'name'}), ())
+        self.assertEqual(PatientConverter.get_reference_related_fields({'generalPractitioner'}), ('health_facility',))
@@ -0,0 +1,100 @@
+import base64
+import datetime
+import json
+
+from django.db.models import Q
+from django.core.cache import cache
+from django.test import TestCase
+from medical.models import Diagnosis
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api_fhir_r4.multiserializer.mixins import _JoinedQuerysets
+from api_fhir_r4.paginations import FhirBundleResultsSetPagination
+from insuree.models import Insuree
+
+
+class FhirBundleCursorPaginationTestCase(TestCase):
+    _TEST_ORDERING = ('validity_from', 'pk')
+    _TEST_POSITION = (datetime.datetime(2020, 1, 2, 3, 4, 5), 42)
+
+    def test_cursor_ordering_for_versioned_model(self):
+        pagination = FhirBundleResultsSetPagination()
+        self.assertEqual(pagination.get_cursor_ordering(Insuree), self._TEST_ORDERING)
+
+    def test_cursor_round_trip(self):
+        pagination = FhirBundleResultsSetPagination()
+        pagination.cursor_ordering = self._TEST_ORDERING
+        token = pagination.encode_cursor(self._TEST_ORDERING, self._TEST_POSITION)
+        self.assertEqual(pagination.decode_cursor(token), ['2020-01-02T03:04:05', 42])
+
+    def test_cursor_for_other_ordering_is_rejected(self):
+        pagination = FhirBundleResultsSetPagination()
+        pagination.cursor_ordering = ('date_created', 'pk')
+        token = pagination.encode_cursor(self._TEST_ORDERING, self._TEST_POSITION)
+        with self.assertRaises(ValidationError):
+            pagination.decode_cursor(token)
+
+    def test_malformed_cursor_is_rejected(self):
+        pagination = FhirBundleResultsSetPagination()
+        pagination.cursor_ordering = self._TEST_ORDERING
+        with self.assertRaises(ValidationError):
+            pagination.decode_cursor('not-a-cursor')
+
+    def test_cursor_with_invalid_payload_is_rejected(self):
+        pagination = FhirBundleResultsSetPagination()
+        pagination.cursor_ordering = self._TEST_ORDERING
+        fields = list(self._TEST_ORDERING)
+        payloads = {
+            'not an object': ['validity_from', 'pk'],
+            'missing position': {'f': fields},
+            'position not a list': {'f': fields, 'v': 42},
+            'position of a string': {'f': fields, 'v': '42'},
+            'fields not a list': {'f': 42, 'v': ['2020-01-01', 42]},
+            'short position': {'f': fields, 'v': ['2020-01-01']},
+            'nested value': {'f': fields, 'v': ['2020-01-01', {'pk': 42}]},
+            'null value': {'f': fields, 'v': ['2020-01-01', None]},
+        }
+        for case, payload in payloads.items():
+            token = base64.urlsafe_b64encode(json.dumps(payload).encode('utf8')).decode('ascii')
+            with self.subTest(case), self.assertRaises(ValidationError):
+                pagination.decode_cursor(token)
+
+    def test_cursor_with_invalid_value_is_rejected(self):
+        token = FhirBundleResultsSetPagination.encode_cursor(('validity_from', 'pk'), ['not-a-date', 42])
+        request = Request(APIRequestFactory().get('/Patient/', {'_cursor': token}))
+        with self.assertRaises(ValidationError):
+            FhirBundleResultsSetPagination().paginate_queryset_by_cursor(Insuree.objects.all(), request)
+
+    def test_cursor_filter(self):
+        expected = Q(validity_from__gt='2020-01-01') | Q(validity_from='2020-01-01', pk__gt=7)
+        actual = FhirBundleResultsSetPagination.build_cursor_filter(self._TEST_ORDERING, ['2020-01-01', 7])
+        self.assertEqual(str(actual), str(expected))
+
+
+class FhirBundleCountPaginationTestCase(TestCase):
+    _TEST_CODES = ('SCA1', 'SCA2', 'SCB1')
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        for code in self._TEST_CODES:
+            Diagnosis.objects.create(code=code, name=f'Test {code}', audit_user_id=1)
+        self._request = Request(APIRequestFactory().get('/Diagnosis/', {'_summary': 'count'}))
+
+    def test_count_bundle(self):
+        pagination = FhirBundleResultsSetPagination()
+        with self.assertNumQueries(1):
+            page = pagination.paginate_queryset(Diagnosis.objects.filter(code__startswith='SC'), self._request)
+        self.assertEqual(page, [])
+        bundle = pagination.get_paginated_response(page).data
+        self.assertEqual(bundle['total'], len(self._TEST_CODES))
+        self.assertNotIn('entry', bundle)
+
+    def test_count_of_joined_querysets(self):
+        pagination = FhirBundleResultsSetPagination()
+        joined = _JoinedQuerysets(Diagnosis.objects.filter(code__startswith='SCA'),
+                                  Diagnosis.objects.filter(code__startswith='SCB'))
+        pagination.paginate_queryset(joined, self._request)
+        self.assertEqual(pagination.get_paginated_response([]).data['total'], len(self._TEST_CODES))
@@ -0,0 +1,48 @@
+from django.test import TestCase
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api_fhir_r4.cache import ModelGenerationCache, QueryCountService
+from api_fhir_r4.models import SubscriptionNotificationResult
+from insuree.models import Family, Insuree
+from location.models import Location
+from insuree.test_helpers import create_test_insuree
+
+
+class QueryCountServiceTestCase(TestCase):
+
+    def _build_service(self, query_string=''):
+        request = Request(APIRequestFactory().get('/api_fhir_r4/Patient/' + query_string))
+        return QueryCountService(request, ignored_query_params=('_count', 'page-offset'))
+
+    def test_count_is_invalidated_on_save(self):
+        service = self._build_service()
+        queryset = Insuree.objects.filter(validity_to__isnull=True)
+        initial_count = service.count(queryset)
+        create_test_insuree()
+        self.assertEqual(service.count(queryset), initial_count + 1)
+
+    def test_pagination_params_are_not_part_of_the_key(self):
+        queryset = Insuree.objects.filter(validity_to__isnull=True)
+        self.assertEqual(
+            self._build_service('?_count=5&refDate=2020-01-01').get_cache_key(queryset),
+            self._build_service('?refDate=2020-01-01&page-offset=2').get_cache_key(queryset)
+        )
+
+    def test_total_none_skips_count(self):
+        service = self._build_service('?_total=none')
+        self.assertEqual(service.get_total_mode(), QueryCountService.TOTAL_NONE)
+        self.assertIsNone(service.count(Insuree.objects.all(), QueryCountService.TOTAL_NONE))
+
+    def test_invalid_total_mode(self):
+        with self.assertRaises(ValidationError):
+            self._build_service('?_total=sometimes').get_total_mode()
+
+    def test_only_models_read_by_views_are_tracked(self):
+        tracked_models = ModelGenerationCache.get_tracked_models()
+        self.assertIn(Insuree, tracked_models)
+        # referenced models are joined by the searches
+        self.assertIn(Family, tracked_models)
+        self.assertIn(Location, tracked_models)
+        self.assertNotIn(SubscriptionNotificationResult, tracked_models)
@@ -0,0 +1,52 @@
+import datetime
+
+from django.test import TestCase
+from medical.models import Diagnosis
+
+from api_fhir_r4.utils import DbManagerUtils, ReferenceResolutionCache
+
+
+class ReferenceResolutionCacheTestCase(TestCase):
+    _TEST_CODES = ('ICD01', 'ICD02')
+    _TEST_AUDIT_USER_ID = 1
+
+    def setUp(self):
+        super().setUp()
+        for code in self._TEST_CODES:
+            Diagnosis.objects.create(code=code, name=f'Test {code}', audit_user_id=self._TEST_AUDIT_USER_ID)
+
+    def test_repeated_lookup_hits_database_once(self):
+        with ReferenceResolutionCache.scope():
+            with self.assertNumQueries(1):
+                first = DbManagerUtils.get_object_or_none(Diagnosis, code=self._TEST_CODES[0])
+                second = DbManagerUtils.get_object_or_none(Diagnosis, code=self._TEST_CODES[0])
+        self.assertIs(first, second)
+
+    def test_prefetched_lookups_dont_hit_database(self):
+        with ReferenceResolutionCache.scope():
+            with self.assertNumQueries(1):
+                ReferenceResolutionCache.prefetch(Diagnosis, 'code', self._TEST_CODES)
+            with self.assertNumQueries(0):
+                for code in self._TEST_CODES:
+                    self.assertEqual(DbManagerUtils.get_object_or_none(Diagnosis, code=code).code, code)
+
+    def test_prefetch_keeps_active_row(self):
+        historical = Diagnosis.objects.create(
+            code=self._TEST_CODES[0], name='Historical', audit_user_id=self._TEST_AUDIT_USER_ID,
+            validity_from=datetime.datetime(2020, 1, 1), validity_to=datetime.datetime(2020, 6, 1))
+        with ReferenceResolutionCache.scope():
+            ReferenceResolutionCache.prefetch(Diagnosis, 'code', self._TEST_CODES)
+            diagnosis = DbManagerUtils.get_object_or_none(Diagnosis, code=self._TEST_CODES[0])
+        self.assertNotEqual(diagnosis.pk, historical.pk)
+        self.assertIsNone(diagnosis.validity_to)
+
+    def test_missing_object_is_not_cached(self):
+        with ReferenceResolutionCache.scope():
+            with self.assertNumQueries(2):
+                self.assertIsNone(DbManagerUtils.get_object_or_none(Diagnosis, code='MISSING'))
+                self.assertIsNone(DbManagerUtils.get_object_or_none(Diagnosis, code='MISSING'))
+
+    def test_lookup_outside_of_scope_is_not_cached(self):
+        with self.assertNumQueries(2):
+            DbManagerUtils.get_object_or_none(Diagnosis, code=self._TEST_CODES[0])
+            DbManagerUtils.get_object_or_none(Diagnosis, code=self._TEST_CODES[0])
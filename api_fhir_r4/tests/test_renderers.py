@@ -0,0 +1,52 @@
+import datetime
+import decimal
+import uuid
+
+from django.test import TestCase
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api_fhir_r4.negotiation import FHIRContentNegotiation
+from api_fhir_r4.renderers import FHIRJSONRenderer, FHIRCompatibleJSONRenderer
+
+
+class FHIRJSONRendererTestCase(TestCase):
+    _TEST_UUID = uuid.UUID('7240daef-5f8f-4b0f-9042-b221e66f184a')
+
+    def _build_request(self, query_string='', **headers):
+        return Request(APIRequestFactory().get('/api_fhir_r4/Patient/' + query_string, **headers))
+
+    def test_render_native_types(self):
+        data = {'id': self._TEST_UUID, 'amount': decimal.Decimal('10.50'), 'date': datetime.date(2020, 1, 2)}
+        rendered = FHIRJSONRenderer().render(data, renderer_context={'request': self._build_request()})
+        self.assertEqual(rendered, b'{"id":"7240daef-5f8f-4b0f-9042-b221e66f184a","amount":10.5,"date":"2020-01-02"}')
+
+    def test_render_non_str_keys(self):
+        data = {1: 'a', self._TEST_UUID: 'b', datetime.date(2020, 1, 2): 'c'}
+        rendered = FHIRJSONRenderer().render(data, renderer_context={'request': self._build_request()})
+        self.assertEqual(rendered, b'{"1":"a","7240daef-5f8f-4b0f-9042-b221e66f184a":"b","2020-01-02":"c"}')
+
+    def test_render_pretty(self):
+        renderer = FHIRJSONRenderer()
+        pretty = renderer.render({'a': 1}, renderer_context={'request': self._build_request('?_pretty=true')})
+        compact = renderer.render({'a': 1}, renderer_context={'request': self._build_request('?_pretty=false')})
+        self.assertEqual(pretty, b'{\n  "a": 1\n}')
+        self.assertEqual(compact, b'{"a":1}')
+
+    def test_format_parameter_negotiation(self):
+        renderers = [FHIRJSONRenderer(), FHIRCompatibleJSONRenderer()]
+        negotiation = FHIRContentNegotiation()
+        for requested_format, expected_media_type in [
+            ('application/fhir%2Bjson', 'application/fhir+json'),
+            ('application/fhir+json', 'application/fhir+json'),
+            ('json', 'application/json'),
+        ]:
+            request = self._build_request(f'?_format={requested_format}')
+            renderer, media_type = negotiation.select_renderer(request, renderers)
+            self.assertEqual(renderer.media_type, expected_media_type)
+
+    def test_accept_header_negotiation(self):
+        renderers = [FHIRJSONRenderer(), FHIRCompatibleJSONRenderer()]
+        request = self._build_request(HTTP_ACCEPT='application/json')
+        renderer, _ = FHIRContentNegotiation().select_renderer(request, renderers)
+        self.assertEqual(renderer.media_type, 'application/json')
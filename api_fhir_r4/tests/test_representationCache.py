@@ -0,0 +1,75 @@
+import datetime
+import time
+from unittest.mock import patch, MagicMock
+
+from django.core.cache import caches
+from django.test import TestCase
+from insuree.test_helpers import create_test_insuree
+
+from api_fhir_r4.cache import FHIRRepresentationCache
+from api_fhir_r4.configurations import GeneralConfiguration
+from api_fhir_r4.converters import PatientConverter, ReferenceConverterMixin
+
+
+@patch.object(GeneralConfiguration, 'get_representation_cache_timeout', MagicMock(return_value=0))
+@patch.object(GeneralConfiguration, 'get_representation_cache_local_timeout', MagicMock(return_value=60))
+@patch.object(GeneralConfiguration, 'get_representation_cache_size', MagicMock(return_value=10))
+class FHIRRepresentationCacheTestCase(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        FHIRRepresentationCache.clear()
+        self._insuree = create_test_insuree()
+        self._convert = MagicMock(side_effect=lambda: {'resourceType': 'Patient', 'name': []})
+
+    def _get(self, insuree=None):
+        return FHIRRepresentationCache.get_or_convert(
+            PatientConverter, insuree or self._insuree, ReferenceConverterMixin.UUID_REFERENCE_TYPE, self._convert)
+
+    def test_representation_is_converted_once(self):
+        self._get()['name'].append('modified')
+        self.assertEqual(self._get(), {'resourceType': 'Patient', 'name': []})
+        self.assertEqual(self._convert.call_count, 1)
+
+    def test_new_version_is_converted(self):
+        self._get()
+        self._insuree.validity_from = self._insuree.validity_from + datetime.timedelta(seconds=1)
+        self._get()
+        self.assertEqual(self._convert.call_count, 2)
+
+    def test_invalidated_representation_is_converted(self):
+        self._get()
+        FHIRRepresentationCache.invalidate(self._insuree)
+        self._get()
+        self.assertEqual(self._convert.call_count, 2)
+
+    def test_representation_invalidated_by_other_process_is_converted(self):
+        self._get()
+        # another process invalidated the object, only its epoch in the Django cache is replaced
+        epoch_key = FHIRRepresentationCache._get_epoch_key(self._insuree)
+        caches[FHIRRepresentationCache.cache_name].set(epoch_key, 1)
+        self._get()
+        self.assertEqual(self._convert.call_count, 2)
+
+    def test_invalidation_keeps_representations_of_other_objects(self):
+        other_insuree = create_test_insuree(custom_props={'chf_id': '999000300'})
+        self._get(other_insuree)
+        FHIRRepresentationCache.invalidate(self._insuree)
+        self._get(other_insuree)
+        self.assertEqual(self._convert.call_count, 1)
+
+    def test_expired_representation_is_converted(self):
+        self._get()
+        with patch('api_fhir_r4.cache.representationCache.time.monotonic', return_value=time.monotonic() + 61):
+            self._get()
+        self.assertEqual(self._convert.call_count, 2)
+
+    def test_page_reads_epochs_at_once(self):
+        cache = caches[FHIRRepresentationCache.cache_name]
+        with patch.object(cache, 'get', wraps=cache.get) as cache_get, \
+                patch.object(cache, 'get_many', wraps=cache.get_many) as cache_get_many:
+            with FHIRRepresentationCache.page_scope([self._insuree]):
+                self._get()
+                self._get()
+        cache_get_many.assert_called_once()
+        cache_get.assert_not_called()
@@ -0,0 +1,25 @@
+from django.test import TestCase
+from insuree.models import Insuree
+from insuree.test_helpers import create_test_insuree
+
+from api_fhir_r4.subscriptions.subscriptionCriteriaMatcher import CompiledSubscriptionCriteria
+
+
+class CompiledSubscriptionCriteriaTestCase(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self._insuree = create_test_insuree()
+
+    def test_field_equality_is_checked_in_memory(self):
+        criteria = CompiledSubscriptionCriteria(Insuree, {'chf_id': self._insuree.chf_id})
+        self.assertFalse(criteria.db_criteria)
+        with self.assertNumQueries(0):
+            self.assertTrue(criteria.matches(self._insuree))
+            self.assertFalse(CompiledSubscriptionCriteria(Insuree, {'chf_id': 'not-matching'}).matches(self._insuree))
+
+    def test_lookups_are_checked_in_database(self):
+        criteria = CompiledSubscriptionCriteria(Insuree, {'chf_id__startswith': self._insuree.chf_id[:1]})
+        self.assertFalse(criteria.in_memory_criteria)
+        with self.assertNumQueries(1):
+            self.assertTrue(criteria.matches(self._insuree))
@@ -0,0 +1,49 @@
+import datetime
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from api_fhir_r4.configurations import R4SubscriptionConfig
+
+from api_fhir_r4.models import Subscription
+from api_fhir_r4.subscriptions.subscriptionIndex import SubscriptionIndex
+from api_fhir_r4.tests.mixin.logInMixin import LogInMixin
+
+
+class SubscriptionIndexTestCase(LogInMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self._test_user = self.get_or_create_user_api()
+        self._patient_subscription = self._create_subscription({'resource': 'Patient'})
+        self._bus_subscription = self._create_subscription({'resource': 'Organisation', 'resource_type': 'bus'})
+
+    def test_subscriptions_of_resource(self):
+        self.assertEqual(SubscriptionIndex.get_subscription_ids('Patient'), [self._patient_subscription.id])
+        self.assertEqual(SubscriptionIndex.get_subscription_ids('Organisation', 'bus'), [self._bus_subscription.id])
+        self.assertEqual(SubscriptionIndex.get_subscription_ids('Organisation', 'ins'), [])
+
+    def test_index_is_not_rebuilt_without_changes(self):
+        SubscriptionIndex.get_index()
+        with self.assertNumQueries(0):
+            self.assertEqual(SubscriptionIndex.get_subscription_ids('Invoice'), [])
+
+    def test_index_is_rebuilt_on_subscription_change(self):
+        SubscriptionIndex.get_index()
+        invoice_subscription = self._create_subscription({'resource': 'Invoice'})
+        self.assertEqual(SubscriptionIndex.get_subscription_ids('Invoice'), [invoice_subscription.id])
+
+    def test_index_is_rebuilt_after_timeout(self):
+        with patch.object(R4SubscriptionConfig, 'get_subscription_index_timeout', return_value=0):
+            SubscriptionIndex.get_index()
+            # bulk changes don't move the generation of the table
+            Subscription.objects.filter(id=self._bus_subscription.id).update(criteria={'resource': 'Invoice'})
+            self.assertEqual(SubscriptionIndex.get_subscription_ids('Invoice'), [self._bus_subscription.id])
+
+    def _create_subscription(self, criteria):
+        sub = Subscription(
+            status=1, channel=0, endpoint='http://test-subscription-endpoint.io/post_uri/', headers='{}',
+            criteria=criteria, expiring=datetime.datetime.now() + datetime.timedelta(days=10)
+        )
+        sub.save(username=self._test_user.username)
+        return sub
@@ -0,0 +1,35 @@
+import datetime
+
+from django.test import TestCase
+
+from api_fhir_r4.models import Subscription, SubscriptionNotificationResult
+from api_fhir_r4.tests.mixin.logInMixin import LogInMixin
+
+
+class SubscriptionNotificationResultPurgeTestCase(LogInMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self._test_user = self.get_or_create_user_api()
+        self._subscription = Subscription(
+            status=1, channel=0, endpoint='http://test-subscription-endpoint.io/post_uri/', headers='{}',
+            expiring=datetime.datetime.now() + datetime.timedelta(days=10)
+        )
+        self._subscription.save(username=self._test_user.username)
+        now = datetime.datetime.now()
+        SubscriptionNotificationResult.objects.bulk_create([
+            SubscriptionNotificationResult(subscription=self._subscription, notified_successfully=True,
+                                           notification_time=now - datetime.timedelta(days=days))
+            for days in (0, 1, 2, 40)
+        ])
+
+    def test_purge_older_than(self):
+        deleted = SubscriptionNotificationResult.objects.purge(
+            older_than=datetime.datetime.now() - datetime.timedelta(days=30))
+        self.assertEqual(deleted, 1)
+        self.assertEqual(SubscriptionNotificationResult.objects.subscriber_notifications(self._subscription).count(), 3)
+
+    def test_purge_max_per_subscription(self):
+        deleted = SubscriptionNotificationResult.objects.purge(max_per_subscription=2)
+        self.assertEqual(deleted, 2)
+        self.assertEqual(SubscriptionNotificationResult.objects.subscriber_notifications(self._subscription).count(), 2)
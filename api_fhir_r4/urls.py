@@ -10,6 +10,8 @@ from api_fhir_r4.views import LoginView, fhir as fhir_viewsets
 imis_modules = openimis_apps()
 
 router = DefaultRouter()
+# root view accepts batch/transaction Bundles as well
+router.APIRootView = fhir_viewsets.FHIRRootView
 router.register(r'login', LoginView, basename="login")
 router.register(r'Subscription', fhir_viewsets.SubscriptionViewSet,
                 basename='Subscription_R4')
@@ -138,6 +140,10 @@ if 'contribution_plan' in imis_modules:
 
 
 urlpatterns = [
+    path('$export', fhir_viewsets.BulkExportView.as_view(), name='bulk_export'),
+    path('$export-status/<str:job_id>', fhir_viewsets.BulkExportStatusView.as_view(), name='bulk_export_status'),
+    path('$export-file/<str:job_id>/<str:file_name>', fhir_viewsets.BulkExportFileView.as_view(),
+         name='bulk_export_file'),
     path('', include(router.urls)),
     path('GroupOrganisationContracts/addContract',
          fhir_viewsets.AddContractToOrganization, name="add_contract"),
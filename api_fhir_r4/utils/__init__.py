@@ -2,3 +2,5 @@ from api_fhir_r4.utils.functionUtils import FunctionUtils
 from api_fhir_r4.utils.timeUtils import TimeUtils
 from api_fhir_r4.utils.fhirUtils import FhirUtils
 from api_fhir_r4.utils.dbManagerUtils import DbManagerUtils
+from api_fhir_r4.utils.referenceResolutionCache import ReferenceResolutionCache
+from api_fhir_r4.utils.versionUtils import VersionUtils
@@ -2,6 +2,8 @@ from django.core.exceptions import MultipleObjectsReturned
 from django.http import Http404
 from django.shortcuts import get_object_or_404, get_list_or_404
 
+from api_fhir_r4.utils.referenceResolutionCache import ReferenceResolutionCache
+
 
 class DbManagerUtils(object):
 
@@ -9,6 +11,15 @@ class DbManagerUtils(object):
 
     @classmethod
     def get_object_or_none(cls, model, **kwargs):
+        if len(kwargs) == 1:
+            # lookups by a single identifier (uuid, code) go through the identity map of the current request
+            (field_name, value), = kwargs.items()
+            return ReferenceResolutionCache.get_object(
+                model, field_name, value, lambda: cls._get_object_or_none(model, **kwargs))
+        return cls._get_object_or_none(model, **kwargs)
+
+    @classmethod
+    def _get_object_or_none(cls, model, **kwargs):
         try:
             result = get_object_or_404(model, **kwargs)
         except MultipleObjectsReturned:
@@ -0,0 +1,96 @@
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.core.exceptions import FieldDoesNotExist
+
+
+class ReferenceResolutionCache(object):
+    """
+        Identity map of referenced objects within a scope (a single request or Bundle), keyed by
+        (model, lookup field, value), so references repeated within a payload hit the database once.
+        Outside of a scope lookups are not cached.
+    """
+    _cache = ContextVar('api_fhir_r4_reference_resolution_cache', default=None)
+
+    @classmethod
+    @contextmanager
+    def scope(cls):
+        if cls._cache.get() is not None:
+            # nested scopes (e.g. Bundle processed within a request) share the outer identity map
+            yield
+            return
+        token = cls._cache.set({})
+        try:
+            yield
+        finally:
+            cls._cache.reset(token)
+
+    @classmethod
+    def is_active(cls):
+        return cls._cache.get() is not None
+
+    @classmethod
+    def get_or_resolve(cls, key, resolve):
+        cache = cls._cache.get()
+        if cache is None:
+            return resolve()
+        if key not in cache:
+            value = resolve()
+            if value is None:
+                # missing objects can still be created within the scope (e.g. from contained resources)
+                return value
+            cache[key] = value
+        return cache[key]
+
+    @classmethod
+    def get_object(cls, model, field_name, value, resolve):
+        return cls.get_or_resolve(cls.build_key(model, field_name, value), resolve)
+
+    @classmethod
+    def prefetch(cls, model, field_name, values):
+        """
+            Load all objects of `model` matching `values` of `field_name` not present in the identity map yet
+            with a single query. Only active rows (`validity_to` not set) of versioned models are loaded,
+            if many rows match the same value the most recent one (`validity_from`) is kept.
+        """
+        cache = cls._cache.get()
+        if cache is None:
+            return
+        missing = {cls.build_key(model, field_name, value): value for value in values if value is not None}
+        missing = {key: value for key, value in missing.items() if key not in cache}
+        if not missing:
+            return
+        queryset = model._default_manager.all()
+        if cls._has_field(model, 'validity_to'):
+            queryset = queryset.filter(validity_to__isnull=True)
+        if cls._is_unique(model, field_name):
+            objects = queryset.in_bulk(list(missing.values()), field_name=field_name).values()
+        else:
+            ordering = ('-validity_from', '-pk') if cls._has_field(model, 'validity_from') else ('-pk',)
+            objects = queryset.filter(**{f'{field_name}__in': list(missing.values())}).order_by(*ordering)
+        for obj in objects:
+            key = cls.build_key(model, field_name, getattr(obj, field_name))
+            if key in missing:
+                cache.setdefault(key, obj)
+
+    @classmethod
+    def build_key(cls, model, field_name, value):
+        if isinstance(value, uuid.UUID) or field_name == 'uuid':
+            # uuids are stored as strings in some of the tables, casing of stored values is not consistent
+            value = str(value).lower()
+        return model, field_name, str(value)
+
+    @classmethod
+    def _has_field(cls, model, field_name):
+        try:
+            model._meta.get_field(field_name)
+            return True
+        except FieldDoesNotExist:
+            return False
+
+    @classmethod
+    def _is_unique(cls, model, field_name):
+        if field_name == 'pk':
+            return True
+        return model._meta.get_field(field_name).unique
@@ -0,0 +1,68 @@
+import calendar
+import datetime
+import hashlib
+
+from django.core.exceptions import FieldDoesNotExist
+from django.utils import timezone
+
+
+class VersionUtils(object):
+    """
+        Version of IMIS objects derived from their version stamp, `validity_from` of versioned models
+        and `date_updated` of history models. Used for `meta.versionId`, `meta.lastUpdated` and the
+        `ETag`/`Last-Modified` headers of conditional reads.
+    """
+    version_stamp_fields = ('validity_from', 'date_updated')
+
+    @classmethod
+    def get_version_stamp_field(cls, model):
+        for field_name in cls.version_stamp_fields:
+            try:
+                field = model._meta.get_field(field_name)
+            except FieldDoesNotExist:
+                continue
+            if field.concrete:
+                return field.attname
+        return None
+
+    @classmethod
+    def get_version_stamp(cls, obj):
+        for field_name in cls.version_stamp_fields:
+            stamp = getattr(obj, field_name, None)
+            if stamp is not None:
+                return stamp
+        return None
+
+    @classmethod
+    def get_version_id(cls, stamp):
+        return cls._to_utc(stamp).strftime('%Y%m%d%H%M%S%f')
+
+    @classmethod
+    def get_etag(cls, stamp, variant=None):
+        """
+            Weak, equal versions are semantically but not necessarily byte-for-byte equal (e.g. rendered as XML).
+            `variant` distinguishes representations of the same version (e.g. element projections).
+        """
+        if variant is None:
+            return f'W/"{cls.get_version_id(stamp)}"'
+        digest = hashlib.md5(variant.encode('utf8')).hexdigest()[:8]
+        return f'W/"{cls.get_version_id(stamp)}-{digest}"'
+
+    @classmethod
+    def get_last_updated(cls, stamp):
+        return cls._to_utc(stamp).isoformat()
+
+    @classmethod
+    def get_last_modified(cls, stamp):
+        return calendar.timegm(cls._to_utc(stamp).utctimetuple())
+
+    @classmethod
+    def _to_utc(cls, stamp):
+        if not isinstance(stamp, datetime.datetime):
+            stamp = datetime.datetime.combine(stamp, datetime.time.min)
+        # stamps may be core's AdDatetime, conversions are done on a plain datetime
+        stamp = datetime.datetime(stamp.year, stamp.month, stamp.day, stamp.hour, stamp.minute, stamp.second,
+                                  stamp.microsecond, tzinfo=stamp.tzinfo)
+        if timezone.is_naive(stamp):
+            stamp = timezone.make_aware(stamp, timezone.get_default_timezone())
+        return stamp.astimezone(datetime.timezone.utc)
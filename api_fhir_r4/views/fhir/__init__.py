@@ -1,4 +1,6 @@
 from api_fhir_r4.views.fhir.activity_definition import ActivityDefinitionViewSet
+from api_fhir_r4.views.fhir.bundle_transaction import FHIRRootView
+from api_fhir_r4.views.fhir.bulk_export import BulkExportView, BulkExportStatusView, BulkExportFileView
 from api_fhir_r4.views.fhir.claim import ClaimViewSet
 from api_fhir_r4.views.fhir.claim_response import ClaimResponseViewSet
 from api_fhir_r4.views.fhir.code_systems.diagnosis import CodeSystemOpenIMISDiagnosisViewSet
@@ -1,8 +1,13 @@
+from django.db.models.query import QuerySet
 from rest_framework.views import APIView
 
 from api_fhir_r4.multiserializer import MultiSerializerSerializerClass
+from api_fhir_r4.negotiation import FHIRContentNegotiation
 from api_fhir_r4.paginations import FhirBundleResultsSetPagination
 from api_fhir_r4.permissions import FHIRApiPermissions
+from api_fhir_r4.projections import ElementProjection
+from api_fhir_r4.renderers import FHIRJSONRenderer, FHIRCompatibleJSONRenderer
+from api_fhir_r4.utils import ReferenceResolutionCache
 from api_fhir_r4.views import CsrfExemptSessionAuthentication
 
 
@@ -10,6 +15,24 @@ class BaseFHIRView(APIView):
     pagination_class = FhirBundleResultsSetPagination
     permission_classes = (FHIRApiPermissions,)
     authentication_classes = [CsrfExemptSessionAuthentication] + APIView.settings.DEFAULT_AUTHENTICATION_CLASSES
+    renderer_classes = [FHIRJSONRenderer, FHIRCompatibleJSONRenderer] + APIView.settings.DEFAULT_RENDERER_CLASSES
+    content_negotiation_class = FHIRContentNegotiation
+
+    def dispatch(self, request, *args, **kwargs):
+        # references repeated within the payload are resolved once per request
+        with ReferenceResolutionCache.scope():
+            return super().dispatch(request, *args, **kwargs)
+
+    def paginate_queryset(self, queryset):
+        return super().paginate_queryset(self.apply_prefetch_plan(queryset))
+
+    def apply_prefetch_plan(self, queryset):
+        # relations declared by the converter of the serializer are loaded with the page, not per resource
+        converter = getattr(getattr(self, 'serializer_class', None), 'fhirConverter', None)
+        if converter is not None and isinstance(queryset, QuerySet):
+            queryset = converter.apply_prefetch_plan(
+                queryset, ElementProjection.get_elements(getattr(self, 'request', None), converter))
+        return queryset
 
 
 class BaseMultiserializerFHIRView(BaseFHIRView):
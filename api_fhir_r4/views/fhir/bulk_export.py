@@ -0,0 +1,103 @@
+from django.http import StreamingHttpResponse, FileResponse, Http404
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from api_fhir_r4.bulkExport import (
+    NdjsonExporter,
+    ExportJobStatus,
+    FileSystemExportBackend,
+    ExportJobNdjsonExporter
+)
+from api_fhir_r4.converters import OperationOutcomeConverter
+from api_fhir_r4.views.fhir.base import BaseFHIRView
+
+NDJSON_CONTENT_TYPE = 'application/fhir+ndjson'
+
+
+class BulkExportView(BaseFHIRView):
+    """
+        System level `$export` operation, exports resources of the requested types (`_type`, all supported types
+        by default) changed since `_since` as NDJSON. Streamed in the response, or with `Prefer: respond-async`
+        written to files by a job of the export worker which can be polled with the returned `Content-Location` URL.
+    """
+    permission_classes = (IsAuthenticated,)
+
+    def get(self, request, *args, **kwargs):
+        if 'respond-async' in request.headers.get('Prefer', ''):
+            return self.kick_off(request)
+        exporter = NdjsonExporter.from_query_params(request.user, request.query_params)
+        response = StreamingHttpResponse(exporter.iter_all_ndjson(), content_type=NDJSON_CONTENT_TYPE)
+        response['Content-Disposition'] = 'attachment; filename="export.ndjson"'
+        return response
+
+    def kick_off(self, request):
+        exporter = ExportJobNdjsonExporter.from_query_params(request.user, request.query_params)
+        # the job is run by the export worker (see `fhir_export_worker` command)
+        job = FileSystemExportBackend().create_job(
+            request.user, request.build_absolute_uri(), exporter.get_job_parameters())
+        response = Response(status=status.HTTP_202_ACCEPTED)
+        response['Content-Location'] = request.build_absolute_uri(f"$export-status/{job['id']}")
+        return response
+
+
+class BulkExportJobMixin(object):
+    permission_classes = (IsAuthenticated,)
+
+    def get_job(self, request, job_id):
+        try:
+            job = FileSystemExportBackend().load_job(job_id)
+        except ValueError:
+            job = None
+        if not job or job['user'] != str(request.user.pk):
+            raise Http404(f"Export job {job_id} not found")
+        return job
+
+
+class BulkExportStatusView(BulkExportJobMixin, BaseFHIRView):
+
+    def get(self, request, job_id, *args, **kwargs):
+        job = self.get_job(request, job_id)
+        if job['status'] in ExportJobStatus.PENDING:
+            response = Response(status=status.HTTP_202_ACCEPTED)
+            response['X-Progress'] = f"{len(job['output'])} resource types exported"
+            response['Retry-After'] = '10'
+            return response
+        if job['status'] == ExportJobStatus.ERROR:
+            outcome = OperationOutcomeConverter.to_fhir_obj(Exception(f"Export job failed: {job.get('message')}"))
+            return Response(outcome.dict(), status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        return Response(self.build_manifest(request, job))
+
+    def delete(self, request, job_id, *args, **kwargs):
+        self.get_job(request, job_id)
+        FileSystemExportBackend().delete_job(job_id)
+        return Response(status=status.HTTP_202_ACCEPTED)
+
+    def build_manifest(self, request, job):
+        def file_entries(files):
+            return [{
+                'type': entry['type'],
+                'url': request.build_absolute_uri(f"../$export-file/{job['id']}/{entry['file']}"),
+                'count': entry['count'],
+            } for entry in files]
+
+        return {
+            'transactionTime': job['transactionTime'],
+            'request': job['request'],
+            'requiresAccessToken': True,
+            'output': file_entries(job['output']),
+            'error': file_entries(job['error']),
+        }
+
+
+class BulkExportFileView(BulkExportJobMixin, BaseFHIRView):
+
+    def get(self, request, job_id, file_name, *args, **kwargs):
+        self.get_job(request, job_id)
+        path = FileSystemExportBackend().get_file_path(job_id, file_name)
+        try:
+            response = FileResponse(open(path, 'rb'), content_type=NDJSON_CONTENT_TYPE)
+        except (TypeError, FileNotFoundError):
+            raise Http404(f"Export file {file_name} not found")
+        response['Content-Encoding'] = 'gzip'
+        return response
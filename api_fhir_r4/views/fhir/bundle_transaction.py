@@ -0,0 +1,29 @@
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.routers import APIRootView
+
+from api_fhir_r4.bundle_transactions import BundleTransactionProcessor, BundleEntryProcessingError
+from api_fhir_r4.converters import OperationOutcomeConverter
+from api_fhir_r4.negotiation import FHIRContentNegotiation
+from api_fhir_r4.renderers import FHIRJSONRenderer, FHIRCompatibleJSONRenderer
+from api_fhir_r4.views import CsrfExemptSessionAuthentication
+
+
+class FHIRRootView(APIRootView):
+    """
+        API root, besides listing the endpoints accepts `batch` and `transaction` Bundles on POST.
+    """
+    authentication_classes = [CsrfExemptSessionAuthentication] + APIRootView.settings.DEFAULT_AUTHENTICATION_CLASSES
+    renderer_classes = [FHIRJSONRenderer, FHIRCompatibleJSONRenderer] + APIRootView.settings.DEFAULT_RENDERER_CLASSES
+    content_negotiation_class = FHIRContentNegotiation
+
+    def post(self, request, *args, **kwargs):
+        if not request.user or not request.user.is_authenticated:
+            self.permission_denied(request)
+        try:
+            result = BundleTransactionProcessor(request).process(request.data)
+        except BundleEntryProcessingError as e:
+            # transaction Bundle, nothing was saved
+            outcome = OperationOutcomeConverter.to_fhir_obj(e.cause).dict()
+            return Response(outcome, status=BundleTransactionProcessor.get_error_status(e.cause).value)
+        return Response(result, status=status.HTTP_200_OK)
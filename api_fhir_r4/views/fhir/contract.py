@@ -1,6 +1,5 @@
 import datetime
 
-from django.db.models import Prefetch
 from rest_framework import mixins
 from rest_framework.viewsets import GenericViewSet
 
@@ -8,7 +7,6 @@ from api_fhir_r4.permissions import FHIRApiCoverageRequestPermissions
 from api_fhir_r4.serializers import ContractSerializer
 from api_fhir_r4.views.fhir.base import BaseFHIRView
 from api_fhir_r4.views.filters import ValidityFromRequestParameterFilter
-from insuree.models import InsureePolicy
 from policy.models import Policy
 
 
@@ -19,15 +17,7 @@ class ContractViewSet(BaseFHIRView, mixins.RetrieveModelMixin, mixins.ListModelM
     permission_classes = (FHIRApiCoverageRequestPermissions,)
 
     def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset() \
-            .select_related('product') \
-            .select_related('officer') \
-            .select_related('family__head_insuree') \
-            .select_related('family__location') \
-            .prefetch_related(
-            Prefetch('insuree_policies',
-                     queryset=InsureePolicy.objects.filter(validity_to__isnull=True).select_related('insuree'))
-        )
+        queryset = self.get_queryset()
         refDate = request.GET.get('refDate')
         refEndDate = request.GET.get('refEndDate')
         identifier = request.GET.get("identifier")
@@ -18,7 +18,6 @@ class CoverageRequestQuerySet(BaseFHIRView, mixins.RetrieveModelMixin, mixins.Li
 
     def list(self, request, *args, **kwargs):
         queryset = self.get_queryset()
-        queryset.prefetch_related('services')
         refDate = request.GET.get('refDate')
         refEndDate = request.GET.get('refEndDate')
         identifier = request.GET.get("identifier")
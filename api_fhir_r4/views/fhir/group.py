@@ -1,12 +1,17 @@
+from django.db.models import F, Func, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from rest_framework import viewsets
 
+from api_fhir_r4.converters import GroupConverter
+
 from api_fhir_r4.mixins import MultiIdentifierRetrieverMixin, MultiIdentifierUpdateMixin
 from api_fhir_r4.model_retrievers import UUIDIdentifierModelRetriever, GroupIdentifierModelRetriever
 from api_fhir_r4.permissions import FHIRApiGroupPermissions
 from api_fhir_r4.serializers import GroupSerializer
 from api_fhir_r4.views.fhir.base import BaseFHIRView
 from api_fhir_r4.views.filters import ValidityFromRequestParameterFilter
-from insuree.models import Family
+from insuree.models import Family, Insuree, InsureePolicy
+from policy.models import Policy
 
 
 class GroupViewSet(BaseFHIRView, MultiIdentifierRetrieverMixin,
@@ -30,5 +35,19 @@ class GroupViewSet(BaseFHIRView, MultiIdentifierRetrieverMixin,
         return response
 
     def get_queryset(self):
-        queryset = Family.objects.all().order_by('validity_from')
+        queryset = Family.objects.all().order_by('validity_from') \
+            .annotate(**{
+                GroupConverter.MEMBER_COUNT_ANNOTATION: self._count_subquery(
+                    Insuree.objects.filter(family__uuid=OuterRef('uuid'), validity_to__isnull=True)),
+                GroupConverter.ACTIVE_POLICY_COUNT_ANNOTATION: self._count_subquery(
+                    InsureePolicy.objects.filter(insuree__family__uuid=OuterRef('uuid'),
+                                                 policy__status=Policy.STATUS_ACTIVE,
+                                                 validity_to__isnull=True)),
+            })
         return ValidityFromRequestParameterFilter(self.request).filter_queryset(queryset)
+
+    @classmethod
+    def _count_subquery(cls, queryset):
+        # COUNT without GROUP BY, computed in the same query as the families instead of one query per family
+        count = queryset.order_by().annotate(count=Func(F('pk'), function='COUNT')).values('count')
+        return Coalesce(Subquery(count, output_field=IntegerField()), 0)
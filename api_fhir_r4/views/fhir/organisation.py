@@ -3,7 +3,6 @@ from collections import defaultdict, OrderedDict
 from datetime import datetime as py_datetime
 from django.db.models import Q
 from django.http import Http404
-from itertools import chain
 from rest_framework.request import Request
 from rest_framework.response import Response
 
@@ -110,7 +109,7 @@ class OrganisationViewSet(BaseMultiserializerFHIRView,
         # if insurance organisation queryset is empty - take the default one
         if resource_type is None or resource_type == 'ins':
             if (ModuleConfiguration, InsuranceOrganizationSerializer) in filtered_querysets:
-                if len(filtered_querysets[ModuleConfiguration, InsuranceOrganizationSerializer]) == 0:
+                if not filtered_querysets[ModuleConfiguration, InsuranceOrganizationSerializer].exists():
                     filtered_querysets[ModuleConfiguration, InsuranceOrganizationSerializer] = \
                         [DEFAULT_CFG['R4_fhir_insurance_organisation_config']]
                 else:
@@ -118,7 +117,9 @@ class OrganisationViewSet(BaseMultiserializerFHIRView,
                     filtered_querysets[ModuleConfiguration, InsuranceOrganizationSerializer] = \
                         self._get_insurance_organisations_as_list()
 
-        page = self.paginate_queryset(list(chain(*filtered_querysets.values())))
+        # health facilities, policy holders and insurance organisations follow each other in this order,
+        # only rows on the requested page are fetched
+        page = self.paginate_queryset(self._join_querysets([*filtered_querysets.values()]))
         data = self.__dispatch_page_data(page)
         serialized_data = self._serialize_dispatched_data(data, dict(filtered_querysets.keys()))
         data = self.get_paginated_response(serialized_data)
@@ -194,11 +195,11 @@ class OrganisationViewSet(BaseMultiserializerFHIRView,
         return HealthFacility.objects
 
     def _hf_queryset(self):
-        queryset = HealthFacility.objects.filter(validity_to__isnull=True).order_by('validity_from')
+        queryset = HealthFacility.objects.filter(validity_to__isnull=True).order_by('validity_from', 'id')
         return ValidityFromRequestParameterFilter(self.request).filter_queryset(queryset)
 
     def _ph_queryset(self):
-        queryset = PolicyHolder.objects.filter(is_deleted=False).order_by('date_created')
+        queryset = PolicyHolder.objects.filter(is_deleted=False).order_by('date_created', 'id')
         return DateUpdatedRequestParameterFilter(self.request).filter_queryset(queryset)
 
     def  _io_queryset(self):
@@ -232,7 +233,8 @@ class OrganisationViewSet(BaseMultiserializerFHIRView,
             serializer_cls = serializer_models.get(model, None)
             if not serializer_cls:
                 if all(isinstance(md, OrderedDict) for md in model_data):
-                    serialized.extend(self._get_insurance_organisations())
+                    serializer = InsuranceOrganizationSerializer()
+                    serialized.extend(serializer.to_representation(obj=md) for md in model_data)
                 else:
                     # check if we have insurance organisation default config
                     data_default = self.__check_default_config_insurance_organisation(model_data)